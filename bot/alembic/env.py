@@ -4,14 +4,20 @@ from logging.config import fileConfig
 from alembic import context
 from database.common.base import BaseModel
 from database.models import (
+    BetStatisticModel,
     GameModel,
     GroupingModel,
+    GroupingStatisticModel,
     GroupModel,
+    GroupStatisticModel,
     OrderModel,
+    PlayerStatisticModel,
     ProhibitedRoleModel,
     RateModel,
+    RefundModel,
     ResultModel,
     RoleModel,
+    RoleStatisticModel,
     SettingModel,
     UserModel,
 )
@@ -0,0 +1,62 @@
+"""idempotent results
+
+Revision ID: ec6982182f10
+Revises: 17b9c8ed1229
+Create Date: 2026-10-18 11:30:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ec6982182f10"
+down_revision: Union[str, None] = "17b9c8ed1229"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("results", "rates"):
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            "WHERE a.id > b.id AND a.game_id = b.game_id "
+            "AND a.user_tg_id = b.user_tg_id"
+        )
+    op.create_unique_constraint(
+        "results_game_id_user_tg_id_key",
+        "results",
+        ["game_id", "user_tg_id"],
+    )
+    op.create_unique_constraint(
+        "rates_game_id_user_tg_id_key",
+        "rates",
+        ["game_id", "user_tg_id"],
+    )
+    op.create_table(
+        "refunds",
+        sa.Column("game_id", sa.Integer(), nullable=False),
+        sa.Column("user_tg_id", sa.BigInteger(), nullable=False),
+        sa.Column("money", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.CheckConstraint("money > 0"),
+        sa.ForeignKeyConstraint(
+            ["user_tg_id"], ["users.tg_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("game_id", "user_tg_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("refunds")
+    op.drop_constraint(
+        "rates_game_id_user_tg_id_key", "rates", type_="unique"
+    )
+    op.drop_constraint(
+        "results_game_id_user_tg_id_key",
+        "results",
+        type_="unique",
+    )
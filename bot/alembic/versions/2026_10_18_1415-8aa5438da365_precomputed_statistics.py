@@ -0,0 +1,148 @@
+"""precomputed statistics
+
+Revision ID: 8aa5438da365
+Revises: ec6982182f10
+Create Date: 2026-10-18 14:15:41.903127
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8aa5438da365"
+down_revision: Union[str, None] = "ec6982182f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FINISHED_GAMES = (
+    'g."end" IS NOT NULL AND g.winning_group IS NOT NULL'
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_statistics",
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("number_of_games", sa.Integer(), nullable=False),
+        sa.Column("number_of_players", sa.Integer(), nullable=False),
+        sa.Column("number_of_nights", sa.Integer(), nullable=False),
+        sa.Column("duration", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["group_id"], ["groups.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("group_id"),
+    )
+    op.create_table(
+        "grouping_statistics",
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("grouping", sa.String(), nullable=False),
+        sa.Column("number_of_wins", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["group_id"], ["groups.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["grouping"], ["groupings.name"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("group_id", "grouping"),
+    )
+    op.create_table(
+        "player_statistics",
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("user_tg_id", sa.BigInteger(), nullable=False),
+        sa.Column("number_of_games", sa.Integer(), nullable=False),
+        sa.Column("number_of_wins", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["group_id"], ["groups.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_tg_id"], ["users.tg_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("group_id", "user_tg_id"),
+    )
+    op.create_index(
+        "ix_player_statistics_group_id_number_of_games",
+        "player_statistics",
+        ["group_id", "number_of_games"],
+    )
+    op.create_table(
+        "role_statistics",
+        sa.Column("user_tg_id", sa.BigInteger(), nullable=False),
+        sa.Column("role_id", sa.String(), nullable=False),
+        sa.Column("number_of_games", sa.Integer(), nullable=False),
+        sa.Column("number_of_wins", sa.Integer(), nullable=False),
+        sa.Column("number_of_nights", sa.Integer(), nullable=False),
+        sa.Column("money", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["role_id"], ["roles.key"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_tg_id"], ["users.tg_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_tg_id", "role_id"),
+    )
+    op.create_table(
+        "bet_statistics",
+        sa.Column("user_tg_id", sa.BigInteger(), nullable=False),
+        sa.Column("number_of_bets", sa.Integer(), nullable=False),
+        sa.Column("number_of_wins", sa.Integer(), nullable=False),
+        sa.Column("money", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_tg_id"], ["users.tg_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_tg_id"),
+    )
+    op.execute(
+        "INSERT INTO group_statistics (group_id, number_of_games, "
+        "number_of_players, number_of_nights, duration) "
+        "SELECT g.group_id, count(*), coalesce(sum(p.number), 0), "
+        "coalesce(sum(g.number_of_nights), 0), "
+        'coalesce(sum(extract(epoch FROM g."end" - g.start)), 0)::int '
+        "FROM games g LEFT JOIN (SELECT game_id, count(*) AS number "
+        "FROM results GROUP BY game_id) p ON p.game_id = g.id "
+        f"WHERE {FINISHED_GAMES} GROUP BY g.group_id"
+    )
+    op.execute(
+        "INSERT INTO grouping_statistics "
+        "(group_id, grouping, number_of_wins) "
+        "SELECT g.group_id, g.winning_group, count(*) FROM games g "
+        f"WHERE {FINISHED_GAMES} GROUP BY g.group_id, g.winning_group"
+    )
+    op.execute(
+        "INSERT INTO player_statistics "
+        "(group_id, user_tg_id, number_of_games, number_of_wins) "
+        "SELECT g.group_id, r.user_tg_id, count(*), "
+        "sum(r.is_winner::int) FROM results r "
+        "JOIN games g ON g.id = r.game_id "
+        f"WHERE {FINISHED_GAMES} AND r.user_tg_id IS NOT NULL "
+        "GROUP BY g.group_id, r.user_tg_id"
+    )
+    op.execute(
+        "INSERT INTO role_statistics (user_tg_id, role_id, "
+        "number_of_games, number_of_wins, number_of_nights, money) "
+        "SELECT user_tg_id, role_id, count(*), sum(is_winner::int), "
+        "sum(nights_lived), sum(money) FROM results "
+        "WHERE user_tg_id IS NOT NULL AND role_id IS NOT NULL "
+        "GROUP BY user_tg_id, role_id"
+    )
+    op.execute(
+        "INSERT INTO bet_statistics "
+        "(user_tg_id, number_of_bets, number_of_wins, money) "
+        "SELECT user_tg_id, count(*), sum(is_winner::int), "
+        "sum(CASE WHEN is_winner THEN money ELSE 0 END) FROM rates "
+        "GROUP BY user_tg_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("bet_statistics")
+    op.drop_table("role_statistics")
+    op.drop_index(
+        "ix_player_statistics_group_id_number_of_games",
+        table_name="player_statistics",
+    )
+    op.drop_table("player_statistics")
+    op.drop_table("grouping_statistics")
+    op.drop_table("group_statistics")
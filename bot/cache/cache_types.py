@@ -1,4 +1,4 @@
-from typing import Literal, TypeAlias, TypedDict
+from typing import Any, Literal, TypeAlias, TypedDict
 
 PlayersIds: TypeAlias = list[int | str]
 UserIdStr: TypeAlias = str
@@ -40,6 +40,10 @@ RolesLiteral = Literal[
 ]
 RolesAndUsersMoney: TypeAlias = dict[RolesLiteral, UsersMoney]
 RoleAndUserMoney: TypeAlias = dict[RolesLiteral, UserAndMoney]
+GamePhaseLiteral = Literal["night", "day", "voting", "confirmation"]
+RegistrationJobLiteral = Literal["start", "remind"]
+# живые игроки по названиям группировок из Groupings
+GroupingsCounters: TypeAlias = dict[str, int]
 
 
 class OrderOfRolesCache(TypedDict, total=True):
@@ -93,6 +97,7 @@ class GameCache(TypedDict, total=False):
     game_chat: int
     start_message_id: int
     wait_for: PlayersIds
+    missed_actions: PlayersIds
     messages_after_night: list[list[UserIdInt | str]]
     disclosed_roles: PlayersIds
     forged_roles: list[UserIdInt | RolesLiteral]
@@ -103,6 +108,7 @@ class GameCache(TypedDict, total=False):
     pros: PlayersIds
     cons: PlayersIds
     live_players_ids: PlayersIds
+    groupings_counters: GroupingsCounters
     players: UsersInGame
     tracking: dict[UserIdStr, InteractionData]
     text_about_checks: str
@@ -117,3 +123,16 @@ class GameCache(TypedDict, total=False):
     angels_died: PlayersIds
     cant_vote: PlayersIds
     cant_talk: PlayersIds
+    game_id: int
+    beginning_game: int
+    winners_bets: list[dict]
+    phase: GamePhaseLiteral
+    phase_deadline: int
+    phase_number: int
+    applied_steps: list[str]
+    roles_state: dict[RolesLiteral, dict]
+
+
+class OutboxEvent(TypedDict):
+    queue: str
+    message: Any
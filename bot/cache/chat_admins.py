@@ -0,0 +1,83 @@
+from typing import Annotated, Final
+
+from aiogram import Bot
+from aiogram.types import ChatMemberAdministrator, ChatMemberOwner
+from pydantic import Field, TypeAdapter
+from redis.asyncio import Redis
+
+CHAT_ADMINS_TTL: Final = 10 * 60
+
+ChatAdmin = ChatMemberOwner | ChatMemberAdministrator
+
+_LOADED_FIELD: Final = "loaded"
+_chat_admin_adapter: Final = TypeAdapter(
+    Annotated[ChatAdmin, Field(discriminator="status")]
+)
+
+
+class ChatAdminsRepository:
+    """
+    Кэш администраторов чатов.
+
+    Список загружается одним запросом get_chat_administrators
+    и сбрасывается, когда в чате меняются права участников.
+    Бот хранится в том же списке, если он администратор.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _get_key(chat_id: int) -> str:
+        return f"mafia:chat_admins:{chat_id}"
+
+    @staticmethod
+    async def _fetch(bot: Bot, chat_id: int) -> dict[int, ChatAdmin]:
+        admins: dict[int, ChatAdmin] = {
+            member.user.id: member
+            for member in await bot.get_chat_administrators(
+                chat_id=chat_id
+            )
+        }
+        if bot.id not in admins:
+            bot_member = await bot.get_chat_member(
+                chat_id=chat_id, user_id=bot.id
+            )
+            if isinstance(bot_member, ChatMemberAdministrator):
+                admins[bot.id] = bot_member
+        return admins
+
+    async def get_admins(
+        self, bot: Bot, chat_id: int
+    ) -> dict[int, ChatAdmin]:
+        key = self._get_key(chat_id)
+        cached = await self.redis.hgetall(key)
+        if cached:
+            return {
+                int(user_id): _chat_admin_adapter.validate_json(
+                    member
+                )
+                for user_id, member in cached.items()
+                if user_id != _LOADED_FIELD.encode()
+            }
+        admins = await self._fetch(bot=bot, chat_id=chat_id)
+        mapping = {
+            str(user_id): member.model_dump_json()
+            for user_id, member in admins.items()
+        }
+        mapping[_LOADED_FIELD] = ""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, CHAT_ADMINS_TTL)
+            await pipe.execute()
+        return admins
+
+    async def is_admin(
+        self, bot: Bot, chat_id: int, user_id: int
+    ) -> bool:
+        return user_id in await self.get_admins(
+            bot=bot, chat_id=chat_id
+        )
+
+    async def invalidate(self, chat_id: int) -> None:
+        await self.redis.delete(self._get_key(chat_id))
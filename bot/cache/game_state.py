@@ -0,0 +1,190 @@
+from collections.abc import Callable, Iterable
+from typing import Final, cast
+
+from aiogram.fsm.context import FSMContext
+from cache.cache_types import GameCache, OutboxEvent
+from cache.outbox import OUTBOX_KEY, dump_outbox_events
+from cache.storage import HashRedisStorage
+
+RUNNING_GAMES_KEY: Final = "mafia:running_games"
+GAME_INDEXED_FIELDS: Final = ("live_players_ids", "cant_talk")
+APPLIED_STEPS_FIELD: Final = "applied_steps"
+
+
+def get_step_mark(game_data: GameCache, step: str) -> str:
+    return f"{game_data.get('phase_number', 0)}:{step}"
+
+
+def is_step_applied(game_data: GameCache, step: str) -> bool:
+    """
+    Проверяет, сохранён ли уже результат шага текущей фазы.
+    """
+    return get_step_mark(game_data, step) in game_data.get(
+        APPLIED_STEPS_FIELD, []
+    )
+
+
+class GameStateRepository:
+    """
+    Точечный доступ к полям GameCache.
+
+    Позволяет прочитать только нужные обработчику поля
+    и записать только изменённые, не сериализуя всю игру.
+    """
+
+    def __init__(self, state: FSMContext):
+        self.state = state
+        self.storage = cast(HashRedisStorage, state.storage)
+        self.key = state.key
+
+    async def get(self, *fields: str) -> GameCache:
+        """
+        Возвращает указанные поля игры.
+        Если поля не указаны, возвращает игру целиком.
+        """
+        return cast(
+            GameCache,
+            await self.storage.get_fields(
+                key=self.key, fields=fields
+            ),
+        )
+
+    async def patch(self, data: GameCache) -> None:
+        """
+        Перезаписывает только переданные поля игры.
+        """
+        await self.storage.set_fields(key=self.key, data=data)
+
+    async def save_step(
+        self, game_data: GameCache, step: str
+    ) -> bool:
+        """
+        Сохраняет игру после шага фазы вместе с отметкой о нём.
+
+        Возвращает False и ничего не пишет, если шаг уже сохранён,
+        поэтому повторный прогон фазы не применит его дважды.
+        """
+        mark = get_step_mark(game_data, step)
+        phase_prefix = mark.split(":")[0] + ":"
+        game_data[APPLIED_STEPS_FIELD] = [
+            applied
+            for applied in game_data.get(APPLIED_STEPS_FIELD, [])
+            if applied.startswith(phase_prefix)
+        ] + [mark]
+        return await self.storage.set_data_unless_marked(
+            key=self.key,
+            data=game_data,
+            marks_field=APPLIED_STEPS_FIELD,
+            mark=mark,
+        )
+
+    async def mutate(
+        self, mutation: Callable[[GameCache], None], *fields: str
+    ) -> GameCache:
+        """
+        Атомарно применяет mutation к свежим значениям полей.
+
+        mutation может быть вызвана несколько раз,
+        поэтому не должна иметь побочных эффектов
+        кроме изменения переданных данных.
+        """
+        return cast(
+            GameCache,
+            await self.storage.mutate_fields(
+                key=self.key, fields=fields, mutation=mutation
+            ),
+        )
+
+    async def get_memberships(
+        self, user_id: int, *fields: str
+    ) -> dict[str, bool] | None:
+        """
+        Проверяет по индексам, в каких полях есть пользователь.
+        """
+        return await self.storage.get_memberships(
+            key=self.key, fields=fields, value=user_id
+        )
+
+    async def mark_running(self) -> None:
+        """
+        Добавляет игру в список идущих, чтобы её можно было возобновить.
+        """
+        await self.storage.redis.sadd(
+            RUNNING_GAMES_KEY, self.key.chat_id
+        )
+
+    async def finish(
+        self, events: Iterable[OutboxEvent] = ()
+    ) -> None:
+        """
+        Очищает игру и в той же транзакции кладёт события в outbox,
+        поэтому результаты не теряются, даже если брокер недоступен.
+        """
+        raw_events = dump_outbox_events(
+            storage=self.storage, events=events
+        )
+        async with self.storage.redis.pipeline(
+            transaction=True
+        ) as pipe:
+            self.storage.clear_in_pipeline(pipe=pipe, key=self.key)
+            pipe.srem(RUNNING_GAMES_KEY, self.key.chat_id)
+            pipe.delete(self.lease_key)
+            if raw_events:
+                pipe.rpush(OUTBOX_KEY, *raw_events)
+            await pipe.execute()
+
+    @property
+    def lease_key(self) -> str:
+        return self.storage.key_builder.build(self.key, "lease")
+
+    async def take_over_lease(self, owner: str, ttl: int) -> bool:
+        """
+        Захватывает право вести игру, только если её никто не ведёт.
+
+        В отличие от acquire_lease не продлевает собственную аренду,
+        поэтому процесс не запустит вторую копию своей же игры.
+        """
+        return bool(
+            await self.storage.redis.set(
+                self.lease_key, owner, nx=True, ex=ttl
+            )
+        )
+
+    async def renew_lease(self, owner: str, ttl: int) -> bool:
+        """
+        Продлевает аренду, только если игру ведёт owner.
+        """
+        redis = self.storage.redis
+        current_owner = await redis.get(self.lease_key)
+        if isinstance(current_owner, bytes):
+            current_owner = current_owner.decode("utf-8")
+        if current_owner != owner:
+            return False
+        return bool(await redis.expire(self.lease_key, ttl))
+
+    async def acquire_lease(self, owner: str, ttl: int) -> bool:
+        """
+        Захватывает или продлевает право вести игру.
+
+        Пока владелец продлевает аренду, другие процессы
+        не возьмутся возобновлять эту игру.
+        """
+        redis = self.storage.redis
+        if await redis.set(self.lease_key, owner, nx=True, ex=ttl):
+            return True
+        current_owner = await redis.get(self.lease_key)
+        if current_owner is None:
+            return await self.acquire_lease(owner=owner, ttl=ttl)
+        if isinstance(current_owner, bytes):
+            current_owner = current_owner.decode("utf-8")
+        if current_owner != owner:
+            return False
+        await redis.expire(self.lease_key, ttl)
+        return True
+
+    @staticmethod
+    async def get_running_games_ids(
+        storage: HashRedisStorage,
+    ) -> list[int]:
+        chats_ids = await storage.redis.smembers(RUNNING_GAMES_KEY)
+        return [int(chat_id) for chat_id in chats_ids]
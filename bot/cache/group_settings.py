@@ -0,0 +1,78 @@
+from collections.abc import Awaitable, Callable
+from typing import Final
+
+from database.schemas.groups import GroupSettingsSchema
+from redis.asyncio import Redis
+
+GROUP_SETTINGS_TTL: Final = 60 * 60
+
+
+class GroupSettingsRepository:
+    """
+    Кэш настроек, с которыми в группе начинается регистрация.
+
+    Настройки зависят от группы и от пользователя, чьи
+    настройки применяются, поэтому ключи записей собираются
+    в множества по группе и по владельцу настроек.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _get_key(group_tg_id: int, user_tg_id: int) -> str:
+        return f"mafia:group_settings:{group_tg_id}:{user_tg_id}"
+
+    @staticmethod
+    def _get_group_index_key(group_id: int) -> str:
+        return f"mafia:group_settings:by_group:{group_id}"
+
+    @staticmethod
+    def _get_user_index_key(user_tg_id: int) -> str:
+        return f"mafia:group_settings:by_user:{user_tg_id}"
+
+    async def get_or_resolve(
+        self,
+        group_tg_id: int,
+        user_tg_id: int,
+        resolve: Callable[[], Awaitable[GroupSettingsSchema]],
+    ) -> GroupSettingsSchema:
+        key = self._get_key(group_tg_id, user_tg_id)
+        cached = await self.redis.get(key)
+        if cached is not None:
+            return GroupSettingsSchema.model_validate_json(cached)
+        group_settings = await resolve()
+        index_keys = [self._get_group_index_key(group_settings.id)]
+        if group_settings.owner_tg_id is not None:
+            index_keys.append(
+                self._get_user_index_key(group_settings.owner_tg_id)
+            )
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(
+                key,
+                group_settings.model_dump_json(),
+                ex=GROUP_SETTINGS_TTL,
+            )
+            for index_key in index_keys:
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, GROUP_SETTINGS_TTL)
+            await pipe.execute()
+        return group_settings
+
+    async def _invalidate(self, index_key: str) -> None:
+        keys = await self.redis.smembers(index_key)
+        await self.redis.delete(index_key, *keys)
+
+    async def invalidate_group(self, group_id: int) -> None:
+        """
+        Сбрасывает кэш группы, когда в ней меняют,
+        чьи настройки применяются.
+        """
+        await self._invalidate(self._get_group_index_key(group_id))
+
+    async def invalidate_user(self, user_tg_id: int) -> None:
+        """
+        Сбрасывает кэш всех групп, где применяются
+        настройки пользователя.
+        """
+        await self._invalidate(self._get_user_index_key(user_tg_id))
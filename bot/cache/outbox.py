@@ -0,0 +1,34 @@
+from collections.abc import Iterable
+from typing import Any, Final
+
+from cache.cache_types import OutboxEvent
+from cache.storage import HashRedisStorage
+from pydantic_core import to_jsonable_python
+
+OUTBOX_KEY: Final = "mafia:outbox"
+OUTBOX_ATTEMPTS_KEY: Final = "mafia:outbox:attempts"
+OUTBOX_DEAD_LETTERS_KEY: Final = "mafia:outbox:dead_letters"
+
+
+def make_outbox_event(queue: str, message: Any) -> OutboxEvent:
+    return {
+        "queue": queue,
+        "message": to_jsonable_python(message),
+    }
+
+
+def dump_outbox_events(
+    storage: HashRedisStorage, events: Iterable[OutboxEvent]
+) -> list[str]:
+    return [storage.json_dumps(event) for event in events]
+
+
+async def push_to_outbox(
+    storage: HashRedisStorage, events: Iterable[OutboxEvent]
+) -> None:
+    """
+    Кладёт события в outbox, их опубликует relay_outbox.
+    """
+    raw_events = dump_outbox_events(storage=storage, events=events)
+    if raw_events:
+        await storage.redis.rpush(OUTBOX_KEY, *raw_events)
@@ -0,0 +1,138 @@
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Final
+
+from aiogram.fsm.context import FSMContext
+from cache.cache_types import GameCache
+from cache.game_state import GameStateRepository
+from loguru import logger
+from redis.asyncio import Redis
+from utils.common import get_the_most_frequently_encountered_id
+
+PHASE_BARRIER_CHANNEL: Final = "mafia:phase_barrier"
+PHASE_BARRIER_FIELDS: Final = (
+    "phase",
+    "wait_for",
+    "missed_actions",
+    "live_players_ids",
+    "cant_vote",
+    "vote_for",
+    "pros",
+    "cons",
+)
+
+_waiters: dict[int, asyncio.Event] = {}
+_games_to_check: ContextVar[list[FSMContext] | None] = ContextVar(
+    "games_to_check", default=None
+)
+
+
+def is_phase_completed(game_data: GameCache) -> bool:
+    """
+    Проверяет, что все ожидаемые в фазе действия уже получены.
+
+    Днём игроки обсуждают, поэтому день идёт до конца срока.
+    """
+    phase = game_data.get("phase")
+    if phase == "night":
+        # в wait_for остаются игроки, пропустившие прошлые ночи,
+        # их считает removing_inactive_players
+        expected = Counter(game_data.get("wait_for", []))
+        expected.subtract(game_data.get("missed_actions", []))
+        return all(count <= 0 for count in expected.values())
+    voters = set(game_data.get("live_players_ids", [])) - set(
+        game_data.get("cant_vote", [])
+    )
+    vote_for = game_data.get("vote_for", [])
+    if phase == "voting":
+        return voters <= {voting for voting, _ in vote_for}
+    if phase == "confirmation":
+        voters.discard(
+            get_the_most_frequently_encountered_id(
+                [voted for _, voted in vote_for]
+            )
+        )
+        return voters <= set(game_data.get("pros", [])) | set(
+            game_data.get("cons", [])
+        )
+    return False
+
+
+class PhaseBarrier:
+    """
+    Позволяет закончить фазу раньше срока.
+
+    Обработчики сообщают о завершении фазы через Redis,
+    потому что игру может вести другой процесс.
+    """
+
+    def __init__(self, state: FSMContext):
+        self.state = state
+        self.game_state = GameStateRepository(state)
+        self.chat_id = state.key.chat_id
+
+    async def is_completed(self) -> bool:
+        game_data = await self.game_state.get(*PHASE_BARRIER_FIELDS)
+        return is_phase_completed(game_data)
+
+    async def notify_if_completed(self) -> None:
+        if await self.is_completed():
+            await self.game_state.storage.redis.publish(
+                PHASE_BARRIER_CHANNEL, self.chat_id
+            )
+
+    @contextmanager
+    def expect_completion(self) -> Iterator[asyncio.Event]:
+        """
+        Возвращает событие, которое установится,
+        когда обработчик сообщит о завершении фазы.
+        """
+        event = _waiters[self.chat_id] = asyncio.Event()
+        try:
+            yield event
+        finally:
+            if _waiters.get(self.chat_id) is event:
+                del _waiters[self.chat_id]
+
+
+def check_phase_after_handler(state: FSMContext) -> None:
+    """
+    Просит проверить фазу игры, когда обработчик закончит работу
+    и сохранит все изменения.
+    """
+    games = _games_to_check.get()
+    if games is not None and state not in games:
+        games.append(state)
+
+
+@contextmanager
+def collect_games_to_check() -> Iterator[list[FSMContext]]:
+    token = _games_to_check.set([])
+    try:
+        yield _games_to_check.get()
+    finally:
+        _games_to_check.reset(token)
+
+
+async def listen_to_phase_barriers(redis: Redis) -> None:
+    """
+    Будит игры этого процесса, фазы которых завершены досрочно.
+    """
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(PHASE_BARRIER_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    event = _waiters.get(int(message["data"]))
+                    if event is not None:
+                        event.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Потеряна подписка на завершение фаз")
+            await asyncio.sleep(1)
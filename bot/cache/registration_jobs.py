@@ -0,0 +1,161 @@
+from collections.abc import Mapping
+from typing import Final, cast
+
+from cache.cache_types import RegistrationJobLiteral
+from redis.asyncio import Redis
+from utils.sharding import get_shard_id
+
+REGISTRATION_JOBS_KEY: Final = "mafia:registration_jobs"
+CLAIMED_REGISTRATION_JOBS_KEY: Final = (
+    "mafia:registration_jobs:claimed"
+)
+REGISTRATION_JOB_LEASE_TTL: Final = 60
+REGISTRATION_JOBS_BATCH_SIZE: Final = 100
+
+# Возвращает в очередь задачи, аренда которых истекла,
+# и атомарно забирает наступившие, поэтому каждую задачу
+# получает только один процесс
+CLAIM_DUE_JOBS_SCRIPT: Final = """
+local expired = redis.call(
+    'ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1]
+)
+for _, job in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], job)
+    redis.call('ZADD', KEYS[1], 'NX', ARGV[1], job)
+end
+local due = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3]
+)
+for _, job in ipairs(due) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('ZADD', KEYS[2], ARGV[2], job)
+end
+return due
+"""
+
+
+class RegistrationJobsRepository:
+    """
+    Отложенные задачи регистрации в Redis.
+
+    У каждого шарда свой sorted set со временем запуска,
+    поэтому задачи переживают перезапуск бота и выполняются
+    процессом, который ведёт чат. Взятая задача остаётся
+    за процессом на время аренды и возвращается в очередь,
+    если процесс упал, не завершив её.
+
+    Время запуска и аренда считаются по одним часам,
+    которые передаёт вызывающий код.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self._claim_due_jobs = redis.register_script(
+            CLAIM_DUE_JOBS_SCRIPT
+        )
+
+    @staticmethod
+    def _get_job(kind: RegistrationJobLiteral, chat_id: int) -> str:
+        return f"{kind}:{chat_id}"
+
+    @staticmethod
+    def _get_jobs_key(shard_id: int) -> str:
+        return f"{REGISTRATION_JOBS_KEY}:{shard_id}"
+
+    @staticmethod
+    def _get_claimed_jobs_key(shard_id: int) -> str:
+        return f"{CLAIMED_REGISTRATION_JOBS_KEY}:{shard_id}"
+
+    async def schedule(
+        self,
+        chat_id: int,
+        jobs: Mapping[RegistrationJobLiteral, int],
+    ) -> None:
+        """
+        Ставит или переносит задачи чата на указанное время.
+        """
+        await self.redis.zadd(
+            self._get_jobs_key(get_shard_id(chat_id)),
+            {
+                self._get_job(kind, chat_id): run_at
+                for kind, run_at in jobs.items()
+            },
+        )
+
+    async def cancel(
+        self, chat_id: int, *kinds: RegistrationJobLiteral
+    ) -> None:
+        jobs = [self._get_job(kind, chat_id) for kind in kinds]
+        shard_id = get_shard_id(chat_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._get_jobs_key(shard_id), *jobs)
+            pipe.zrem(self._get_claimed_jobs_key(shard_id), *jobs)
+            await pipe.execute()
+
+    async def claim_due(
+        self, shard_id: int, now: float, lease_until: float
+    ) -> list[tuple[RegistrationJobLiteral, int]]:
+        """
+        Забирает наступившие задачи чатов шарда.
+
+        now и lease_until должны быть по тем же часам,
+        что и время запуска задач.
+        """
+        jobs = await self._claim_due_jobs(
+            keys=[
+                self._get_jobs_key(shard_id),
+                self._get_claimed_jobs_key(shard_id),
+            ],
+            args=[
+                now,
+                lease_until,
+                REGISTRATION_JOBS_BATCH_SIZE,
+            ],
+        )
+        claimed = []
+        for job in jobs:
+            if isinstance(job, bytes):
+                job = job.decode("utf-8")
+            kind, chat_id = job.split(":")
+            claimed.append(
+                (cast(RegistrationJobLiteral, kind), int(chat_id))
+            )
+        return claimed
+
+    async def complete(
+        self, kind: RegistrationJobLiteral, chat_id: int
+    ) -> None:
+        await self.redis.zrem(
+            self._get_claimed_jobs_key(get_shard_id(chat_id)),
+            self._get_job(kind, chat_id),
+        )
+
+    async def move_legacy_jobs(self) -> None:
+        """
+        Раскладывает по шардам задачи из общей очереди,
+        которая была до деления задач между шардами.
+        Задачи, взятые до перезапуска, запускаются сразу.
+        """
+        queued = await self.redis.zrange(
+            REGISTRATION_JOBS_KEY, 0, -1, withscores=True
+        )
+        claimed = await self.redis.zrange(
+            CLAIMED_REGISTRATION_JOBS_KEY, 0, -1
+        )
+        jobs = [*queued, *((job, 0) for job in claimed)]
+        if not jobs:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for job, run_at in jobs:
+                if isinstance(job, bytes):
+                    job = job.decode("utf-8")
+                _, chat_id = job.split(":")
+                pipe.zadd(
+                    self._get_jobs_key(get_shard_id(int(chat_id))),
+                    {job: run_at},
+                    nx=True,
+                )
+            pipe.delete(
+                REGISTRATION_JOBS_KEY, CLAIMED_REGISTRATION_JOBS_KEY
+            )
+            await pipe.execute()
@@ -0,0 +1,336 @@
+from collections.abc import Callable, Iterable, Mapping
+from functools import partial
+from typing import Any, Final
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+LEGACY_DATA_PART: Final = "data"
+
+
+class HashRedisStorage(RedisStorage):
+    """
+    Хранилище FSM, которое держит данные в Redis-хэше.
+
+    Каждое поле верхнего уровня сериализуется отдельно,
+    поэтому можно читать и обновлять только нужные поля,
+    не пересылая всю игру целиком.
+
+    Для полей из indexed_fields дополнительно ведутся множества,
+    чтобы проверять вхождение без чтения самих полей.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        indexed_fields: Iterable[str] = (),
+        **kwargs: Any,
+    ):
+        super().__init__(redis=redis, **kwargs)
+        self.indexed_fields = frozenset(indexed_fields)
+
+    def build_fields_key(self, key: StorageKey) -> str:
+        return self.key_builder.build(key, "fields")
+
+    def build_index_key(self, key: StorageKey, field: str) -> str:
+        return self.key_builder.build(key, f"index:{field}")
+
+    def _write_indexes(
+        self,
+        pipe: Pipeline,
+        key: StorageKey,
+        data: Mapping[str, Any],
+    ) -> None:
+        self._write_indexes_by_keys(
+            pipe=pipe,
+            build_index_key=partial(self.build_index_key, key),
+            data=data,
+        )
+
+    def _write_indexes_by_keys(
+        self,
+        pipe: Pipeline,
+        build_index_key: Callable[[str], str],
+        data: Mapping[str, Any],
+    ) -> None:
+        for field in self.indexed_fields & data.keys():
+            index_key = build_index_key(field)
+            pipe.delete(index_key)
+            if data[field]:
+                pipe.sadd(index_key, *data[field])
+                if self.data_ttl:
+                    pipe.expire(index_key, self.data_ttl)
+
+    def _delete_data(self, pipe: Pipeline, key: StorageKey) -> None:
+        pipe.delete(self.build_fields_key(key))
+        for field in self.indexed_fields:
+            pipe.delete(self.build_index_key(key, field))
+
+    def clear_in_pipeline(
+        self, pipe: Pipeline, key: StorageKey
+    ) -> None:
+        """
+        Добавляет в pipe удаление состояния и данных,
+        чтобы очистить их атомарно вместе с другими командами.
+        """
+        pipe.delete(self.key_builder.build(key, "state"))
+        self._delete_data(pipe=pipe, key=key)
+
+    def _dump_fields(
+        self, data: Mapping[str, Any]
+    ) -> dict[str, str | bytes]:
+        return {
+            field: self.json_dumps(value)
+            for field, value in data.items()
+        }
+
+    def _load_fields(
+        self, raw_data: Mapping[bytes | str, bytes | str]
+    ) -> dict[str, Any]:
+        return {
+            (
+                field.decode("utf-8")
+                if isinstance(field, bytes)
+                else field
+            ): self.json_loads(value)
+            for field, value in raw_data.items()
+        }
+
+    def _expire_data(self, pipe: Pipeline, redis_key: str) -> None:
+        if self.data_ttl:
+            pipe.expire(redis_key, self.data_ttl)
+
+    def _write_data(
+        self,
+        pipe: Pipeline,
+        key: StorageKey,
+        data: Mapping[str, Any],
+    ) -> None:
+        redis_key = self.build_fields_key(key)
+        self._delete_data(pipe=pipe, key=key)
+        if data:
+            pipe.hset(redis_key, mapping=self._dump_fields(data))
+            self._expire_data(pipe=pipe, redis_key=redis_key)
+            self._write_indexes(pipe=pipe, key=key, data=data)
+
+    async def set_data(
+        self,
+        key: StorageKey,
+        data: dict[str, Any],
+    ) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._write_data(pipe=pipe, key=key, data=data)
+            await pipe.execute()
+
+    async def set_data_unless_marked(
+        self,
+        key: StorageKey,
+        data: dict[str, Any],
+        marks_field: str,
+        mark: str,
+    ) -> bool:
+        """
+        Записывает data целиком, если в списке marks_field
+        ещё нет mark. Проверка и запись идут в одной транзакции
+        WATCH/MULTI, поэтому из двух одинаковых записей
+        пройдёт только одна.
+        """
+        redis_key = self.build_fields_key(key)
+
+        async def transaction(pipe: Pipeline) -> bool:
+            marks = await pipe.hget(redis_key, marks_field)
+            if marks is not None and mark in self.json_loads(marks):
+                return False
+            pipe.multi()
+            self._write_data(pipe=pipe, key=key, data=data)
+            return True
+
+        return await self.redis.transaction(
+            transaction, redis_key, value_from_callable=True
+        )
+
+    async def get_data(
+        self,
+        key: StorageKey,
+    ) -> dict[str, Any]:
+        raw_data = await self.redis.hgetall(
+            self.build_fields_key(key)
+        )
+        return self._load_fields(raw_data)
+
+    async def get_value(
+        self,
+        storage_key: StorageKey,
+        dict_key: str,
+        default: Any | None = None,
+    ) -> Any | None:
+        value = await self.redis.hget(
+            self.build_fields_key(storage_key), dict_key
+        )
+        if value is None:
+            return default
+        return self.json_loads(value)
+
+    async def update_data(
+        self,
+        key: StorageKey,
+        data: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        redis_key = self.build_fields_key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if data:
+                pipe.hset(redis_key, mapping=self._dump_fields(data))
+                self._expire_data(pipe=pipe, redis_key=redis_key)
+                self._write_indexes(pipe=pipe, key=key, data=data)
+            pipe.hgetall(redis_key)
+            *_, raw_data = await pipe.execute()
+        return self._load_fields(raw_data)
+
+    async def get_fields(
+        self,
+        key: StorageKey,
+        fields: Iterable[str],
+    ) -> dict[str, Any]:
+        fields = list(fields)
+        if not fields:
+            return await self.get_data(key)
+        values = await self.redis.hmget(
+            self.build_fields_key(key), fields
+        )
+        return {
+            field: self.json_loads(value)
+            for field, value in zip(fields, values)
+            if value is not None
+        }
+
+    async def set_fields(
+        self,
+        key: StorageKey,
+        data: Mapping[str, Any],
+    ) -> None:
+        if not data:
+            return
+        redis_key = self.build_fields_key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(redis_key, mapping=self._dump_fields(data))
+            self._expire_data(pipe=pipe, redis_key=redis_key)
+            self._write_indexes(pipe=pipe, key=key, data=data)
+            await pipe.execute()
+
+    async def get_memberships(
+        self,
+        key: StorageKey,
+        fields: Iterable[str],
+        value: int | str,
+    ) -> dict[str, bool] | None:
+        """
+        Проверяет, входит ли value в индексированные поля.
+        Возвращает None, если индекс первого поля ещё не построен.
+        """
+        fields = list(fields)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self.build_index_key(key, fields[0]))
+            for field in fields:
+                pipe.sismember(
+                    self.build_index_key(key, field), value
+                )
+            is_indexed, *results = await pipe.execute()
+        if not is_indexed:
+            return None
+        return {
+            field: bool(result)
+            for field, result in zip(fields, results)
+        }
+
+    async def mutate_fields(
+        self,
+        key: StorageKey,
+        fields: Iterable[str],
+        mutation: Callable[[dict[str, Any]], None],
+    ) -> dict[str, Any]:
+        """
+        Атомарно изменяет поля через WATCH/MULTI.
+
+        Поля читаются, передаются в mutation и записываются обратно.
+        Если ключ успел измениться, операция повторяется
+        на свежих данных, поэтому параллельные изменения не теряются.
+        """
+        redis_key = self.build_fields_key(key)
+        fields = list(fields)
+
+        async def transaction(pipe: Pipeline) -> dict[str, Any]:
+            values = await pipe.hmget(redis_key, fields)
+            data = {
+                field: self.json_loads(value)
+                for field, value in zip(fields, values)
+                if value is not None
+            }
+            mutation(data)
+            pipe.multi()
+            changed = {
+                field: data[field]
+                for field in fields
+                if field in data
+            }
+            if changed:
+                pipe.hset(
+                    redis_key, mapping=self._dump_fields(changed)
+                )
+                self._expire_data(pipe=pipe, redis_key=redis_key)
+                self._write_indexes(pipe=pipe, key=key, data=changed)
+            return data
+
+        return await self.redis.transaction(
+            transaction, redis_key, value_from_callable=True
+        )
+
+    async def _move_legacy_key(
+        self, pipe: Pipeline, legacy_key: str, base_key: str
+    ) -> None:
+        redis_key = f"{base_key}fields"
+        raw_data = await pipe.get(legacy_key)
+        is_moved = await pipe.exists(redis_key)
+        pipe.multi()
+        pipe.delete(legacy_key)
+        if raw_data is None or is_moved:
+            return
+        data = self.json_loads(raw_data)
+        if not data:
+            return
+        pipe.hset(redis_key, mapping=self._dump_fields(data))
+        self._expire_data(pipe=pipe, redis_key=redis_key)
+        self._write_indexes_by_keys(
+            pipe=pipe,
+            build_index_key=lambda field: f"{base_key}index:{field}",
+            data=data,
+        )
+
+    async def move_legacy_data(self) -> None:
+        """
+        Переносит в хэши данные, которые RedisStorage хранил
+        одной JSON-строкой, чтобы после обновления
+        не потерять игры, идущие во время выкладки.
+        """
+        key_builder = self.key_builder
+        if not isinstance(key_builder, DefaultKeyBuilder):
+            return
+        separator = key_builder.separator
+        pattern = (
+            f"{key_builder.prefix}{separator}*"
+            f"{separator}{LEGACY_DATA_PART}"
+        )
+        async for legacy_key in self.redis.scan_iter(match=pattern):
+            if isinstance(legacy_key, bytes):
+                legacy_key = legacy_key.decode("utf-8")
+            base_key = legacy_key.removesuffix(LEGACY_DATA_PART)
+            await self.redis.transaction(
+                partial(
+                    self._move_legacy_key,
+                    legacy_key=legacy_key,
+                    base_key=base_key,
+                ),
+                legacy_key,
+                f"{base_key}fields",
+            )
@@ -1,3 +1,6 @@
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
 from general import settings
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -6,8 +9,27 @@ from sqlalchemy.ext.asyncio import (
 )
 
 engine = create_async_engine(
-    url=settings.db.url, echo=settings.db.echo
+    url=settings.db.url,
+    echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=True,
 )
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+
+AFTER_COMMIT_KEY: Final = "after_commit"
+
+
+def run_after_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[Any]]
+) -> None:
+    """
+    Откладывает действие до фиксации изменений сессии,
+    чтобы оно не опередило запись в базу.
+    Отложенные действия выполняет DatabaseMiddleware.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
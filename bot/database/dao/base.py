@@ -1,13 +1,13 @@
-from typing import List
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, List
 
 from database.common.base import BaseModel as Base
 from loguru import logger
 from pydantic import BaseModel
 from sqlalchemy import delete as sqlalchemy_delete
-from sqlalchemy import (
-    func,
-)
+from sqlalchemy import func
 from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -133,6 +133,101 @@ class BaseDAO[M: Base]:
             )
             raise
 
+    async def add_many_ignoring_conflicts[S: BaseModel](
+        self,
+        instances: List[S],
+        conflict_fields: Sequence[str],
+        exclude: set[str] | None = None,
+    ) -> list[S]:
+        """
+        Добавляет записи одним запросом, пропуская те,
+        что уже есть по conflict_fields. Возвращает добавленные.
+        """
+        unique_instances = {
+            tuple(
+                getattr(item, field) for field in conflict_fields
+            ): item
+            for item in instances
+        }
+        if not unique_instances:
+            return []
+        logger.info(
+            f"Добавление записей {self.model.__name__} без дублей. Количество: {len(unique_instances)}"
+        )
+        conflict_columns = [
+            getattr(self.model, field) for field in conflict_fields
+        ]
+        try:
+            stmt = (
+                insert(self.model)
+                .values(
+                    [
+                        item.model_dump(
+                            exclude_unset=True, exclude=exclude
+                        )
+                        for item in unique_instances.values()
+                    ]
+                )
+                .on_conflict_do_nothing(
+                    index_elements=conflict_columns
+                )
+                .returning(*conflict_columns)
+            )
+            result = await self._session.execute(stmt)
+            added = [
+                unique_instances[tuple(row)] for row in result.all()
+            ]
+            logger.info(f"Успешно добавлено {len(added)} записей.")
+            return added
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Ошибка при добавлении нескольких записей: {e}"
+            )
+            raise
+
+    async def increment_counters(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        key_fields: Sequence[str],
+    ) -> None:
+        """
+        Прибавляет значения из rows к счётчикам записей
+        с ключом key_fields, создавая недостающие записи.
+        Все строки складываются в один запрос.
+        """
+        totals: dict[tuple, dict[str, int]] = {}
+        for row in rows:
+            key = tuple(row[field] for field in key_fields)
+            counters = totals.setdefault(key, {})
+            for field, value in row.items():
+                if field not in key_fields:
+                    counters[field] = counters.get(field, 0) + value
+        if not totals:
+            return
+        values_list = [
+            dict(zip(key_fields, key)) | counters
+            for key, counters in totals.items()
+        ]
+        counter_fields = values_list[0].keys() - set(key_fields)
+        try:
+            stmt = insert(self.model).values(values_list)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    getattr(self.model, field)
+                    for field in key_fields
+                ],
+                set_={
+                    field: getattr(self.model, field)
+                    + getattr(stmt.excluded, field)
+                    for field in counter_fields
+                },
+            )
+            await self._session.execute(stmt)
+            await self._session.flush()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при обновлении счётчиков: {e}")
+            raise
+
     async def update(
         self, filters: BaseModel, values: BaseModel
     ) -> int:
@@ -207,26 +302,19 @@ class BaseDAO[M: Base]:
             f"Массовое обновление записей {self.model.__name__}"
         )
         try:
-            updated_count = 0
+            rows = []
             for record in records:
                 record_dict = record.model_dump(exclude_unset=True)
-                if "id" not in record_dict:
-                    continue
-
-                update_data = {
-                    k: v for k, v in record_dict.items() if k != "id"
-                }
-                stmt = (
-                    sqlalchemy_update(self.model)
-                    .filter_by(id=record_dict["id"])
-                    .values(**update_data)
-                )
-                result = await self._session.execute(stmt)
-                updated_count += result.rowcount
-
+                if "id" in record_dict:
+                    rows.append(record_dict)
+            if not rows:
+                return 0
+            await self._session.execute(
+                sqlalchemy_update(self.model), rows
+            )
             await self._session.flush()
-            logger.info(f"Обновлено {updated_count} записей")
-            return updated_count
+            logger.info(f"Обновлено {len(rows)} записей")
+            return len(rows)
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при массовом обновлении: {e}")
             raise
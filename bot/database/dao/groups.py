@@ -63,4 +63,5 @@ class GroupsDao(BaseDAO[GroupModel]):
             time_for_night=time_for_night,
             time_for_day=time_for_day,
             is_there_settings=True,
+            owner_tg_id=user_tg_id.user_tg_id,
         )
@@ -1,7 +1,7 @@
 from database.common.sessions import async_session_maker
 from database.models import GroupingModel, RoleModel
 from general import settings
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import ROLES_REGISTRY
 from general.groupings import Groupings
 from loguru import logger
 from sqlalchemy.exc import DatabaseError
@@ -17,7 +17,7 @@ async def fill_database_with_roles():
                 for grouping in Groupings
             ]
             session.add_all(groupings)
-            all_roles = get_data_with_roles()
+            all_roles = ROLES_REGISTRY
             roles = [
                 RoleModel(
                     key=key,
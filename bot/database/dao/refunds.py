@@ -0,0 +1,6 @@
+from database.dao.base import BaseDAO
+from database.models import RefundModel
+
+
+class RefundsDao(BaseDAO[RefundModel]):
+    model = RefundModel
@@ -0,0 +1,81 @@
+from database.dao.base import BaseDAO
+from database.models import (
+    BetStatisticModel,
+    GroupingStatisticModel,
+    GroupStatisticModel,
+    PlayerStatisticModel,
+    RoleStatisticModel,
+)
+from database.schemas.common import UserTgIdSchema
+from database.schemas.groups import GroupIdSchema
+from sqlalchemy import desc, select
+
+
+class GroupStatisticsDao(BaseDAO[GroupStatisticModel]):
+    model = GroupStatisticModel
+
+
+class GroupingStatisticsDao(BaseDAO[GroupingStatisticModel]):
+    model = GroupingStatisticModel
+
+    async def get_winning_groupings(
+        self, group_id_filter: GroupIdSchema
+    ):
+        query = (
+            select(self.model)
+            .filter_by(**group_id_filter.model_dump())
+            .order_by(desc(self.model.number_of_wins))
+        )
+        result = await self._session.scalars(query)
+        return result.all()
+
+
+class PlayerStatisticsDao(BaseDAO[PlayerStatisticModel]):
+    model = PlayerStatisticModel
+
+    async def get_top_players(
+        self,
+        group_id_filter: GroupIdSchema,
+        min_number_of_games: int = 3,
+        limit: int = 15,
+    ):
+        efficiency = (
+            self.model.number_of_wins
+            * 100
+            / self.model.number_of_games
+        ).label("efficiency")
+        query = (
+            select(
+                self.model.user_tg_id,
+                self.model.number_of_games,
+                self.model.number_of_wins,
+                efficiency,
+            )
+            .filter(
+                self.model.group_id == group_id_filter.group_id,
+                self.model.number_of_games >= min_number_of_games,
+            )
+            .order_by(
+                desc(self.model.number_of_games), desc(efficiency)
+            )
+            .limit(limit)
+        )
+        result = await self._session.execute(query)
+        return result.all()
+
+
+class RoleStatisticsDao(BaseDAO[RoleStatisticModel]):
+    model = RoleStatisticModel
+
+    async def get_results(self, user_tg_id: UserTgIdSchema):
+        query = (
+            select(self.model)
+            .filter_by(**user_tg_id.model_dump())
+            .order_by(desc(self.model.money))
+        )
+        result = await self._session.scalars(query)
+        return result.all()
+
+
+class BetStatisticsDao(BaseDAO[BetStatisticModel]):
+    model = BetStatisticModel
@@ -1,9 +1,12 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
 from database.dao.base import BaseDAO
 from database.dao.settings import SettingsDao
 from database.models import UserModel
 from database.schemas.bids import UserMoneySchema
 from database.schemas.common import TgIdSchema, UserTgIdSchema
-from sqlalchemy import update
+from sqlalchemy import BigInteger, Integer, column, update, values
 
 
 class UsersDao(BaseDAO[UserModel]):
@@ -12,22 +15,41 @@ class UsersDao(BaseDAO[UserModel]):
     async def update_balance(
         self, user_money: UserMoneySchema, add_money: bool
     ):
-        if add_money:
-            value = {
-                self.model.balance: self.model.balance
-                + user_money.money
-            }
-        else:
-            value = {
-                self.model.balance: self.model.balance
-                - user_money.money
-            }
+        await self.update_balances(
+            users_money=[user_money], add_money=add_money
+        )
+
+    async def update_balances(
+        self,
+        users_money: Iterable[UserMoneySchema],
+        add_money: bool,
+    ) -> None:
+        """
+        Изменяет балансы всех пользователей одним запросом.
+        """
+        deltas: defaultdict[int, int] = defaultdict(int)
+        for user_money in users_money:
+            deltas[user_money.user_tg_id] += (
+                user_money.money if add_money else -user_money.money
+            )
+        deltas = {
+            user_tg_id: delta
+            for user_tg_id, delta in deltas.items()
+            if delta
+        }
+        if not deltas:
+            return
+        deltas_table = values(
+            column("tg_id", BigInteger),
+            column("delta", Integer),
+            name="deltas",
+        ).data(list(deltas.items()))
         update_stmt = (
             update(self.model)
-            .where(
-                self.model.tg_id == user_money.user_tg_id,
+            .where(self.model.tg_id == deltas_table.c.tg_id)
+            .values(
+                balance=self.model.balance + deltas_table.c.delta
             )
-            .values(value)
         )
         await self._session.execute(update_stmt)
         await self._session.flush()
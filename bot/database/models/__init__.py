@@ -4,7 +4,15 @@ from .groups import GroupModel
 from .orders import OrderModel
 from .prohibited_roles import ProhibitedRoleModel
 from .rates import RateModel
+from .refunds import RefundModel
 from .results import ResultModel
 from .roles import RoleModel
 from .settings import SettingModel
+from .statistics import (
+    BetStatisticModel,
+    GroupingStatisticModel,
+    GroupStatisticModel,
+    PlayerStatisticModel,
+    RoleStatisticModel,
+)
 from .users import UserModel
@@ -1,11 +1,19 @@
 from cache.cache_types import RolesLiteral
 from database.common.base import BaseModel, IdMixin
-from sqlalchemy import BigInteger, CheckConstraint, ForeignKey
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    ForeignKey,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class RateModel(IdMixin, BaseModel):
-    __table_args__ = (CheckConstraint("money > 0"),)
+    __table_args__ = (
+        CheckConstraint("money > 0"),
+        UniqueConstraint("game_id", "user_tg_id"),
+    )
     money: Mapped[int]
     is_winner: Mapped[bool]
     game_id: Mapped[int] = mapped_column(
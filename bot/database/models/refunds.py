@@ -0,0 +1,20 @@
+from database.common.base import BaseModel, IdMixin
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    ForeignKey,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class RefundModel(IdMixin, BaseModel):
+    __table_args__ = (
+        CheckConstraint("money > 0"),
+        UniqueConstraint("game_id", "user_tg_id"),
+    )
+    game_id: Mapped[int]
+    user_tg_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE")
+    )
+    money: Mapped[int]
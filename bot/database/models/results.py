@@ -1,11 +1,19 @@
 from cache.cache_types import RolesLiteral
 from database.common.base import BaseModel, IdMixin
-from sqlalchemy import BigInteger, CheckConstraint, ForeignKey
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    ForeignKey,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class ResultModel(IdMixin, BaseModel):
-    __table_args__ = (CheckConstraint("money >= 0"),)
+    __table_args__ = (
+        CheckConstraint("money >= 0"),
+        UniqueConstraint("game_id", "user_tg_id"),
+    )
     user_tg_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.tg_id", ondelete="SET NULL")
     )
@@ -0,0 +1,76 @@
+from cache.cache_types import RolesLiteral
+from database.common.base import BaseModel
+from sqlalchemy import BigInteger, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class GroupStatisticModel(BaseModel):
+    __tablename__ = "group_statistics"
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    number_of_games: Mapped[int] = mapped_column(default=0)
+    number_of_players: Mapped[int] = mapped_column(default=0)
+    number_of_nights: Mapped[int] = mapped_column(default=0)
+    duration: Mapped[int] = mapped_column(default=0)
+
+
+class GroupingStatisticModel(BaseModel):
+    __tablename__ = "grouping_statistics"
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    grouping: Mapped[str] = mapped_column(
+        ForeignKey("groupings.name", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    number_of_wins: Mapped[int] = mapped_column(default=0)
+
+
+class PlayerStatisticModel(BaseModel):
+    __tablename__ = "player_statistics"
+    __table_args__ = (
+        Index(
+            "ix_player_statistics_group_id_number_of_games",
+            "group_id",
+            "number_of_games",
+        ),
+    )
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_tg_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.tg_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    number_of_games: Mapped[int] = mapped_column(default=0)
+    number_of_wins: Mapped[int] = mapped_column(default=0)
+
+
+class RoleStatisticModel(BaseModel):
+    __tablename__ = "role_statistics"
+    user_tg_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.tg_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    role_id: Mapped[RolesLiteral] = mapped_column(
+        ForeignKey("roles.key", ondelete="CASCADE"), primary_key=True
+    )
+    number_of_games: Mapped[int] = mapped_column(default=0)
+    number_of_wins: Mapped[int] = mapped_column(default=0)
+    number_of_nights: Mapped[int] = mapped_column(default=0)
+    money: Mapped[int] = mapped_column(default=0)
+
+
+class BetStatisticModel(BaseModel):
+    __tablename__ = "bet_statistics"
+    user_tg_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.tg_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    number_of_bets: Mapped[int] = mapped_column(default=0)
+    number_of_wins: Mapped[int] = mapped_column(default=0)
+    money: Mapped[int] = mapped_column(default=0)
@@ -22,3 +22,7 @@ class RateSchema(BaseModel):
     role_id: str
     is_winner: bool
     game_id: int
+
+
+class RefundSchema(BidForRoleSchema):
+    game_id: int
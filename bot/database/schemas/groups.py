@@ -9,6 +9,7 @@ class GroupSettingsSchema(BaseModel):
     time_for_night: int
     time_for_day: int
     is_there_settings: bool
+    owner_tg_id: int | None = None
 
 
 class GroupIdSchema(BaseModel):
@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Final, TypeAlias, overload
 
 from cache.cache_types import RolesLiteral
@@ -7,6 +9,52 @@ from mafia.roles import ActiveRoleAtNightABC, RoleABC
 DataWithRoles: TypeAlias = dict[RolesLiteral, RoleABC]
 
 
+ROLES_REGISTRY: Final[Mapping[RolesLiteral, type[RoleABC]]] = (
+    MappingProxyType(
+        {
+            role.role_id: role
+            for role in (
+                roles.Mafia,
+                roles.Doctor,
+                roles.Policeman,
+                roles.Civilian,
+                roles.MafiaAlias,
+                roles.Traitor,
+                roles.Killer,
+                roles.Werewolf,
+                roles.Forger,
+                roles.Hacker,
+                roles.Sleeper,
+                roles.Agent,
+                roles.Journalist,
+                roles.Punisher,
+                roles.Analyst,
+                roles.SuicideBomber,
+                roles.Instigator,
+                roles.PrimeMinister,
+                roles.Poisoner,
+                roles.Bodyguard,
+                roles.Masochist,
+                roles.Lawyer,
+                roles.AngelOfDeath,
+                roles.Prosecutor,
+                roles.LuckyGay,
+                roles.DoctorAlias,
+                roles.PolicemanAlias,
+                roles.Warden,
+            )
+        }
+    )
+)
+
+ROLES_SORTED_BY_NAME: Final[tuple[RolesLiteral, ...]] = tuple(
+    sorted(
+        ROLES_REGISTRY,
+        key=lambda role_id: ROLES_REGISTRY[role_id].role,
+    )
+)
+
+
 @overload
 def get_data_with_roles() -> DataWithRoles: ...
 
@@ -20,40 +68,16 @@ def get_data_with_roles(
 def get_data_with_roles(
     role_id: RolesLiteral | None = None,
 ):
-    roles_data = [
-        roles.Mafia(),
-        roles.Doctor(),
-        roles.Policeman(),
-        roles.Civilian(),
-        roles.MafiaAlias(),
-        roles.Traitor(),
-        roles.Killer(),
-        roles.Werewolf(),
-        roles.Forger(),
-        roles.Hacker(),
-        roles.Sleeper(),
-        roles.Agent(),
-        roles.Journalist(),
-        roles.Punisher(),
-        roles.Analyst(),
-        roles.SuicideBomber(),
-        roles.Instigator(),
-        roles.PrimeMinister(),
-        roles.Poisoner(),
-        roles.Bodyguard(),
-        roles.Masochist(),
-        roles.Lawyer(),
-        roles.AngelOfDeath(),
-        roles.Prosecutor(),
-        roles.LuckyGay(),
-        roles.DoctorAlias(),
-        roles.PolicemanAlias(),
-        roles.Warden(),
-    ]
-    all_roles = {role.role_id: role for role in roles_data}
+    """
+    Создаёт новые экземпляры ролей для конкретной игры.
+    Для чтения названий, группировок и ключей ролей
+    достаточно ROLES_REGISTRY.
+    """
     if role_id:
-        return all_roles[role_id]
-    return all_roles
+        return ROLES_REGISTRY[role_id]()
+    return {
+        role_id: role() for role_id, role in ROLES_REGISTRY.items()
+    }
 
 
 BASES_ROLES: Final[tuple[RolesLiteral, ...]] = (
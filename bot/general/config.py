@@ -2,7 +2,13 @@ from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
 from dotenv import load_dotenv
 from faststream.rabbit import RabbitBroker
+from middlewares.rate_limit import (
+    GLOBAL_MESSAGES_PER_SECOND,
+    RateLimitMiddleware,
+)
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from redis.asyncio import Redis
+from utils.clock import create_clock
 
 load_dotenv()
 
@@ -35,25 +41,63 @@ class RedisSettings(BaseSettings):
 
 
 class BotSettings(BaseSettings):
+    """
+    token: токен бота
+    url: ссылка на бота
+    use_webhook: True, если обновления приходят через вебхук, иначе polling
+    webhook_url: публичный адрес, на который Telegram шлёт обновления
+    max_concurrent_updates: сколько обновлений обрабатывается одновременно
+    max_pending_updates: сколько обновлений может ждать обработки
+    """
+
     token: str
     url: str
+    use_webhook: bool = False
+    webhook_url: str | None = None
+    webhook_path: str = "/webhook"
+    webhook_secret: str | None = None
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+    max_concurrent_updates: int = 100
+    max_pending_updates: int = 1000
     model_config = SettingsConfigDict(
         case_sensitive=False, env_prefix="bot_"
     )
 
 
 class MafiaSettings(BaseSettings):
+    """
+    clock_speed: во сколько раз игровое время быстрее настоящего,
+    больше 1 только для нагрузочных тестов
+    """
+
     time_for_night: int
     time_for_day: int
     maximum_number_of_players: int
     minimum_number_of_players: int
     maximum_registration_time: int
     init_db: bool
+    clock_speed: float = 1
     model_config = SettingsConfigDict(
         case_sensitive=False, env_prefix="mafia_"
     )
 
 
+class ShardingSettings(BaseSettings):
+    """
+    shards_count: количество процессов, между которыми делятся чаты
+    shard_id: номер текущего процесса
+    is_ingress: процесс только принимает обновления и раздаёт их шардам
+    """
+
+    shards_count: int = 1
+    shard_id: int = 0
+    is_ingress: bool = False
+    model_config = SettingsConfigDict(
+        case_sensitive=False, env_prefix="sharding_"
+    )
+
+
 class DBSettings(BaseSettings):
     """
     db_host: хост базы
@@ -62,6 +106,10 @@ class DBSettings(BaseSettings):
     postgres_password: пароль пользователя
     postgres_db: название базы
     echo: bool = True, если нужно, чтобы запросы выводились в консоль, иначе False
+    pool_size: сколько соединений пул держит открытыми
+    max_overflow: сколько соединений можно открыть сверх pool_size
+    pool_timeout: сколько секунд ждать свободного соединения
+    pool_recycle: через сколько секунд пересоздавать соединение
     """
 
     db_host: str
@@ -70,6 +118,10 @@ class DBSettings(BaseSettings):
     postgres_password: str
     postgres_db: str
     echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
 
     @property
     def url(self) -> str:
@@ -92,6 +144,7 @@ class Settings(BaseSettings):
     bot: BotSettings = BotSettings()
     mafia: MafiaSettings = MafiaSettings()
     redis: RedisSettings = RedisSettings()
+    sharding: ShardingSettings = ShardingSettings()
     model_config = SettingsConfigDict(
         case_sensitive=False,
     )
@@ -99,7 +152,14 @@ class Settings(BaseSettings):
 
 settings = Settings()
 broker = RabbitBroker(settings.rabbit.url)
+redis = Redis(host=settings.redis.host, port=settings.redis.port)
+clock = create_clock(settings.mafia.clock_speed)
 bot = Bot(
     token=settings.bot.token,
     default=DefaultBotProperties(parse_mode="HTML"),
 )
+rate_limiter = RateLimitMiddleware(
+    messages_per_second=GLOBAL_MESSAGES_PER_SECOND
+    / settings.sharding.shards_count
+)
+bot.session.middleware(rate_limiter)
@@ -5,3 +5,13 @@ class GameIsOver(Exception):
     def __init__(self, winner: Groupings) -> None:
         super().__init__(winner)
         self.winner = winner
+
+
+class StepIsAlreadyApplied(Exception):
+    """
+    Шаг фазы уже сохранил другой процесс, который ведёт игру.
+    """
+
+    def __init__(self, step: str) -> None:
+        super().__init__(step)
+        self.step = step
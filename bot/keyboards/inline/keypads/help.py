@@ -1,7 +1,8 @@
-from operator import attrgetter
-
 from aiogram.types import InlineKeyboardButton
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import (
+    ROLES_REGISTRY,
+    ROLES_SORTED_BY_NAME,
+)
 from general.text import CONFIGURE_GAME_SECTION, ROLES_SELECTION
 from keyboards.inline.builder import generate_inline_kb
 from keyboards.inline.buttons.common import (
@@ -20,15 +21,14 @@ from keyboards.inline.cb.cb_text import (
 
 
 def get_roles_kb():
-    all_roles = get_data_with_roles()
     buttons = [
         InlineKeyboardButton(
-            text=role.role + role.grouping.value.name[-1],
+            text=ROLES_REGISTRY[role_id].role
+            + ROLES_REGISTRY[role_id].grouping.value.name[-1],
             callback_data=RoleCbData(role_id=role_id).pack(),
         )
-        for role_id, role in all_roles.items()
+        for role_id in ROLES_SORTED_BY_NAME
     ]
-    buttons.sort(key=attrgetter("text"))
     buttons.append(HELP_BTN)
     return generate_inline_kb(
         data_with_buttons=buttons, leave_1_each=1
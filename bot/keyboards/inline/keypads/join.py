@@ -1,11 +1,14 @@
-from operator import attrgetter
+from functools import lru_cache
 
 from aiogram import Bot
-from aiogram.types import InlineKeyboardButton
-from aiogram.utils.deep_linking import create_start_link
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.utils.deep_linking import create_deep_link
 from cache.cache_types import PlayersIds, RolesLiteral
 from general import settings
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import (
+    ROLES_REGISTRY,
+    ROLES_SORTED_BY_NAME,
+)
 from keyboards.inline.builder import generate_inline_kb
 from keyboards.inline.buttons.common import CANCEL_BTN, TO_BOT_BTN
 from keyboards.inline.cb.cb_text import (
@@ -13,19 +16,23 @@ from keyboards.inline.cb.cb_text import (
 )
 
 
-async def get_join_kb(
-    bot: Bot, game_chat: int, players_ids: PlayersIds
-):
+@lru_cache(maxsize=1024)
+def _build_join_kb(
+    bot_username: str, game_chat: int, can_start: bool
+) -> InlineKeyboardMarkup:
     buttons = [
         InlineKeyboardButton(
             text="Присоединиться или выйти",
-            url=await create_start_link(
-                bot, str(game_chat), encode=True
+            url=create_deep_link(
+                username=bot_username,
+                link_type="start",
+                payload=str(game_chat),
+                encode=True,
             ),
         ),
         TO_BOT_BTN,
     ]
-    if len(players_ids) >= settings.mafia.minimum_number_of_players:
+    if can_start:
         buttons.append(
             InlineKeyboardButton(
                 text="Начать игру",
@@ -35,18 +42,36 @@ async def get_join_kb(
     return generate_inline_kb(data_with_buttons=buttons)
 
 
-async def offer_to_place_bet(banned_roles: list[RolesLiteral]):
+async def get_join_kb(
+    bot: Bot, game_chat: int, players_ids: PlayersIds
+):
+    bot_info = await bot.me()
+    return _build_join_kb(
+        bot_username=bot_info.username,
+        game_chat=game_chat,
+        can_start=len(players_ids)
+        >= settings.mafia.minimum_number_of_players,
+    )
+
+
+@lru_cache(maxsize=128)
+def _build_bet_kb(
+    banned_roles: frozenset[RolesLiteral],
+) -> InlineKeyboardMarkup:
     buttons = []
-    for key, role in get_data_with_roles().items():
+    for key in ROLES_SORTED_BY_NAME:
         if key not in banned_roles:
             buttons.append(
                 InlineKeyboardButton(
-                    text=role.role, callback_data=key
+                    text=ROLES_REGISTRY[key].role, callback_data=key
                 )
             )
-    buttons.sort(key=attrgetter("text"))
     return generate_inline_kb(data_with_buttons=buttons, sizes=[2])
 
 
+async def offer_to_place_bet(banned_roles: list[RolesLiteral]):
+    return _build_bet_kb(frozenset(banned_roles))
+
+
 def cancel_bet():
     return generate_inline_kb(data_with_buttons=[CANCEL_BTN])
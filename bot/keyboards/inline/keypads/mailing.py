@@ -127,10 +127,10 @@ def kill_or_check_on_policeman(number_of_night: int = 1):
 
 
 def choose_fake_role_kb(game_data: GameCache):
-    from general.collection_of_roles import get_data_with_roles
+    from general.collection_of_roles import ROLES_REGISTRY
     from mafia.roles import Policeman
 
-    all_roles = get_data_with_roles()
+    all_roles = ROLES_REGISTRY
     current_roles = set()
     for user_id in game_data["live_players_ids"]:
         user_data = game_data["players"][str(user_id)]
@@ -5,7 +5,8 @@ from cache.cache_types import OrderOfRolesCache, RolesLiteral
 from general import settings
 from general.collection_of_roles import (
     REQUIRED_ROLES,
-    get_data_with_roles,
+    ROLES_REGISTRY,
+    ROLES_SORTED_BY_NAME,
 )
 from keyboards.inline.builder import generate_inline_kb
 from keyboards.inline.buttons.common import (
@@ -30,7 +31,6 @@ from keyboards.inline.cb.cb_text import (
     VIEW_ORDER_OF_ROLES_CB,
 )
 from mafia.roles import MafiaAlias
-from utils.sorting import sorting_roles_by_name
 
 
 def adjust_time_kb(current_time: int, time_of_day: TimeOfDay):
@@ -128,9 +128,8 @@ def suggest_banning_roles_kb(
     banned_roles_ids: list[RolesLiteral],
 ):
     buttons = []
-    all_roles = get_data_with_roles()
-    sort_keys = sorted(all_roles.keys(), key=sorting_roles_by_name)
-    for key in sort_keys:
+    all_roles = ROLES_REGISTRY
+    for key in ROLES_SORTED_BY_NAME:
         if key in REQUIRED_ROLES:
             continue
         if key in banned_roles_ids:
@@ -155,7 +154,7 @@ def suggest_banning_roles_kb(
 def get_next_role_kb(
     order_data: OrderOfRolesCache, automatic_attacking: bool = True
 ):
-    all_roles = get_data_with_roles()
+    all_roles = ROLES_REGISTRY
     buttons = []
     leave_1_each = 1
     if (len(order_data["selected"]) + 1) % 4 == 0:
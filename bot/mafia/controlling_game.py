@@ -12,14 +12,15 @@ from cache.cache_types import (
     LastInteraction,
     UserGameCache,
 )
-from general.exceptions import GameIsOver
+from cache.game_state import GameStateRepository, is_step_applied
+from general.exceptions import GameIsOver, StepIsAlreadyApplied
 from general.groupings import Groupings
 from keyboards.inline.keypads.to_bot import (
     participate_in_social_life,
 )
 from keyboards.inline.keypads.voting import get_vote_for_aim_kb
 from loguru import logger
-from mafia.roles import Killer, Mafia
+from mafia.roles import Mafia
 from mafia.roles.base import (
     ActiveRoleAtNightABC,
     AliasRoleABC,
@@ -30,6 +31,7 @@ from mafia.roles.base.mixins import (
     ProcedureAfterNightABC,
     ProcedureAfterVotingABC,
 )
+from middlewares.rate_limit import Priority, sending_priority
 from states.states import UserFsm
 from utils.common import get_the_most_frequently_encountered_id
 from utils.informing import (
@@ -42,6 +44,10 @@ from utils.informing import (
 from utils.pretty_text import (
     make_build,
 )
+from utils.roles import (
+    get_groupings_counters,
+    update_groupings_counters,
+)
 from utils.state import get_state_and_assign, reset_user_state
 
 if TYPE_CHECKING:
@@ -55,24 +61,23 @@ def check_end_of_game[R, **P](
         self: "Game", *args: P.args, **kwargs: P.kwargs
     ) -> R:
         result = await async_func(self, *args, **kwargs)
-        state = self.state
-        game_data: GameCache = await state.get_data()
-        players_count = len(game_data["live_players_ids"])
-        if not game_data[Mafia.roles_key]:
-            if not game_data.get(Killer.roles_key):
+        game_state = GameStateRepository(self.state)
+        game_data: GameCache = await game_state.get(
+            "groupings_counters", Mafia.roles_key
+        )
+        if "groupings_counters" not in game_data:
+            game_data.update(
+                await game_state.get("live_players_ids", "players")
+            )
+        counters = get_groupings_counters(game_data)
+        players_count = sum(counters.values())
+        if not game_data.get(Mafia.roles_key):
+            killers_count = counters[Groupings.killer.name]
+            if killers_count == 0:
                 raise GameIsOver(winner=Groupings.civilians)
-            killers_count = len(game_data.get(Killer.roles_key))
             if killers_count >= players_count - killers_count:
                 raise GameIsOver(winner=Groupings.killer)
-        criminals_count = 0
-        for role in self.all_roles:
-            current_role: RoleABC = self.all_roles[role]
-            if current_role.grouping == Groupings.criminals:
-                if current_role.is_alias:
-                    continue
-                criminals_count += len(
-                    game_data[current_role.roles_key]
-                )
+        criminals_count = counters[Groupings.criminals.name]
         if criminals_count >= players_count - criminals_count:
             raise GameIsOver(winner=Groupings.criminals)
         return result
@@ -95,8 +100,19 @@ class Controller:
         self.group_chat_id = group_chat_id
         self.all_roles = {}
 
+    async def save_step(self, game_data: GameCache, step: str):
+        """
+        Сохраняет результат шага фазы ровно один раз.
+        """
+        if not await GameStateRepository(self.state).save_step(
+            game_data=game_data, step=step
+        ):
+            raise StepIsAlreadyApplied(step)
+
     async def end_night(self):
         game_data: GameCache = await self.state.get_data()
+        if is_step_applied(game_data, "end_night"):
+            return
         tasks = []
         for role in self.all_roles:
             current_role: RoleABC = self.all_roles[role]
@@ -145,7 +161,7 @@ class Controller:
         game_data["messages_after_night"].clear()
         game_data["cant_talk"].clear()
         game_data["cant_vote"].clear()
-        await self.state.set_data(game_data)
+        await self.save_step(game_data, "end_night")
 
     def get_roles_if_isinstance[P: ABC](
         self, parent: type[P]
@@ -162,6 +178,23 @@ class Controller:
         self,
     ):
         game_data: GameCache = await self.state.get_data()
+        if is_step_applied(game_data, "sum_up_after_voting"):
+            return
+        text = await self._apply_voting_results(game_data)
+        await self.save_step(game_data, "sum_up_after_voting")
+        if text:
+            await self.bot.send_message(
+                chat_id=self.group_chat_id,
+                text=text,
+            )
+
+    async def _apply_voting_results(
+        self, game_data: GameCache
+    ) -> str | None:
+        """
+        Применяет итоги голосования к game_data
+        и возвращает текст для группы.
+        """
         pros = game_data["pros"]
         cons = game_data["cons"]
         removed_user_id = get_the_most_frequently_encountered_id(
@@ -193,25 +226,15 @@ class Controller:
                 **kwargs,
                 removed_user=removed_user,
             )
-        await self.state.set_data(game_data)
         if removed_user_id is None:
-            await self.bot.send_message(
-                chat_id=self.group_chat_id,
-                text=result_text,
-            )
-            return
+            return result_text
 
         if is_not_there_removed:
-            result_text += make_build(
+            return result_text + make_build(
                 f"🥳🥳🥳{game_data['players'][str(removed_user_id)]['url']} дали еще шанс!"
             )
-            await self.bot.send_message(
-                chat_id=self.group_chat_id,
-                text=result_text,
-            )
-            return
         if removed_user_id != removed_user[0]:
-            return
+            return None
         user_info: UserGameCache = game_data["players"][
             str(removed_user_id)
         ]
@@ -230,19 +253,16 @@ class Controller:
             user_id=removed_user_id,
             at_night=False,
         )
-        await self.bot.send_message(
-            chat_id=self.group_chat_id,
-            text=result_text
-            + make_build(
-                f"❗️❗️❗️Сегодня народ принял тяжелое решение и повесил "
-                f'{user_info["url"]} с ролью {user_info["pretty_role"]}!'
-            ),
+        return result_text + make_build(
+            f"❗️❗️❗️Сегодня народ принял тяжелое решение и повесил "
+            f'{user_info["url"]} с ролью {user_info["pretty_role"]}!'
         )
-        await self.state.set_data(game_data)
 
     @check_end_of_game
     async def sum_up_after_night(self):
         game_data: GameCache = await self.state.get_data()
+        if is_step_applied(game_data, "sum_up_after_night"):
+            return game_data
         roles = self.get_roles_if_isinstance(
             parent=ProcedureAfterNightABC
         )
@@ -299,7 +319,7 @@ class Controller:
             group_chat_id=self.group_chat_id,
         )
         await asyncio.gather(*tasks, return_exceptions=True)
-        await self.state.set_data(game_data)
+        await self.save_step(game_data, "sum_up_after_night")
         return game_data
 
     async def confirm_final_aim(
@@ -321,16 +341,17 @@ class Controller:
         if aim_id is None:
             return False
         url = game_data["players"][str(aim_id)]["url"]
-        sent_survey = await self.bot.send_message(
-            chat_id=self.group_chat_id,
-            text=make_build(f"На кону судьба {url}!"),
-            reply_markup=get_vote_for_aim_kb(
-                user_id=aim_id,
-                pros=game_data["pros"],
-                cons=game_data["cons"],
-            ),
-        )
-        await sent_survey.pin()
+        with sending_priority(Priority.critical):
+            sent_survey = await self.bot.send_message(
+                chat_id=self.group_chat_id,
+                text=make_build(f"На кону судьба {url}!"),
+                reply_markup=get_vote_for_aim_kb(
+                    user_id=aim_id,
+                    pros=game_data["pros"],
+                    cons=game_data["cons"],
+                ),
+            )
+            await sent_survey.pin()
         game_data["to_delete"].append(
             [self.group_chat_id, sent_survey.message_id]
         )
@@ -360,6 +381,11 @@ class Controller:
                 user_id=user_id,
                 bot_id=self.bot.id,
             )
+        # счётчики могут пересчитываться по живым игрокам,
+        # поэтому меняются до удаления игрока из live_players_ids
+        update_groupings_counters(
+            game_data=game_data, grouping=role.grouping, change=-1
+        )
         game_data["live_players_ids"].remove(user_id)
         game_data["players"][str(user_id)][
             "number_died_at_night"
@@ -387,44 +413,48 @@ class Controller:
         active_roles = self.get_roles_if_isinstance(
             ActiveRoleAtNightABC
         )
-        await asyncio.gather(
-            *(
-                role.mailing(game_data=game_data)
-                for role in active_roles
-            ),
-            return_exceptions=True,
-        )
+        with sending_priority(Priority.critical):
+            await asyncio.gather(
+                *(
+                    role.mailing(game_data=game_data)
+                    for role in active_roles
+                ),
+                return_exceptions=True,
+            )
         await self.state.set_data(game_data)
 
     async def suggest_vote(self):
-        message = await self.bot.send_photo(
-            chat_id=self.group_chat_id,
-            photo="https://studychinese.ru/content/dictionary/pictures/25/12774.jpg",
-            caption="Кого обвиним во всем и повесим?",
-            reply_markup=participate_in_social_life(),
-        )
-        await message.pin()
-        game_data: GameCache = await self.state.get_data()
-        live_players_ids = game_data["live_players_ids"]
-        await asyncio.gather(
-            *(
-                send_request_to_vote(
-                    game_data=game_data,
-                    user_id=user_id,
-                    players_ids=live_players_ids,
-                    players=game_data["players"],
-                    bot=self.bot,
-                )
-                for user_id in live_players_ids
-                if user_id not in game_data["cant_vote"]
-            ),
-            return_exceptions=True,
-        )
-        await self.state.set_data(game_data)
+        with sending_priority(Priority.critical):
+            message = await self.bot.send_photo(
+                chat_id=self.group_chat_id,
+                photo="https://studychinese.ru/content/dictionary/pictures/25/12774.jpg",
+                caption="Кого обвиним во всем и повесим?",
+                reply_markup=participate_in_social_life(),
+            )
+            await message.pin()
+            game_data: GameCache = await self.state.get_data()
+            live_players_ids = game_data["live_players_ids"]
+            await asyncio.gather(
+                *(
+                    send_request_to_vote(
+                        game_data=game_data,
+                        user_id=user_id,
+                        players_ids=live_players_ids,
+                        players=game_data["players"],
+                        bot=self.bot,
+                    )
+                    for user_id in live_players_ids
+                    if user_id not in game_data["cant_vote"]
+                ),
+                return_exceptions=True,
+            )
+            await self.state.set_data(game_data)
 
     @check_end_of_game
     async def removing_inactive_players(self):
         game_data: GameCache = await self.state.get_data()
+        if is_step_applied(game_data, "removing_inactive_players"):
+            return
         wait_for = game_data["wait_for"]
         potentially_deleted = set()
         inactive_users = []
@@ -464,4 +494,4 @@ class Controller:
             ),
             return_exceptions=True,
         )
-        await self.state.set_data(game_data)
+        await self.save_step(game_data, "removing_inactive_players")
@@ -1,21 +1,30 @@
 import asyncio
 import datetime
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
 from operator import itemgetter
 from random import choice
+from typing import Final
+from uuid import uuid4
 
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.context import FSMContext
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from cache.cache_types import (
     GameCache,
+    GamePhaseLiteral,
     RoleAndUserMoney,
     RolesLiteral,
     UserGameCache,
     UserIdStr,
 )
+from cache.game_state import GameStateRepository, is_step_applied
+from cache.outbox import make_outbox_event, push_to_outbox
+from cache.phase_barrier import PhaseBarrier
 from database.dao.games import GamesDao
 from database.schemas.bids import (
     BidForRoleSchema,
+    RefundSchema,
     ResultBidForRoleSchema,
 )
 from database.schemas.common import IdSchema, TgIdSchema
@@ -26,18 +35,20 @@ from database.schemas.results import PersonalResultSchema
 from faststream.rabbit import RabbitBroker
 from general.collection_of_roles import (
     BASES_ROLES,
+    ROLES_REGISTRY,
     DataWithRoles,
-    get_data_with_roles,
 )
-from general.exceptions import GameIsOver
+from general.exceptions import GameIsOver, StepIsAlreadyApplied
 from general.groupings import Groupings
 from general.text import MONEY_SYM
 from keyboards.inline.keypads.to_bot import get_to_bot_kb
 from loguru import logger
 from mafia.controlling_game import Controller
 from mafia.roles import RoleABC
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from states.states import GameFsm
+from utils.announcements import GroupAnnouncer
+from utils.clock import Clock
 from utils.informing import (
     get_live_players,
     get_profiles,
@@ -48,12 +59,16 @@ from utils.pretty_text import (
     make_build,
     make_pretty,
 )
+from utils.roles import count_live_players_in_groupings
 from utils.sorting import sorting_by_money, sorting_by_rate
 from utils.state import (
     reset_user_state_if_in_game,
 )
 from utils.tg import delete_messages_from_to_delete
 
+WORKER_ID: Final = uuid4().hex
+GAME_LEASE_TTL: Final = 60
+
 
 class Game:
     def __init__(
@@ -64,7 +79,8 @@ class Game:
         dispatcher: Dispatcher,
         scheduler: AsyncIOScheduler,
         broker: RabbitBroker,
-        session: AsyncSession,
+        session_maker: async_sessionmaker[AsyncSession],
+        clock: Clock,
     ):
         self.scheduler = scheduler
         self.state = state
@@ -79,23 +95,22 @@ class Game:
             dispatcher=self.dispatcher,
         )
         self.broker = broker
-        self.session = session
+        self.session_maker = session_maker
+        self.clock = clock
         self.game_id: int | None = None
         self.beginning_game: int | None = None
         self.winners_bets = []
 
     def init_existing_roles(self, game_data: GameCache):
-        all_roles = get_data_with_roles()
         existing = set(
             player_data["role_id"]
             for player_data in game_data["players"].values()
         )
-        not_existing = set(
-            role for role in all_roles if role not in existing
-        )
-        for role in not_existing:
-            all_roles.pop(role)
-        self.all_roles = all_roles
+        self.all_roles = {
+            role_id: role()
+            for role_id, role in ROLES_REGISTRY.items()
+            if role_id in existing
+        }
         for role in self.all_roles:
             self.all_roles[role](
                 dispatcher=self.dispatcher,
@@ -103,53 +118,229 @@ class Game:
                 state=self.state,
                 all_roles=self.all_roles,
             )
-        self.controller.all_roles = all_roles
+        self.controller.all_roles = self.all_roles
 
     async def create_game_in_db(self):
-        dao = GamesDao(session=self.session)
         beginning_dt = datetime.datetime.now()
         self.beginning_game = int(beginning_dt.timestamp())
-        self.game_id = await dao.create_game(
-            tg_id=TgIdSchema(tg_id=self.group_chat_id),
-            start=beginning_dt,
-        )
-        await self.session.commit()
+        async with self.session_maker.begin() as session:
+            self.game_id = await GamesDao(
+                session=session
+            ).create_game(
+                tg_id=TgIdSchema(tg_id=self.group_chat_id),
+                start=beginning_dt,
+            )
 
     async def start_game(
         self,
+    ):
+        await self._conduct_game(preparation=self._prepare_game)
+
+    async def resume_game(self):
+        """
+        Продолжает игру с сохранённой фазы после перезапуска бота.
+        """
+        await self._conduct_game(preparation=self._restore_game)
+
+    async def _conduct_game(
+        self, preparation: Callable[[], Awaitable[None]]
     ):
         try:
-            game_data: GameCache = await self.state.get_data()
-            await asyncio.gather(
-                delete_messages_from_to_delete(
-                    bot=self.bot,
-                    state=self.state,
-                ),
-                self.bot.delete_message(
-                    chat_id=self.group_chat_id,
-                    message_id=game_data["start_message_id"],
-                ),
-            )
-            await self.create_game_in_db()
-            await self.state.set_state(GameFsm.STARTED)
-            game_data = await self.select_roles()
-            self.init_existing_roles(game_data)
-            await self.familiarize_players(game_data)
-            await self.bot.send_message(
-                chat_id=self.group_chat_id,
-                text=make_build("Игра начинается!"),
-                reply_markup=get_to_bot_kb(),
+            try:
+                await preparation()
+                await self.run_phases()
+            except GameIsOver as e:
+                await self.give_out_rewards(e=e)
+        except StepIsAlreadyApplied as e:
+            logger.warning(
+                "Шаг {} игры в чате {} уже выполнил другой процесс",
+                e.step,
+                self.group_chat_id,
             )
-            while True:
-                try:
-                    await self.start_night()
-                except GameIsOver as e:
-                    await self.give_out_rewards(e=e)
-                    return
         except Exception as e:
             logger.exception("Произошла ошибка во время игры")
             await self.crash_game()
 
+    async def _prepare_game(self):
+        game_data: GameCache = await self.state.get_data()
+        await asyncio.gather(
+            delete_messages_from_to_delete(
+                bot=self.bot,
+                state=self.state,
+            ),
+            self.bot.delete_message(
+                chat_id=self.group_chat_id,
+                message_id=game_data["start_message_id"],
+            ),
+        )
+        await self.create_game_in_db()
+        await self.state.set_state(GameFsm.STARTED)
+        game_data = await self.select_roles()
+        self.init_existing_roles(game_data)
+        game_state = GameStateRepository(self.state)
+        await game_state.patch(
+            {
+                "game_id": self.game_id,
+                "beginning_game": self.beginning_game,
+                "winners_bets": [
+                    bet.model_dump() for bet in self.winners_bets
+                ],
+            }
+        )
+        await self.familiarize_players(game_data)
+        await self.bot.send_message(
+            chat_id=self.group_chat_id,
+            text=make_build("Игра начинается!"),
+            reply_markup=get_to_bot_kb(),
+        )
+        await game_state.acquire_lease(
+            owner=WORKER_ID, ttl=GAME_LEASE_TTL
+        )
+        async with self.keep_lease():
+            await self.start_night()
+        await game_state.mark_running()
+
+    async def _restore_game(self):
+        game_data: GameCache = await self.state.get_data()
+        self.game_id = game_data["game_id"]
+        self.beginning_game = game_data["beginning_game"]
+        self.winners_bets = [
+            BidForRoleSchema.model_validate(bet)
+            for bet in game_data["winners_bets"]
+        ]
+        self.init_existing_roles(game_data)
+        for role_id, role_state in game_data["roles_state"].items():
+            if role_id in self.all_roles:
+                self.all_roles[role_id].load_state(role_state)
+
+    async def run_phases(self):
+        """
+        Ведёт игру по фазам, сохранённым в Redis.
+
+        Каждая фаза хранит срок окончания, поэтому после перезапуска
+        любой процесс продолжит игру с текущей фазы.
+        Фаза, прерванная на середине, выполняется повторно,
+        но уже сохранённые шаги фазы пропускаются.
+        """
+        phases: dict[
+            GamePhaseLiteral, Callable[[], Awaitable[None]]
+        ] = {
+            "night": self.finish_night,
+            "day": self.finish_day,
+            "voting": self.finish_voting,
+            "confirmation": self.sum_up_day,
+        }
+        game_state = GameStateRepository(self.state)
+        while True:
+            game_data: GameCache = await game_state.get(
+                "phase", "phase_deadline"
+            )
+            if not await self.wait_for_deadline(
+                game_data["phase_deadline"]
+            ):
+                return
+            async with self.keep_lease():
+                try:
+                    await GroupAnnouncer(
+                        bot=self.bot, state=self.state
+                    ).flush()
+                except Exception:
+                    logger.exception(
+                        "Не удалось отправить объявления в чат {}",
+                        self.group_chat_id,
+                    )
+                await phases[game_data["phase"]]()
+
+    @asynccontextmanager
+    async def keep_lease(self) -> AsyncIterator[None]:
+        """
+        Продлевает аренду игры, пока выполняется фаза,
+        чтобы долгая фаза не отдала игру другому процессу.
+        """
+        heartbeat = asyncio.create_task(self._renew_lease())
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def _renew_lease(self):
+        game_state = GameStateRepository(self.state)
+        while True:
+            # аренда истекает по настоящему времени, а не по self.clock
+            await asyncio.sleep(GAME_LEASE_TTL // 3)
+            try:
+                is_renewed = await game_state.renew_lease(
+                    owner=WORKER_ID, ttl=GAME_LEASE_TTL
+                )
+            except Exception:
+                logger.exception(
+                    "Не удалось продлить аренду игры в чате {}",
+                    self.group_chat_id,
+                )
+                continue
+            if not is_renewed:
+                logger.warning(
+                    "Аренда игры в чате {} потеряна во время фазы",
+                    self.group_chat_id,
+                )
+
+    async def wait_for_deadline(self, deadline: int) -> bool:
+        """
+        Ждёт конца фазы или того, что все игроки уже походили.
+        """
+        game_state = GameStateRepository(self.state)
+        barrier = PhaseBarrier(self.state)
+        with barrier.expect_completion() as is_completed:
+            while True:
+                if not await game_state.acquire_lease(
+                    owner=WORKER_ID, ttl=GAME_LEASE_TTL
+                ):
+                    logger.warning(
+                        "Игру в чате {} ведёт другой процесс",
+                        self.group_chat_id,
+                    )
+                    return False
+                delay = deadline - self.clock.now()
+                if delay <= 0:
+                    return True
+                is_completed.clear()
+                if await barrier.is_completed():
+                    return True
+                await self.clock.sleep(
+                    min(delay, GAME_LEASE_TTL // 3),
+                    wake_up=is_completed,
+                )
+
+    async def set_phase(
+        self, phase: GamePhaseLiteral, duration: int
+    ):
+        now = self.clock.timestamp()
+        roles_state = {
+            role_id: role.dump_state()
+            for role_id, role in self.all_roles.items()
+        }
+
+        def start_phase(game_data: GameCache):
+            game_data.update(
+                {
+                    "phase": phase,
+                    "phase_deadline": now + duration,
+                    "phase_number": game_data.get("phase_number", 0)
+                    + 1,
+                    "roles_state": roles_state,
+                }
+            )
+
+        await GameStateRepository(self.state).mutate(
+            start_phase,
+            "phase",
+            "phase_deadline",
+            "phase_number",
+            "roles_state",
+        )
+
     async def crash_game(self):
         game_data: GameCache = await self.state.get_data()
         await delete_messages_from_to_delete(
@@ -173,20 +364,33 @@ class Game:
             users=list(game_data["players"].keys())
             + [self.group_chat_id],
         )
-        await self.state.clear()
-        if self.game_id:
-            dao = GamesDao(session=self.session)
-            await dao.delete(IdSchema(id=self.game_id))
-        await self.broker.publish(
-            message=self.winners_bets, queue="refund_money_for_bets"
+        await GameStateRepository(self.state).finish(
+            events=[
+                make_outbox_event(
+                    queue="refund_money_for_bets",
+                    message=[
+                        RefundSchema(
+                            **bet.model_dump(), game_id=self.game_id
+                        )
+                        for bet in self.winners_bets
+                    ],
+                )
+            ]
         )
+        if self.game_id:
+            async with self.session_maker.begin() as session:
+                await GamesDao(session=session).delete(
+                    IdSchema(id=self.game_id)
+                )
 
     async def start_night(
         self,
     ):
         game_data: GameCache = await self.state.get_data()
-        game_data["number_of_night"] += 1
-        await self.state.set_data(game_data)
+        if not is_step_applied(game_data, "start_night"):
+            game_data["number_of_night"] += 1
+            game_data["missed_actions"] = game_data["wait_for"][:]
+            await self.controller.save_step(game_data, "start_night")
         players = get_live_players(
             game_data=game_data, all_roles=self.all_roles
         )
@@ -201,7 +405,11 @@ class Game:
         )
         await message.pin()
         await self.controller.mailing()
-        await asyncio.sleep(game_data["settings"]["time_for_night"])
+        await self.set_phase(
+            "night", game_data["settings"]["time_for_night"]
+        )
+
+    async def finish_night(self):
         await delete_messages_from_to_delete(
             bot=self.bot,
             state=self.state,
@@ -216,16 +424,26 @@ class Game:
             caption=f"{make_build('Пришло время провести следственные мероприятия жителям города!')}\n\n"
             f"{players_after_night}",
         )
-        await asyncio.sleep(game_data["settings"]["time_for_day"])
+        await self.set_phase(
+            "day", game_data["settings"]["time_for_day"]
+        )
+
+    async def finish_day(self):
         await self.controller.suggest_vote()
-        await asyncio.sleep(30)
+        await self.set_phase("voting", 30)
+
+    async def finish_voting(self):
         await delete_messages_from_to_delete(
             bot=self.bot,
             state=self.state,
         )
         result = await self.controller.confirm_final_aim()
         if result:
-            await asyncio.sleep(45)
+            await self.set_phase("confirmation", 45)
+            return
+        await self.sum_up_day()
+
+    async def sum_up_day(self):
         await delete_messages_from_to_delete(
             bot=self.bot,
             state=self.state,
@@ -233,6 +451,7 @@ class Game:
         await self.controller.sum_up_after_voting()
         await self.controller.removing_inactive_players()
         await self.controller.end_night()
+        await self.start_night()
 
     async def give_out_rewards(self, e: GameIsOver):
         game_data: GameCache = await self.state.get_data()
@@ -294,19 +513,6 @@ class Game:
             bot=self.bot,
             state=self.state,
         )
-        await self.broker.publish(
-            message=EndOfGameSchema(
-                id=self.game_id,
-                number_of_nights=game_data["number_of_night"],
-                end=end_of_game,
-                winning_group=e.winner.value.name,
-            ),
-            queue="game_results",
-        )
-        await self.broker.publish(
-            message=list(personal_results.values()),
-            queue="personal_results",
-        )
         await asyncio.gather(
             *(
                 self.sum_up_personal_results_players(
@@ -320,7 +526,25 @@ class Game:
             ),
             return_exceptions=True,
         )
-        await self.state.clear()
+        await GameStateRepository(self.state).finish(
+            events=[
+                make_outbox_event(
+                    queue="game_results",
+                    message=EndOfGameSchema(
+                        id=self.game_id,
+                        number_of_nights=game_data[
+                            "number_of_night"
+                        ],
+                        end=end_of_game,
+                        winning_group=e.winner.value.name,
+                    ),
+                ),
+                make_outbox_event(
+                    queue="personal_results",
+                    message=list(personal_results.values()),
+                ),
+            ]
+        )
 
     async def sum_up_personal_results_players(
         self,
@@ -364,7 +588,9 @@ class Game:
         )
 
     @staticmethod
-    def initialization_by_role(game_data: GameCache, role: RoleABC):
+    def initialization_by_role(
+        game_data: GameCache, role: type[RoleABC]
+    ):
         if (
             role.is_alias is False
             and role.roles_key not in game_data
@@ -453,11 +679,17 @@ class Game:
                 )
             else:
                 roles_are_not_in_game.append(loser)
-        await self.broker.publish(
-            message=rates, queue="betting_results"
-        )
-        await self.broker.publish(
-            message=roles_are_not_in_game, queue="role_outside_game"
+        await push_to_outbox(
+            storage=GameStateRepository(self.state).storage,
+            events=[
+                make_outbox_event(
+                    queue="betting_results", message=rates
+                ),
+                make_outbox_event(
+                    queue="role_outside_game",
+                    message=roles_are_not_in_game,
+                ),
+            ],
         )
 
     async def select_roles(self):
@@ -465,11 +697,10 @@ class Game:
         banned_roles = game_data["settings"]["banned_roles"]
         order_of_roles = game_data["settings"]["order_of_roles"]
         players_ids = game_data["live_players_ids"][:]
-        all_roles = get_data_with_roles()
         criminals: list[RolesLiteral] = []
         other: list[RolesLiteral] = []
         number_of_players = len(players_ids)
-        for key, role in all_roles.items():
+        for key, role in ROLES_REGISTRY.items():
             if (
                 key in banned_roles
                 or key in BASES_ROLES
@@ -482,7 +713,7 @@ class Game:
                 role_type = other
             if role not in order_of_roles:
                 role_type.append(key)
-            elif get_data_with_roles(role).there_may_be_several:
+            elif role.there_may_be_several:
                 role_type.append(key)
         role_and_winner, losers = self.check_bids(game_data)
         not_winners = [loser.user_tg_id for loser in losers]
@@ -508,10 +739,7 @@ class Game:
             else:
                 role = choice(role_type)
             order_of_roles.append(role)
-            if (
-                get_data_with_roles(role).there_may_be_several
-                is False
-            ):
+            if ROLES_REGISTRY[role].there_may_be_several is False:
                 role_type.remove(role)
         winners = set()
         order_of_roles[:] = order_of_roles[:number_of_players]
@@ -532,7 +760,7 @@ class Game:
         )
         winners_bets: list[BidForRoleSchema] = []
         for number, role_id in enumerate(order_of_roles, 1):
-            current_role = get_data_with_roles(role_id)
+            current_role = ROLES_REGISTRY[role_id]
             winner = role_and_winner.get(role_id)
             if winner is None:
                 winner_id = choice(not_winners)
@@ -559,6 +787,9 @@ class Game:
             }
             game_data["players"][str(winner_id)].update(user_data)
             roles.append(winner_id)
+        game_data["groupings_counters"] = (
+            count_live_players_in_groupings(game_data)
+        )
         await self.record_data_about_betting_results(
             order_of_roles=order_of_roles,
             winners_bets=winners_bets,
@@ -26,6 +26,9 @@ class Analyst(ProcedureAfterVotingABC, ActiveRoleAtNightABC):
     do_not_choose_self = 0
     is_self_selecting = True
     need_to_monitor_interaction = False
+    persisted_fields = ActiveRoleAtNightABC.persisted_fields + (
+        "number_of_predictions",
+    )
     mail_message = "Кого повесят сегодня днём?"
     message_to_group_after_action = (
         "Составляется прогноз на завтрашний день"
@@ -2,7 +2,7 @@ import asyncio
 from abc import ABC, abstractmethod
 from contextlib import suppress
 from random import shuffle
-from typing import TYPE_CHECKING, Callable, Optional, Self
+from typing import TYPE_CHECKING, Any, Callable, Optional, Self
 
 from aiogram import Bot, Dispatcher
 from aiogram.exceptions import TelegramBadRequest
@@ -69,6 +69,15 @@ class RoleABC(ABC):
     payment_for_night_spent = 4
 
     is_alias: bool = False
+    alias: Optional["RoleABC"] = None
+    roles_key: str
+    processed_users_key: str | None = None
+    last_interactive_key: str | None = None
+    processed_by_boss: str | None = None
+    persisted_fields: tuple[str, ...] = (
+        "dropped_out",
+        "temporary_roles",
+    )
 
     def __call__(
         self,
@@ -84,6 +93,36 @@ class RoleABC(ABC):
         self.temporary_roles = {}
         self.dropped_out: set[UserIdInt] = set()
 
+    def dump_state(self) -> dict[str, Any]:
+        """
+        Возвращает состояние роли, которое живёт между фазами игры.
+        """
+        state = {}
+        for field in self.persisted_fields:
+            value = getattr(self, field)
+            if isinstance(value, set):
+                value = list(value)
+            elif isinstance(value, dict):
+                # ключи в JSON становятся строками, а id игроков числа
+                value = list(value.items())
+            state[field] = value
+        return state
+
+    def load_state(self, state: dict[str, Any]):
+        """
+        Восстанавливает состояние роли после перезапуска бота.
+        """
+        for field in self.persisted_fields:
+            if field not in state:
+                continue
+            value = state[field]
+            current_value = getattr(self, field, None)
+            if isinstance(current_value, set):
+                value = set(value)
+            elif isinstance(current_value, dict):
+                value = dict(value)
+            setattr(self, field, value)
+
     @property
     @abstractmethod
     def role_description(self) -> RoleDescription:
@@ -188,37 +227,42 @@ class RoleABC(ABC):
             f"Текущие союзники:\n{profiles}",
         )
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Вычисляет ключи роли один раз при создании класса.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.alias = None
+        cls._resolve_keys()
+        if cls.is_alias:
+            boss = cls.__bases__[1]
+            if boss.alias is None:
+                boss.alias = cls()
+                boss._resolve_keys()
+
     @classmethod
-    @property
-    def alias(cls) -> Optional["RoleABC"]:
-        subclasses = cls.__subclasses__()
-        if not subclasses:
-            return None
-        return subclasses[0]()
+    def _resolve_keys(cls):
+        cls.roles_key = cls._get_roles_key()
+        cls.processed_users_key = cls._get_processed_users_key()
+        cls.last_interactive_key = cls._get_last_interactive_key()
+        cls.processed_by_boss = cls._get_processed_by_boss()
 
     @classmethod
-    @property
-    def roles_key(cls):
+    def _get_roles_key(cls):
         return cls.__name__.lower() + "s"
 
     @classmethod
-    @property
-    def processed_users_key(cls):
+    def _get_processed_users_key(cls):
         if cls.need_to_process:
             return f"processed_by_{cls.__name__.lower()}"
 
     @classmethod
-    @property
-    def last_interactive_key(cls):
-        if (
-            issubclass(cls, ActiveRoleAtNightABC)
-            and cls.need_to_monitor_interaction
-        ):
+    def _get_last_interactive_key(cls):
+        if getattr(cls, "need_to_monitor_interaction", False):
             return f"{cls.__name__}_history"
 
     @classmethod
-    @property
-    def processed_by_boss(cls):
+    def _get_processed_by_boss(cls):
         if cls.alias and cls.alias.is_mass_mailing_list:
             return f"processed_boss_{cls.__name__}"
 
@@ -430,22 +474,16 @@ class AliasRoleABC(ABC):
         )
 
     @classmethod
-    @property
-    def roles_key(cls):
-        super_classes = cls.__bases__
-        return super_classes[1].roles_key
+    def _get_roles_key(cls):
+        return cls.__bases__[1].roles_key
 
     @classmethod
-    @property
-    def processed_users_key(cls):
-        super_classes = cls.__bases__
-        return super_classes[1].processed_users_key
+    def _get_processed_users_key(cls):
+        return cls.__bases__[1].processed_users_key
 
     @classmethod
-    @property
-    def last_interactive_key(cls):
-        super_classes = cls.__bases__
-        return super_classes[1].last_interactive_key
+    def _get_last_interactive_key(cls):
+        return cls.__bases__[1].last_interactive_key
 
     @classmethod
     @property
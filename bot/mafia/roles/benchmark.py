@@ -0,0 +1,107 @@
+"""
+Замер чтения ключей ролей, которые Controller.end_night
+и initialization_by_role берут у каждой роли:
+
+    python -m mafia.roles.benchmark --passes 10000
+
+Для сравнения те же значения вычисляются так, как их
+вычисляли свойства класса до кэширования.
+"""
+
+import argparse
+import timeit
+
+from general.collection_of_roles import ROLES_REGISTRY
+from mafia.roles import ActiveRoleAtNightABC, AliasRoleABC, RoleABC
+
+ROLES = tuple(ROLES_REGISTRY.values())
+
+
+def read_cached_keys():
+    for role in ROLES:
+        role.alias
+        role.roles_key
+        role.processed_users_key
+        role.last_interactive_key
+        role.processed_by_boss
+
+
+def get_alias(role: type[RoleABC]) -> RoleABC | None:
+    subclasses = role.__subclasses__()
+    if not subclasses:
+        return None
+    return subclasses[0]()
+
+
+def get_roles_key(role: type[RoleABC]) -> str:
+    if issubclass(role, AliasRoleABC):
+        return get_roles_key(role.__bases__[1])
+    return role.__name__.lower() + "s"
+
+
+def get_processed_users_key(role: type[RoleABC]) -> str | None:
+    if issubclass(role, AliasRoleABC):
+        return get_processed_users_key(role.__bases__[1])
+    if role.need_to_process:
+        return f"processed_by_{role.__name__.lower()}"
+
+
+def get_last_interactive_key(role: type[RoleABC]) -> str | None:
+    if issubclass(role, AliasRoleABC):
+        return get_last_interactive_key(role.__bases__[1])
+    if (
+        issubclass(role, ActiveRoleAtNightABC)
+        and role.need_to_monitor_interaction
+    ):
+        return f"{role.__name__}_history"
+
+
+def get_processed_by_boss(role: type[RoleABC]) -> str | None:
+    alias = get_alias(role)
+    if alias and alias.is_mass_mailing_list:
+        return f"processed_boss_{role.__name__}"
+
+
+def compute_keys():
+    for role in ROLES:
+        get_alias(role)
+        get_roles_key(role)
+        get_processed_users_key(role)
+        get_last_interactive_key(role)
+        get_processed_by_boss(role)
+
+
+def check_keys():
+    for role in ROLES:
+        assert role.roles_key == get_roles_key(role), role
+        assert role.processed_users_key == get_processed_users_key(
+            role
+        ), role
+        assert role.last_interactive_key == get_last_interactive_key(
+            role
+        ), role
+        assert role.processed_by_boss == get_processed_by_boss(
+            role
+        ), role
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m mafia.roles.benchmark"
+    )
+    parser.add_argument("--passes", type=int, default=10000)
+    args = parser.parse_args()
+    check_keys()
+    for name, func in (
+        ("вычисление", compute_keys),
+        ("кэш", read_cached_keys),
+    ):
+        seconds = timeit.timeit(func, number=args.passes)
+        print(
+            f"{name}: {seconds / args.passes * 1e6:.1f} мкс "
+            f"за проход по {len(ROLES)} ролям"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ class Masochist(SuicideRoleMixin, RoleABC):
     photo = "https://i.pinimg.com/736x/14/a5/f5/14a5f5eb5dbd73c4707f24d436d80c0b.jpg"
     grouping = Groupings.other
     purpose = "Тебе нужно умереть на дневном голосовании."
+    persisted_fields = RoleABC.persisted_fields + ("_winners",)
 
     @property
     def role_description(self) -> RoleDescription:
@@ -32,6 +32,9 @@ class Poisoner(
     role_id = "poisoner"
     photo = "https://cdn.culture.ru/images/e949d2ef-65de-5336-aa98-50a16401045c"
     need_to_monitor_interaction = False
+    persisted_fields = ActiveRoleAtNightABC.persisted_fields + (
+        "victims",
+    )
     purpose = (
         "Каждую ночь ты можешь либо отравить игрока, "
         "чтоб потом его убить, либо убить тех, кого отравил ранее."
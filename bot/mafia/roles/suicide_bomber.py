@@ -20,6 +20,7 @@ class SuicideBomber(SuicideRoleMixin, RoleABC):
     )
     grouping = Groupings.other
     purpose = "Тебе нужно умереть ночью."
+    persisted_fields = RoleABC.persisted_fields + ("_winners",)
 
     @property
     def role_description(self) -> RoleDescription:
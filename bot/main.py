@@ -1,25 +1,38 @@
 import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime
+from typing import Final
 
 import orjson
 from aiogram import Dispatcher
-from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.fsm.strategy import FSMStrategy
 from aiogram.types import (
     BotCommand,
     BotCommandScopeAllGroupChats,
     BotCommandScopeAllPrivateChats,
+    Update,
 )
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from cache.game_state import GAME_INDEXED_FIELDS
+from cache.phase_barrier import listen_to_phase_barriers
+from cache.registration_jobs import RegistrationJobsRepository
+from cache.storage import HashRedisStorage
 from database.dao.init_db import fill_database_with_roles
 from general import settings
 from general.commands import BotCommands
-from general.config import bot, broker
+from general.config import bot, broker, rate_limiter, redis
 from general.log import configure_logging
+from mafia.pipeline_game import GAME_LEASE_TTL
 from middlewares.errors import (
     HandleCallbackErrorMiddleware,
     HandleMessageErrorMiddleware,
 )
-from redis.asyncio import Redis
+from middlewares.phase_barrier import PhaseBarrierMiddleware
+from middlewares.rate_limit import RATE_LIMIT_METRICS_INTERVAL
+from middlewares.sharding import ShardRoutingMiddleware
 from routers.game.groups import router as game_groups_router
 from routers.game.users import router as game_users_router
 from routers.groups import router as groups_router
@@ -27,35 +40,26 @@ from routers.users import (
     always_available_router,
 )
 from routers.users import router as users_router
+from scheduler.game import (
+    REGISTRATION_JOBS_INTERVAL,
+    resume_interrupted_games,
+    run_registration_jobs,
+)
+from scheduler.outbox import OUTBOX_RELAY_INTERVAL, relay_outbox
+from utils.sharding import get_updates_queue
+from utils.updates import PipelineRequestHandler, UpdatePipeline
 
+# chat_member не приходит без явной подписки,
+# а по нему сбрасывается кэш администраторов чатов
+ALLOWED_UPDATES: Final = [
+    "message",
+    "callback_query",
+    "my_chat_member",
+    "chat_member",
+]
 
-async def main() -> None:
-    """
-    Функция для запуска бота и задач по расписанию
 
-    :return: None
-    """
-    configure_logging()
-    await fill_database_with_roles()
-    scheduler = AsyncIOScheduler()
-    scheduler.configure()
-    redis = Redis(host=settings.redis.host, port=settings.redis.port)
-    storage = RedisStorage(redis=redis, json_loads=orjson.loads)
-    dp = Dispatcher(
-        fsm_strategy=FSMStrategy.CHAT,
-        scheduler=scheduler,
-        broker=broker,
-        storage=storage,
-    )
-    dp.callback_query.middleware(HandleCallbackErrorMiddleware())
-    dp.message.middleware(HandleMessageErrorMiddleware())
-    dp.include_routers(
-        always_available_router,
-        game_groups_router,
-        game_users_router,
-        users_router,
-        groups_router,
-    )
+async def set_commands() -> None:
     private_commands = [
         BotCommand(
             command=BotCommands.help.name,
@@ -98,10 +102,163 @@ async def main() -> None:
     await bot.set_my_commands(
         group_commands, BotCommandScopeAllGroupChats()
     )
-    scheduler.start()
+
+
+def create_update_pipeline(dp: Dispatcher) -> UpdatePipeline:
+    return UpdatePipeline(
+        dispatcher=dp,
+        bot=bot,
+        max_concurrent_updates=settings.bot.max_concurrent_updates,
+        max_pending_updates=settings.bot.max_pending_updates,
+    )
+
+
+async def receive_updates(dp: Dispatcher) -> None:
+    """
+    Получает обновления через polling или через вебхук,
+    если use_webhook включён.
+    """
+    if not settings.bot.use_webhook:
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot, allowed_updates=ALLOWED_UPDATES)
+        return
+    app = web.Application()
+    PipelineRequestHandler(
+        pipeline=create_update_pipeline(dp),
+        secret_token=settings.bot.webhook_secret,
+    ).register(app, path=settings.bot.webhook_path)
+    setup_application(app, dp, bot=bot)
+    await bot.set_webhook(
+        url=f"{settings.bot.webhook_url}{settings.bot.webhook_path}",
+        secret_token=settings.bot.webhook_secret,
+        allowed_updates=ALLOWED_UPDATES,
+        drop_pending_updates=True,
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(
+        runner,
+        host=settings.bot.webhook_host,
+        port=settings.bot.webhook_port,
+    )
+    await site.start()
+    await asyncio.Event().wait()
+
+
+async def run_ingress() -> None:
+    """
+    Принимает обновления и раздаёт их шардам через очереди.
+    """
+    dp = Dispatcher()
+    dp.update.outer_middleware(ShardRoutingMiddleware(broker))
+    await set_commands()
     await broker.connect()
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    await receive_updates(dp)
+
+
+async def run_worker(dp: Dispatcher) -> None:
+    """
+    Обрабатывает обновления чатов своего шарда из очереди.
+    """
+    pipeline = create_update_pipeline(dp)
+
+    @broker.subscriber(get_updates_queue(settings.sharding.shard_id))
+    async def handle_update(update: dict):
+        await pipeline.put(
+            Update.model_validate(update, context={"bot": bot})
+        )
+
+    await broker.start()
+    await asyncio.Event().wait()
+
+
+async def main() -> None:
+    """
+    Функция для запуска бота и задач по расписанию
+
+    :return: None
+    """
+    configure_logging()
+    if settings.sharding.is_ingress:
+        await run_ingress()
+        return
+    await fill_database_with_roles()
+    scheduler = AsyncIOScheduler()
+    scheduler.configure()
+    storage = HashRedisStorage(
+        redis=redis,
+        json_loads=orjson.loads,
+        indexed_fields=GAME_INDEXED_FIELDS,
+    )
+    dp = Dispatcher(
+        fsm_strategy=FSMStrategy.CHAT,
+        scheduler=scheduler,
+        broker=broker,
+        storage=storage,
+    )
+    dp.callback_query.middleware(HandleCallbackErrorMiddleware())
+    dp.callback_query.middleware(PhaseBarrierMiddleware())
+    dp.message.middleware(HandleMessageErrorMiddleware())
+    dp.message.middleware(PhaseBarrierMiddleware())
+    dp.include_routers(
+        always_available_router,
+        game_groups_router,
+        game_users_router,
+        users_router,
+        groups_router,
+    )
+    scheduler.add_job(
+        func=resume_interrupted_games,
+        trigger=IntervalTrigger(seconds=GAME_LEASE_TTL),
+        id="resume_interrupted_games",
+        next_run_time=datetime.now(UTC),
+        kwargs={
+            "bot": bot,
+            "dispatcher": dp,
+            "scheduler": scheduler,
+            "broker": broker,
+        },
+    )
+    await storage.move_legacy_data()
+    await RegistrationJobsRepository(redis).move_legacy_jobs()
+    scheduler.add_job(
+        func=run_registration_jobs,
+        trigger=IntervalTrigger(seconds=REGISTRATION_JOBS_INTERVAL),
+        id="run_registration_jobs",
+        kwargs={
+            "bot": bot,
+            "dispatcher": dp,
+            "scheduler": scheduler,
+            "broker": broker,
+        },
+    )
+    if settings.sharding.shard_id == 0:
+        scheduler.add_job(
+            func=relay_outbox,
+            trigger=IntervalTrigger(seconds=OUTBOX_RELAY_INTERVAL),
+            id="relay_outbox",
+            kwargs={"storage": storage, "broker": broker},
+        )
+    scheduler.add_job(
+        func=rate_limiter.log_metrics,
+        trigger=IntervalTrigger(seconds=RATE_LIMIT_METRICS_INTERVAL),
+        id="log_rate_limiter_metrics",
+    )
+    scheduler.start()
+    phase_barriers_listener = asyncio.create_task(
+        listen_to_phase_barriers(redis)
+    )
+    try:
+        if settings.sharding.shards_count > 1:
+            await run_worker(dp)
+            return
+        await set_commands()
+        await broker.connect()
+        await receive_updates(dp)
+    finally:
+        phase_barriers_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await phase_barriers_listener
 
 
 if __name__ == "__main__":
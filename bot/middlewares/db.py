@@ -1,11 +1,65 @@
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
 from aiogram.types import CallbackQuery, Message
-from database.common.sessions import async_session_maker
+from database.common.sessions import (
+    AFTER_COMMIT_KEY,
+    async_session_maker,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
-class BaseDatabaseMiddleware(BaseMiddleware):
+class LazySession:
+    """
+    Обёртка над AsyncSession, которая создаёт сессию
+    только при первом обращении к ней.
+    """
+
+    def __init__(
+        self, session_maker: async_sessionmaker[AsyncSession]
+    ):
+        self._session_maker = session_maker
+        self._session: AsyncSession | None = None
+
+    @property
+    def is_opened(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_maker()
+        return getattr(self._session, name)
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def run_after_commit(self) -> None:
+        if self._session is None:
+            return
+        for callback in self._session.info.pop(AFTER_COMMIT_KEY, []):
+            await callback()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+class DatabaseMiddleware(BaseMiddleware):
+    """
+    Передаёт в обработчик одну ленивую сессию.
+
+    Изменения фиксируются, если обработчик запрашивает
+    session_with_commit, после чего выполняются действия,
+    отложенные через run_after_commit. Для
+    session_without_commit сессия только закрывается.
+    """
+
     async def __call__(
         self,
         handler: Callable[
@@ -14,44 +68,25 @@ class BaseDatabaseMiddleware(BaseMiddleware):
         event: Message | CallbackQuery,
         data: Dict[str, Any],
     ) -> Any:
-        async with async_session_maker() as session:
-            self.set_session(data, session)  # Устанавливаем сессию
-            try:
-                result = await handler(
-                    event, data
-                )  # Обрабатываем событие
-                await self.after_handler(
-                    session
-                )  # Дополнительные действия (например, коммит)
-                return result
-            except Exception as e:
-                await session.rollback()  # Откат изменений в случае ошибки
-                raise e
-            finally:
-                await session.close()  # Закрываем сессию
-
-    def set_session(self, data: Dict[str, Any], session) -> None:
-        """Метод для установки сессии в данные. Реализуется в дочерних классах."""
-        raise NotImplementedError(
-            "Этот метод должен быть реализован в подклассах."
-        )
-
-    async def after_handler(self, session) -> None:
-        """Метод для выполнения действий после обработки события. По умолчанию ничего не делает."""
-        pass
-
-
-class DatabaseMiddlewareWithoutCommit(BaseDatabaseMiddleware):
-    def set_session(self, data: Dict[str, Any], session) -> None:
-        """Устанавливаем сессию без коммита."""
-        data["session_without_commit"] = session
-
-
-class DatabaseMiddlewareWithCommit(BaseDatabaseMiddleware):
-    def set_session(self, data: Dict[str, Any], session) -> None:
-        """Устанавливаем сессию с коммитом."""
+        session = LazySession(async_session_maker)
         data["session_with_commit"] = session
+        data["session_without_commit"] = session
+        try:
+            result = await handler(event, data)
+            if self.need_to_commit(data):
+                await session.commit()
+                await session.run_after_commit()
+            return result
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
 
-    async def after_handler(self, session) -> None:
-        """Фиксируем изменения после обработки события."""
-        await session.commit()
+    @staticmethod
+    def need_to_commit(data: Dict[str, Any]) -> bool:
+        handler_object: HandlerObject | None = data.get("handler")
+        return (
+            handler_object is not None
+            and "session_with_commit" in handler_object.params
+        )
@@ -0,0 +1,30 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from cache.phase_barrier import PhaseBarrier, collect_games_to_check
+
+
+class PhaseBarrierMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[
+            [TelegramObject, Dict[str, Any]], Awaitable[Any]
+        ],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Будит игры, отмеченные обработчиком, если их фаза завершена.
+        Проверка идёт после обработчика, чтобы игра не продолжилась
+        раньше, чем он сохранит свои изменения
+        :param handler: обработчик
+        :param event: CallbackQuery или Message
+        :param data: Dict[str, Any]
+        :return: Any
+        """
+        with collect_games_to_check() as games:
+            result = await handler(event, data)
+        for state in games:
+            await PhaseBarrier(state).notify_if_completed()
+        return result
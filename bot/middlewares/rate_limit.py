@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from itertools import count
+from typing import TYPE_CHECKING, Final
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from loguru import logger
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+GLOBAL_MESSAGES_PER_SECOND: Final = 30
+GROUP_MESSAGES_PER_MINUTE: Final = 20
+GROUPS_BUCKETS_EVICTION_INTERVAL: Final = 60
+RATE_LIMIT_METRICS_INTERVAL: Final = 60
+MAX_RETRIES: Final = 5
+
+
+class Priority(IntEnum):
+    critical = 0
+    informational = 1
+
+
+current_priority: ContextVar[Priority] = ContextVar(
+    "current_priority", default=Priority.informational
+)
+
+
+@contextmanager
+def sending_priority(priority: Priority) -> Iterator[None]:
+    """
+    Задаёт приоритет запросов к Bot API внутри блока,
+    включая задачи, запущенные в нём через asyncio.gather.
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Ведро токенов с очередью ожидающих.
+
+    Ожидающие лежат в куче по приоритету и времени прихода
+    и просыпаются по таймеру, когда появляется токен.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.waiters: list[
+            tuple[Priority, int, asyncio.Future[None]]
+        ] = []
+        self._waiters_numbers = count()
+        self._wake_up: asyncio.TimerHandle | None = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate,
+        )
+        self.updated_at = now
+
+    @property
+    def waiting(self) -> dict[Priority, int]:
+        waiting = {priority: 0 for priority in Priority}
+        for priority, _, waiter in self.waiters:
+            if not waiter.done():
+                waiting[priority] += 1
+        return waiting
+
+    def is_idle(self) -> bool:
+        """
+        Проверяет, что ведро полное и его никто не ждёт,
+        то есть его можно заменить новым.
+        """
+        self._refill()
+        return self.tokens >= self.capacity and not self.waiters
+
+    async def acquire(self, priority: Priority):
+        self._refill()
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self.waiters,
+            (priority, next(self._waiters_numbers), waiter),
+        )
+        self._schedule_wake_up()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.tokens += 1
+            raise
+
+    def _schedule_wake_up(self):
+        if self._wake_up is not None:
+            return
+        self._refill()
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        self._wake_up = asyncio.get_running_loop().call_later(
+            delay, self._wake_up_waiters
+        )
+
+    def _wake_up_waiters(self):
+        """
+        Раздаёт появившиеся токены самым важным из ожидающих.
+        """
+        self._wake_up = None
+        self._refill()
+        while self.waiters and self.tokens >= 1:
+            _, _, waiter = heapq.heappop(self.waiters)
+            if waiter.done():
+                continue
+            self.tokens -= 1
+            waiter.set_result(None)
+        while self.waiters and self.waiters[0][2].done():
+            heapq.heappop(self.waiters)
+        if self.waiters:
+            self._schedule_wake_up()
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Планировщик исходящих запросов к Bot API.
+
+    Держит общий лимит Telegram и лимит на группу,
+    пропускает запросы с приоритетом critical вперёд
+    информационных и повторяет запросы после RetryAfter.
+
+    Общий лимит делится между шардами: каждый процесс
+    получает messages_per_second из него.
+    """
+
+    def __init__(
+        self, messages_per_second: float = GLOBAL_MESSAGES_PER_SECOND
+    ):
+        self.global_bucket = TokenBucket(
+            rate=messages_per_second,
+            capacity=max(int(messages_per_second), 1),
+        )
+        self.groups_buckets: dict[int, TokenBucket] = {}
+        self.groups_evicted_at = time.monotonic()
+        self.retries = 0
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        waiting = self.global_bucket.waiting
+        return {
+            "critical_queue": waiting[Priority.critical],
+            "informational_queue": waiting[Priority.informational],
+            "groups": len(self.groups_buckets),
+            "retries": self.retries,
+        }
+
+    def log_metrics(self):
+        logger.info("Очередь запросов к Bot API: {}", self.metrics)
+
+    def _evict_idle_groups_buckets(self):
+        """
+        Удаляет вёдра групп, которые давно не писали,
+        чтобы словарь не рос с каждой новой группой.
+        """
+        now = time.monotonic()
+        if (
+            now - self.groups_evicted_at
+            < GROUPS_BUCKETS_EVICTION_INTERVAL
+        ):
+            return
+        self.groups_evicted_at = now
+        self.groups_buckets = {
+            chat_id: bucket
+            for chat_id, bucket in self.groups_buckets.items()
+            if not bucket.is_idle()
+        }
+
+    def _get_group_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.groups_buckets.get(chat_id)
+        if bucket is None:
+            self._evict_idle_groups_buckets()
+            bucket = TokenBucket(
+                rate=GROUP_MESSAGES_PER_MINUTE / 60,
+                capacity=GROUP_MESSAGES_PER_MINUTE,
+            )
+            self.groups_buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(
+        self, chat_id: int | str | None, priority: Priority
+    ):
+        if isinstance(chat_id, int) and chat_id < 0:
+            await self._get_group_bucket(chat_id).acquire(priority)
+        await self.global_bucket.acquire(priority)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        priority = current_priority.get()
+        for attempt in range(MAX_RETRIES):
+            await self.acquire(chat_id=chat_id, priority=priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                self.retries += 1
+                logger.warning(
+                    "Telegram ограничил {} на {} с, очередь: {}",
+                    method.__api_method__,
+                    e.retry_after,
+                    self.metrics,
+                )
+                await asyncio.sleep(e.retry_after)
@@ -0,0 +1,33 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from faststream.rabbit import RabbitBroker
+from utils.sharding import get_shard_id_of_update, get_updates_queue
+
+
+class ShardRoutingMiddleware(BaseMiddleware):
+    def __init__(self, broker: RabbitBroker):
+        self.broker = broker
+
+    async def __call__(
+        self,
+        handler: Callable[
+            [TelegramObject, Dict[str, Any]], Awaitable[Any]
+        ],
+        update: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Передаёт обновление процессу, который ведёт этот чат
+        :param handler: обработчик
+        :param update: Update
+        :param data: Dict[str, Any]
+        :return: Any
+        """
+        await self.broker.publish(
+            message=update.model_dump(
+                mode="json", exclude_unset=True
+            ),
+            queue=get_updates_queue(get_shard_id_of_update(update)),
+        )
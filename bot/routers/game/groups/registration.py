@@ -8,9 +8,7 @@ from faststream.rabbit import RabbitBroker
 from keyboards.inline.cb.cb_text import (
     FINISH_REGISTRATION_CB,
 )
-from middlewares.db import (
-    DatabaseMiddlewareWithCommit,
-)
+from middlewares.db import DatabaseMiddleware
 from services.game.registartion import (
     Registration,
 )
@@ -18,8 +16,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from states.states import GameFsm
 
 router = Router(name=__name__)
-router.message.middleware(DatabaseMiddlewareWithCommit())
-router.callback_query.middleware(DatabaseMiddlewareWithCommit())
+router.message.middleware(DatabaseMiddleware())
+router.callback_query.middleware(DatabaseMiddleware())
 
 
 @router.message(Command("registration"), StateFilter(default_state))
@@ -5,18 +5,14 @@ from aiogram.types import CallbackQuery, Message
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from faststream.rabbit import RabbitBroker
 from keyboards.inline.cb.cb_text import CANCEL_CB
-from middlewares.db import (
-    DatabaseMiddlewareWithCommit,
-    DatabaseMiddlewareWithoutCommit,
-)
+from middlewares.db import DatabaseMiddleware
 from services.game.registartion import Registration
 from sqlalchemy.ext.asyncio import AsyncSession
 from states.states import GameFsm
 
 router = Router(name=__name__)
-router.message.middleware(DatabaseMiddlewareWithCommit())
-router.message.middleware(DatabaseMiddlewareWithoutCommit())
-router.callback_query.middleware(DatabaseMiddlewareWithoutCommit())
+router.message.middleware(DatabaseMiddleware())
+router.callback_query.middleware(DatabaseMiddleware())
 
 
 @router.message(
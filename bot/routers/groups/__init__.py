@@ -1,9 +1,6 @@
 from aiogram import F, Router
 from aiogram.enums import ChatType
-from middlewares.db import (
-    DatabaseMiddlewareWithCommit,
-    DatabaseMiddlewareWithoutCommit,
-)
+from middlewares.db import DatabaseMiddleware
 
 from .adding import router as adding_router
 from .settings import router as settings_router
@@ -13,9 +10,8 @@ router = Router(name=__name__)
 router.message.filter(
     F.chat.type.in_({ChatType.GROUP, ChatType.SUPERGROUP})
 )
-router.my_chat_member.middleware(DatabaseMiddlewareWithCommit())
-router.message.middleware(DatabaseMiddlewareWithCommit())
-router.message.middleware(DatabaseMiddlewareWithoutCommit())
+router.my_chat_member.middleware(DatabaseMiddleware())
+router.message.middleware(DatabaseMiddleware())
 router.include_routers(
     adding_router,
     settings_router,
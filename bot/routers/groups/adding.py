@@ -24,6 +24,12 @@ async def adding_to_group(
     await adding.adding_to_group(event=event, bot=bot)
 
 
+@router.my_chat_member()
+@router.chat_member()
+async def reset_chat_admins(event: ChatMemberUpdated):
+    await AddingRouter.reset_chat_admins(event)
+
+
 @router.message(CommandStart())
 async def delete_start(message: Message):
     await delete_message(message)
@@ -1,9 +1,6 @@
 from aiogram import F, Router
 from aiogram.enums import ChatType
-from middlewares.db import (
-    DatabaseMiddlewareWithCommit,
-    DatabaseMiddlewareWithoutCommit,
-)
+from middlewares.db import DatabaseMiddleware
 
 from .ban_roles import router as ban_roles_router
 from .help import router as help_router
@@ -16,19 +13,15 @@ from .time import router as time_router
 router = Router(name=__name__)
 router.message.filter(F.chat.type == ChatType.PRIVATE)
 router.callback_query.filter(F.message.chat.type == ChatType.PRIVATE)
-router.message.middleware(DatabaseMiddlewareWithCommit())
-router.message.middleware(DatabaseMiddlewareWithoutCommit())
-router.callback_query.middleware(DatabaseMiddlewareWithCommit())
-router.callback_query.middleware(DatabaseMiddlewareWithoutCommit())
+router.message.middleware(DatabaseMiddleware())
+router.callback_query.middleware(DatabaseMiddleware())
 
 
 always_available_router = Router(name=__name__)
 always_available_router.message.filter(
     F.chat.type == ChatType.PRIVATE
 )
-always_available_router.message.middleware(
-    DatabaseMiddlewareWithoutCommit()
-)
+always_available_router.message.middleware(DatabaseMiddleware())
 always_available_router.include_routers(
     profile_router,
     help_router,
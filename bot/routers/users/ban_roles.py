@@ -2,7 +2,7 @@ from aiogram import F, Router
 from aiogram.filters import and_f, or_f
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import ROLES_REGISTRY
 from keyboards.inline.cb.cb_text import (
     BAN_EVERYTHING_CB,
     CANCEL_CB,
@@ -77,7 +77,7 @@ async def suggest_roles_to_ban(
 
 
 @router.callback_query(
-    SettingsFsm.BAN_ROLES, F.data.in_(get_data_with_roles().keys())
+    SettingsFsm.BAN_ROLES, F.data.in_(ROLES_REGISTRY.keys())
 )
 async def process_banned_roles(
     callback: CallbackQuery,
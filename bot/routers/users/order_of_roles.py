@@ -2,7 +2,7 @@ from aiogram import F, Router
 from aiogram.filters import and_f, or_f
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import ROLES_REGISTRY
 from keyboards.inline.cb.cb_text import (
     CANCEL_CB,
     CLEAR_SETTINGS_CB,
@@ -69,7 +69,7 @@ async def start_editing_order(
 
 @router.callback_query(
     SettingsFsm.ORDER_OF_ROLES,
-    F.data.in_(get_data_with_roles().keys()),
+    F.data.in_(ROLES_REGISTRY.keys()),
 )
 async def add_new_role_to_queue(
     callback: CallbackQuery,
@@ -1,21 +1,36 @@
-import datetime
+import asyncio
 from contextlib import suppress
+from typing import Final
 
 from aiogram import Bot, Dispatcher
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from cache.cache_types import GameCache
+from cache.cache_types import GameCache, RegistrationJobLiteral
+from cache.game_state import GameStateRepository
+from cache.registration_jobs import (
+    REGISTRATION_JOB_LEASE_TTL,
+    RegistrationJobsRepository,
+)
+from database.common.sessions import async_session_maker
 from faststream.rabbit import RabbitBroker
 from general import settings
-from mafia.pipeline_game import Game
-from sqlalchemy.ext.asyncio import AsyncSession
+from general.config import clock, redis
+from keyboards.inline.keypads.join import get_join_kb
+from loguru import logger
+from mafia.pipeline_game import GAME_LEASE_TTL, WORKER_ID, Game
+from states.states import GameFsm
+from utils.informing import get_profiles_during_registration
 from utils.pretty_text import (
     get_minutes_and_seconds_text,
     make_build,
 )
-from utils.state import clear_game_data
+from utils.sharding import is_own_chat
+from utils.state import clear_game_data, get_state_and_assign
+
+REGISTRATION_JOBS_INTERVAL: Final = 1
+REMINDER_INTERVAL: Final = 31
 
 
 async def start_game(
@@ -23,11 +38,10 @@ async def start_game(
     state: FSMContext,
     dispatcher: Dispatcher,
     scheduler: AsyncIOScheduler,
-    session: AsyncSession,
     broker: RabbitBroker,
 ):
     game_data: GameCache = await state.get_data()
-    clearing_tasks_on_schedule(
+    await clearing_tasks_on_schedule(
         scheduler=scheduler,
         game_chat=game_data["game_chat"],
         need_to_clean_start=False,
@@ -60,26 +74,65 @@ async def start_game(
         dispatcher=dispatcher,
         scheduler=scheduler,
         broker=broker,
-        session=session,
+        session_maker=async_session_maker,
+        clock=clock,
+    )
+    scheduler.add_job(
+        func=game.start_game,
+        id=f"game_{game_data['game_chat']}",
+        replace_existing=True,
     )
-    await game.start_game()
 
 
-def clearing_tasks_on_schedule(
+async def clearing_tasks_on_schedule(
     scheduler: AsyncIOScheduler,
     game_chat: int,
     need_to_clean_start: bool,
 ):
+    kinds: list[RegistrationJobLiteral] = ["remind"]
     if need_to_clean_start is True:
-        with suppress(JobLookupError):
-            scheduler.remove_job(job_id=f"start_{game_chat}")
+        kinds.append("start")
+    await RegistrationJobsRepository(redis).cancel(game_chat, *kinds)
     with suppress(JobLookupError):
-        scheduler.remove_job(job_id=f"remind_{game_chat}")
+        scheduler.remove_job(
+            job_id=get_registration_message_job_id(game_chat)
+        )
+
+
+def get_registration_message_job_id(game_chat: int) -> str:
+    return f"registration_message_{game_chat}"
+
+
+async def update_registration_message(bot: Bot, state: FSMContext):
+    """
+    Показывает в группе актуальный список игроков.
+
+    Запускается с задержкой, чтобы серия входов и выходов
+    превращалась в одно редактирование сообщения.
+    """
+    if await state.get_state() != GameFsm.REGISTRATION.state:
+        return
+    game_data: GameCache = await state.get_data()
+    text = get_profiles_during_registration(
+        game_data["live_players_ids"], game_data["players"]
+    )
+    markup = await get_join_kb(
+        bot=bot,
+        game_chat=game_data["game_chat"],
+        players_ids=game_data["live_players_ids"],
+    )
+    with suppress(TelegramBadRequest):
+        await bot.edit_message_text(
+            chat_id=game_data["game_chat"],
+            text=text,
+            message_id=game_data["start_message_id"],
+            reply_markup=markup,
+        )
 
 
 async def remind_of_beginning_of_game(bot: Bot, state: FSMContext):
     game_data: GameCache = await state.get_data()
-    now = int(datetime.datetime.now(datetime.UTC).timestamp())
+    now = clock.timestamp()
     end_of_registration = game_data["end_of_registration"]
     message = get_minutes_and_seconds_text(
         start=now, end=end_of_registration
@@ -88,3 +141,127 @@ async def remind_of_beginning_of_game(bot: Bot, state: FSMContext):
         await bot.send_message(
             chat_id=game_data["game_chat"], text=make_build(message)
         )
+
+
+async def run_registration_jobs(
+    bot: Bot,
+    dispatcher: Dispatcher,
+    scheduler: AsyncIOScheduler,
+    broker: RabbitBroker,
+):
+    """
+    Запускает наступившие задачи регистрации чатов этого шарда.
+
+    Напоминания всех чатов отправляются отсюда же,
+    поэтому отдельные задачи по интервалу не нужны.
+    """
+    registration_jobs = RegistrationJobsRepository(redis)
+    now = clock.timestamp()
+    # аренда задаётся в настоящих секундах,
+    # а очередь живёт по часам игры
+    jobs = await registration_jobs.claim_due(
+        shard_id=settings.sharding.shard_id,
+        now=now,
+        lease_until=now
+        + clock.from_real_seconds(REGISTRATION_JOB_LEASE_TTL),
+    )
+    if not jobs:
+        return
+
+    async def run_job(kind: RegistrationJobLiteral, chat_id: int):
+        state = await get_state_and_assign(
+            dispatcher=dispatcher,
+            chat_id=chat_id,
+            bot_id=bot.id,
+        )
+        if await state.get_state() != GameFsm.REGISTRATION.state:
+            return
+        if kind == "start":
+            await start_game(
+                bot=bot,
+                state=state,
+                dispatcher=dispatcher,
+                scheduler=scheduler,
+                broker=broker,
+            )
+            return
+        await remind_of_beginning_of_game(bot=bot, state=state)
+        await registration_jobs.schedule(
+            chat_id, {"remind": now + REMINDER_INTERVAL}
+        )
+
+    async def run_job_safely(
+        kind: RegistrationJobLiteral, chat_id: int
+    ):
+        try:
+            await run_job(kind=kind, chat_id=chat_id)
+        except Exception:
+            logger.exception(
+                "Не удалось выполнить задачу {} в чате {}",
+                kind,
+                chat_id,
+            )
+        finally:
+            await registration_jobs.complete(kind, chat_id)
+
+    await asyncio.gather(
+        *(run_job_safely(kind, chat_id) for kind, chat_id in jobs)
+    )
+
+
+async def resume_game(
+    bot: Bot,
+    state: FSMContext,
+    dispatcher: Dispatcher,
+    scheduler: AsyncIOScheduler,
+    broker: RabbitBroker,
+):
+    game = Game(
+        bot=bot,
+        group_chat_id=state.key.chat_id,
+        state=state,
+        dispatcher=dispatcher,
+        scheduler=scheduler,
+        broker=broker,
+        session_maker=async_session_maker,
+        clock=clock,
+    )
+    await game.resume_game()
+
+
+async def resume_interrupted_games(
+    bot: Bot,
+    dispatcher: Dispatcher,
+    scheduler: AsyncIOScheduler,
+    broker: RabbitBroker,
+):
+    """
+    Подхватывает игры, которые никто не ведёт,
+    например после перезапуска или падения процесса.
+    """
+    for chat_id in await GameStateRepository.get_running_games_ids(
+        dispatcher.storage
+    ):
+        if not is_own_chat(chat_id):
+            continue
+        state = await get_state_and_assign(
+            dispatcher=dispatcher,
+            chat_id=chat_id,
+            bot_id=bot.id,
+        )
+        if not await GameStateRepository(state).take_over_lease(
+            owner=WORKER_ID, ttl=GAME_LEASE_TTL
+        ):
+            continue
+        scheduler.add_job(
+            func=resume_game,
+            id=f"resume_{chat_id}",
+            kwargs={
+                "bot": bot,
+                "state": state,
+                "dispatcher": dispatcher,
+                "scheduler": scheduler,
+                "broker": broker,
+            },
+            replace_existing=True,
+        )
@@ -0,0 +1,88 @@
+from typing import Final
+
+from cache.cache_types import OutboxEvent
+from cache.outbox import (
+    OUTBOX_ATTEMPTS_KEY,
+    OUTBOX_DEAD_LETTERS_KEY,
+    OUTBOX_KEY,
+)
+from cache.storage import HashRedisStorage
+from faststream.rabbit import RabbitBroker
+from loguru import logger
+from redis.asyncio import Redis
+
+OUTBOX_RELAY_INTERVAL: Final = 1
+OUTBOX_BATCH_SIZE: Final = 100
+OUTBOX_MAX_ATTEMPTS: Final = 5
+
+
+async def _remove_published(
+    redis: Redis, raw_events: list[bytes | str]
+) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.ltrim(OUTBOX_KEY, len(raw_events), -1)
+        pipe.hdel(OUTBOX_ATTEMPTS_KEY, *raw_events)
+        await pipe.execute()
+
+
+async def _register_failure(
+    redis: Redis, raw_event: bytes | str
+) -> None:
+    """
+    Считает неудачные попытки опубликовать событие.
+
+    После OUTBOX_MAX_ATTEMPTS попыток событие переносится
+    в список недоставленных, чтобы не задерживать следующие.
+    """
+    attempts = await redis.hincrby(OUTBOX_ATTEMPTS_KEY, raw_event, 1)
+    if attempts < OUTBOX_MAX_ATTEMPTS:
+        return
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.lrem(OUTBOX_KEY, 1, raw_event)
+        pipe.rpush(OUTBOX_DEAD_LETTERS_KEY, raw_event)
+        pipe.hdel(OUTBOX_ATTEMPTS_KEY, raw_event)
+        await pipe.execute()
+    logger.error(
+        "Событие из outbox перенесено в {} после {} попыток: {}",
+        OUTBOX_DEAD_LETTERS_KEY,
+        attempts,
+        raw_event,
+    )
+
+
+async def relay_outbox(
+    storage: HashRedisStorage, broker: RabbitBroker
+):
+    """
+    Публикует события из outbox в RabbitMQ пачками.
+
+    Событие удаляется только после публикации, поэтому
+    при недоступном брокере оно уйдёт при следующем запуске.
+    Событие, которое раз за разом не публикуется,
+    уходит в список недоставленных и не держит очередь.
+    """
+    redis = storage.redis
+    while raw_events := await redis.lrange(
+        OUTBOX_KEY, 0, OUTBOX_BATCH_SIZE - 1
+    ):
+        published = 0
+        try:
+            for raw_event in raw_events:
+                event: OutboxEvent = storage.json_loads(raw_event)
+                await broker.publish(
+                    message=event["message"], queue=event["queue"]
+                )
+                published += 1
+        except Exception:
+            logger.exception(
+                "Не удалось опубликовать события из outbox"
+            )
+            await _register_failure(
+                redis=redis, raw_event=raw_events[published]
+            )
+            return
+        finally:
+            if published:
+                await _remove_published(
+                    redis=redis, raw_events=raw_events[:published]
+                )
@@ -1,7 +1,10 @@
 from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Concatenate
 
 from aiogram.exceptions import TelegramAPIError
+from cache.group_settings import GroupSettingsRepository
+from database.common.sessions import run_after_commit
 from database.dao.groups import GroupsDao
 from database.dao.settings import SettingsDao
 from database.schemas.common import (
@@ -10,6 +13,7 @@ from database.schemas.common import (
     UserTgIdSchema,
 )
 from database.schemas.groups import GroupSettingIdSchema
+from general.config import redis
 from keyboards.inline.callback_factory.settings import (
     GroupSettingsCbData,
 )
@@ -156,6 +160,13 @@ class SettingsRouter(RouterHelper):
             filters=IdSchema(id=callback_data.group_id),
             values=GroupSettingIdSchema(setting_id=None),
         )
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_group,
+                callback_data.group_id,
+            ),
+        )
         await self.callback.answer(
             f"✅Теперь в группе {title} "
             f"разрешены настройки всех желающих, если они начнут регистрацию!",
@@ -181,6 +192,13 @@ class SettingsRouter(RouterHelper):
             filters=IdSchema(id=callback_data.group_id),
             values=GroupSettingIdSchema(setting_id=my_setting.id),
         )
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_group,
+                callback_data.group_id,
+            ),
+        )
         await self.callback.answer(
             f"✅Теперь в группе {title} "
             f"применены твои настройки!",
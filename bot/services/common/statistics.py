@@ -1,13 +1,17 @@
 import asyncio
 
-from database.dao.games import GamesDao
 from database.dao.groups import GroupsDao
-from database.dao.rates import RatesDao
-from database.dao.results import ResultsDao
+from database.dao.statistics import (
+    BetStatisticsDao,
+    GroupingStatisticsDao,
+    GroupStatisticsDao,
+    PlayerStatisticsDao,
+    RoleStatisticsDao,
+)
 from database.dao.users import UsersDao
 from database.schemas.common import TgIdSchema, UserTgIdSchema
 from database.schemas.groups import GroupIdSchema
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import ROLES_REGISTRY
 from general.text import MONEY_SYM
 from services.base import RouterHelper
 from utils.pretty_text import (
@@ -27,34 +31,38 @@ class StatisticsRouter(RouterHelper):
             TgIdSchema(tg_id=self.message.from_user.id)
         )
         balance = user.balance
-        results_dao = ResultsDao(session=self.session)
 
         number_of_games = 0
         number_of_wins = 0
         number_of_nights = 0
         money_sum = 0
 
-        result = await results_dao.get_results(
+        result = await RoleStatisticsDao(
+            session=self.session
+        ).get_results(
             user_tg_id=UserTgIdSchema(
                 user_tg_id=self.message.from_user.id
             )
         )
-        all_roles = get_data_with_roles()
+        all_roles = ROLES_REGISTRY
         if not result:
             detailed_statistics = "\n\n"
         else:
             detailed_statistics = "\n\nℹ️Подробная статистика:\n\n"
             for num, row in enumerate(result, 1):
                 number_of_games += row.number_of_games
-                number_of_wins += row.is_winner_count
-                number_of_nights += row.nights_lived_count
-                money_sum += row.money_sum
+                number_of_wins += row.number_of_wins
+                number_of_nights += row.number_of_nights
+                money_sum += row.money
                 current_role = all_roles[row.role_id]
+                efficiency = int(
+                    row.number_of_wins / row.number_of_games * 100
+                )
                 text = (
                     f"{num}) {make_pretty(current_role.role)}"
                     f"{current_role.grouping.value.name[-1]}: "
-                    f"выиграно {row.is_winner_count} из {row.number_of_games} "
-                    f"({int(row.efficiency)}%) {row.money_sum}{MONEY_SYM}\n\n"
+                    f"выиграно {row.number_of_wins} из {row.number_of_games} "
+                    f"({efficiency}%) {row.money}{MONEY_SYM}\n\n"
                 )
                 detailed_statistics += text
 
@@ -76,18 +84,16 @@ class StatisticsRouter(RouterHelper):
             f"💤Среднее количество проживаемых ночей: {average_number_of_nights_spent}"
         )
         result_text += detailed_statistics
-        rates_result = await RatesDao(
+        rates_result = await BetStatisticsDao(
             session=self.session
-        ).get_results(
-            user_tg_id=UserTgIdSchema(
-                user_tg_id=self.message.from_user.id
-            )
+        ).find_one_or_none(
+            UserTgIdSchema(user_tg_id=self.message.from_user.id)
         )
-        if rates_result.count:
+        if rates_result and rates_result.number_of_bets:
             rates_text = (
-                f"🎲Сделано ставок: {rates_result.count}\n"
-                f"🎱Выиграно ставок: {rates_result.is_winner_count} "
-                f"({int(rates_result.is_winner_count / rates_result.count * 100)}%)\n"
+                f"🎲Сделано ставок: {rates_result.number_of_bets}\n"
+                f"🎱Выиграно ставок: {rates_result.number_of_wins} "
+                f"({int(rates_result.number_of_wins / rates_result.number_of_bets * 100)}%)\n"
                 f"⛔Потрачено на ставки: {rates_result.money}{MONEY_SYM}\n\n"
             )
             result_text += rates_text
@@ -103,43 +109,38 @@ class StatisticsRouter(RouterHelper):
             return
 
         group_id_filter = GroupIdSchema(group_id=group.id)
-        games_dao = GamesDao(session=self.session)
-        game_result = await games_dao.get_results(group_id_filter)
-        if game_result is None:
+        game_result = await GroupStatisticsDao(
+            session=self.session
+        ).find_one_or_none(group_id_filter)
+        if game_result is None or not game_result.number_of_games:
             await self.message.answer(
                 make_build("В этой группе еще не было игр!")
             )
             return
-        number_of_players = (
-            await games_dao.get_average_number_of_players(
-                group_id_filter
-            )
-        )
+        number_of_games = game_result.number_of_games
         minutes_and_seconds = get_minutes_and_seconds_text(
-            seconds=int(game_result.average_time.total_seconds()),
+            seconds=game_result.duration // number_of_games,
             message="",
         )
         text = (
             "📈Статистика группы\n\n"
-            f"🎮Количество игр: {game_result.number_of_games}\n"
-            f"👤Среднее количество игроков за игру: {number_of_players}\n"
-            f"💤Среднее количество ночей: {game_result.nights_lived_count}\n"
+            f"🎮Количество игр: {number_of_games}\n"
+            f"👤Среднее количество игроков за игру: {round(game_result.number_of_players / number_of_games)}\n"
+            f"💤Среднее количество ночей: {round(game_result.number_of_nights / number_of_games)}\n"
             f"⏰Cредняя продолжительность одной игры: {minutes_and_seconds}"
         )
         groupings_text = "\n\n👨‍👨‍👦‍👦Информация о группировках:\n\n"
-        groupings_result = await games_dao.get_winning_groupings(
-            group_id_filter
-        )
+        groupings_result = await GroupingStatisticsDao(
+            session=self.session
+        ).get_winning_groupings(group_id_filter)
         for num, row in enumerate(groupings_result, 1):
-            winner_text = f"{num}) {make_pretty(row.winning_group)} - {row.number_of_wins} побед\n"
+            winner_text = f"{num}) {make_pretty(row.grouping)} - {row.number_of_wins} побед\n"
             groupings_text += winner_text
         text += groupings_text
 
-        users_result = (
-            await games_dao.get_statistics_of_players_by_group(
-                group_id_filter
-            )
-        )
+        users_result = await PlayerStatisticsDao(
+            session=self.session
+        ).get_top_players(group_id_filter)
         users_info = await asyncio.gather(
             *(
                 self.message.bot.get_chat_member(
@@ -161,7 +162,7 @@ class StatisticsRouter(RouterHelper):
             user_stat = (
                 f"{num}) {link}: выиграно {user_data.number_of_wins} "
                 f"из {user_data.number_of_games} "
-                f"({user_data.efficiency}%)\n"
+                f"({int(user_data.efficiency)}%)\n"
             )
             users_text += user_stat
         text += users_text
@@ -1,33 +1,84 @@
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 
 from aiogram import Dispatcher
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
-from cache.cache_types import GameCache, UserCache, UserIdInt
-from general.collection_of_roles import get_data_with_roles
+from cache.cache_types import GameCache, UserIdInt
+from cache.game_state import GameStateRepository
+from cache.phase_barrier import check_phase_after_handler
+from general.collection_of_roles import ROLES_REGISTRY
 from general.text import NUMBER_OF_NIGHT
 from keyboards.inline.callback_factory.recognize_user import (
     UserActionIndexCbData,
 )
 from mafia.roles import ActiveRoleAtNightABC, Hacker, Mafia
+from utils.announcements import GroupAnnouncer
 from utils.informing import send_a_lot_of_messages_safely
 from utils.pretty_text import make_build
 from utils.state import get_state_and_assign
 from utils.tg import delete_message
 
 
+def remove_from_expected(game_data: GameCache, user_id: int):
+    with suppress(ValueError):
+        game_data["wait_for"].remove(user_id)
+
+
+def record_tracking(
+    game_data: GameCache, acting_user_id: int, user_id: int
+):
+    suffer_tracking = game_data["tracking"].setdefault(
+        str(acting_user_id), {}
+    )
+    sufferers = suffer_tracking.setdefault("sufferers", [])
+    sufferers.append(user_id)
+
+    interacting_tracking = game_data["tracking"].setdefault(
+        str(user_id), {}
+    )
+    interacting = interacting_tracking.setdefault("interacting", [])
+    interacting.append(acting_user_id)
+
+
 async def send_messages_and_remove_from_expected(
     callback: CallbackQuery,
     game_data: GameCache,
+    game_state: FSMContext,
     message_to_user: bool | str = True,
     message_to_group: bool | str = True,
     user_id: int | None = None,
     current_role: ActiveRoleAtNightABC | None = None,
     need_to_remove_from_expected: bool = True,
+    mutation: Callable[[GameCache], None] | None = None,
+    changed_fields: Iterable[str] = (),
 ):
+    """
+    Атомарно сохраняет действие и сообщает о нём.
+
+    mutation применяется к свежим значениям changed_fields,
+    а не к game_data, чтобы не затереть чужие действия.
+    """
+    changed_fields = list(changed_fields)
     if need_to_remove_from_expected:
-        with suppress(ValueError):
-            game_data["wait_for"].remove(callback.from_user.id)
+        changed_fields.append("wait_for")
+    if changed_fields:
+
+        def save_action(data: GameCache):
+            if mutation is not None:
+                mutation(data)
+            if need_to_remove_from_expected:
+                remove_from_expected(
+                    game_data=data, user_id=callback.from_user.id
+                )
+
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                save_action, *changed_fields
+            )
+        )
+    if need_to_remove_from_expected:
+        check_phase_after_handler(game_state)
     message_to_group_after_action = None
     if isinstance(message_to_group, str):
         message_to_group_after_action = message_to_group
@@ -36,10 +87,9 @@ async def send_messages_and_remove_from_expected(
             current_role.message_to_group_after_action
         )
     if message_to_group_after_action:
-        await callback.bot.send_message(
-            chat_id=game_data["game_chat"],
-            text=make_build(message_to_group_after_action),
-        )
+        await GroupAnnouncer(
+            bot=callback.bot, state=game_state
+        ).announce(message_to_group_after_action)
     message_to_user_after_action = None
     if isinstance(message_to_user, str):
         message_to_user_after_action = message_to_user
@@ -61,31 +111,37 @@ async def send_messages_and_remove_from_expected(
 async def trace_all_actions(
     callback: CallbackQuery,
     game_data: GameCache,
+    game_state: FSMContext,
     user_id: int,
     current_role: ActiveRoleAtNightABC,
     message_to_group: bool | str = True,
     message_to_user: bool | str = True,
     need_to_remove_from_expected: bool = True,
+    mutation: Callable[[GameCache], None] | None = None,
+    changed_fields: Iterable[str] = (),
 ):
-    suffer_tracking = game_data["tracking"].setdefault(
-        str(callback.from_user.id), {}
-    )
-    sufferers = suffer_tracking.setdefault("sufferers", [])
-    sufferers.append(user_id)
+    acting_user_id = callback.from_user.id
+
+    def trace_action(data: GameCache):
+        record_tracking(
+            game_data=data,
+            acting_user_id=acting_user_id,
+            user_id=user_id,
+        )
+        if mutation is not None:
+            mutation(data)
 
-    interacting_tracking = game_data["tracking"].setdefault(
-        str(user_id), {}
-    )
-    interacting = interacting_tracking.setdefault("interacting", [])
-    interacting.append(callback.from_user.id)
     await send_messages_and_remove_from_expected(
         callback=callback,
         game_data=game_data,
+        game_state=game_state,
         message_to_user=message_to_user,
         message_to_group=message_to_group,
         user_id=user_id,
         current_role=current_role,
         need_to_remove_from_expected=need_to_remove_from_expected,
+        mutation=trace_action,
+        changed_fields=("tracking", *changed_fields),
     )
 
 
@@ -126,14 +182,15 @@ async def get_game_state_and_data(
     tg_obj: CallbackQuery | Message,
     state: FSMContext,
     dispatcher: Dispatcher,
+    fields: Iterable[str] = (),
 ) -> tuple[FSMContext, GameCache]:
-    user_data: UserCache = await state.get_data()
+    game_chat = await state.get_value("game_chat")
     game_state = await get_state_and_assign(
         dispatcher=dispatcher,
-        chat_id=user_data["game_chat"],
+        chat_id=game_chat,
         bot_id=tg_obj.bot.id,
     )
-    game_data: GameCache = await game_state.get_data()
+    game_data = await GameStateRepository(game_state).get(*fields)
     return game_state, game_data
 
 
@@ -142,43 +199,20 @@ async def get_game_state_data_and_user_id(
     callback_data: UserActionIndexCbData,
     state: FSMContext,
     dispatcher: Dispatcher,
+    fields: Iterable[str] = (),
 ) -> tuple[FSMContext, GameCache, UserIdInt]:
+    if fields:
+        fields = {"live_players_ids", *fields}
     game_state, game_data = await get_game_state_and_data(
-        tg_obj=callback, state=state, dispatcher=dispatcher
+        tg_obj=callback,
+        state=state,
+        dispatcher=dispatcher,
+        fields=fields,
     )
     user_id = game_data["live_players_ids"][callback_data.user_index]
     return game_state, game_data, user_id
 
 
-async def inform_players_and_trace_actions(
-    callback: CallbackQuery,
-    game_data: GameCache,
-    user_id: int,
-    current_role: ActiveRoleAtNightABC,
-):
-    url = game_data["players"][str(user_id)]["url"]
-    await inform_aliases(
-        current_role=current_role,
-        game_data=game_data,
-        callback=callback,
-        url=url,
-    )
-    message_to_group = False
-    if (
-        current_role.message_to_group_after_action
-        and not game_data[current_role.processed_users_key]
-    ):
-        message_to_group = True
-
-    await trace_all_actions(
-        callback=callback,
-        game_data=game_data,
-        user_id=user_id,
-        current_role=current_role,
-        message_to_group=message_to_group,
-    )
-
-
 async def take_action_and_save_data(
     callback: CallbackQuery,
     callback_data: UserActionIndexCbData,
@@ -196,29 +230,70 @@ async def take_action_and_save_data(
     role_id = game_data["players"][str(callback.from_user.id)][
         "role_id"
     ]
-    current_role: ActiveRoleAtNightABC = get_data_with_roles(role_id)
+    current_role: type[ActiveRoleAtNightABC] = ROLES_REGISTRY[
+        role_id
+    ]
+
+    acting_user_id = callback.from_user.id
+    is_first_choice = False
+
+    def save_action(data: GameCache):
+        nonlocal is_first_choice
+        is_first_choice = not data.get(
+            current_role.processed_users_key
+        )
+        record_tracking(
+            game_data=data,
+            acting_user_id=acting_user_id,
+            user_id=user_id,
+        )
+        remove_from_expected(game_data=data, user_id=acting_user_id)
+        if current_role.last_interactive_key:
+            current_night = game_data["number_of_night"]
+            nights = data[
+                current_role.last_interactive_key
+            ].setdefault(str(user_id), [])
+            if current_night not in nights:
+                nights.append(current_night)
+        if current_role.processed_users_key:
+            data[current_role.processed_users_key].append(user_id)
+        if (
+            current_role.processed_by_boss
+            and acting_user_id
+            == game_data[current_role.roles_key][0]
+        ):
+            data[current_role.processed_by_boss].append(user_id)
 
-    await inform_players_and_trace_actions(
+    changed_fields = (
+        "tracking",
+        "wait_for",
+        current_role.last_interactive_key,
+        current_role.processed_users_key,
+        current_role.processed_by_boss,
+    )
+    game_data.update(
+        await GameStateRepository(game_state).mutate(
+            save_action,
+            *(field for field in changed_fields if field),
+        )
+    )
+    check_phase_after_handler(game_state)
+    await inform_aliases(
+        current_role=current_role,
+        game_data=game_data,
+        callback=callback,
+        url=game_data["players"][str(user_id)]["url"],
+    )
+    await send_messages_and_remove_from_expected(
         callback=callback,
         game_data=game_data,
+        game_state=game_state,
+        message_to_group=bool(
+            current_role.message_to_group_after_action
+            and is_first_choice
+        ),
         user_id=user_id,
         current_role=current_role,
+        need_to_remove_from_expected=False,
     )
-    if current_role.last_interactive_key:
-        current_night = game_data["number_of_night"]
-        nights = game_data[
-            current_role.last_interactive_key
-        ].setdefault(str(user_id), [])
-        if current_night not in nights:
-            nights.append(current_night)
-
-    if current_role.processed_users_key:
-        game_data[current_role.processed_users_key].append(user_id)
-    if (
-        current_role.processed_by_boss
-        and callback.from_user.id
-        == game_data[current_role.roles_key][0]
-    ):
-        game_data[current_role.processed_by_boss].append(user_id)
-    await game_state.set_data(game_data)
     return game_state, game_data, user_id
@@ -3,6 +3,8 @@ from datetime import timedelta
 
 from aiogram.exceptions import TelegramBadRequest
 from cache.cache_types import GameCache, PlayersIds
+from cache.game_state import GameStateRepository
+from cache.phase_barrier import check_phase_after_handler
 from keyboards.inline.callback_factory.recognize_user import (
     AimedUserCbData,
     ProsAndCons,
@@ -30,21 +32,40 @@ class GroupManager(RouterHelper):
                 add_to.append(user_id)
 
     async def delete_message_from_non_players(self):
-        game_data: GameCache = await self.state.get_data()
+        user_id = self.message.from_user.id
+        game_state = GameStateRepository(self.state)
+        memberships = await game_state.get_memberships(
+            user_id, "live_players_ids", "cant_talk"
+        )
+        if memberships is None:
+            game_data: GameCache = await game_state.get(
+                "live_players_ids", "cant_talk"
+            )
+            memberships = {
+                "live_players_ids": user_id
+                in game_data.get("live_players_ids", []),
+                "cant_talk": user_id
+                in game_data.get("cant_talk", []),
+            }
         if (
-            self.message.from_user.id
-            not in game_data["live_players_ids"]
-        ) or self.message.from_user.id in game_data["cant_talk"]:
+            not memberships["live_players_ids"]
+            or memberships["cant_talk"]
+        ):
             await delete_message(message=self.message)
             await ban_user(
                 bot=self.message.bot,
-                chat_id=game_data["game_chat"],
+                chat_id=self.message.chat.id,
                 user_id=self.message.from_user.id,
                 until_date=timedelta(seconds=30),
             )
 
     async def confirm_vote(self, callback_data: AimedUserCbData):
-        game_data: GameCache = await self.state.get_data()
+        game_state = GameStateRepository(self.state)
+        game_data: GameCache = await game_state.get(
+            "live_players_ids",
+            "cant_vote",
+            PrimeMinister.roles_key,
+        )
         if (
             self.callback.from_user.id
             not in game_data["live_players_ids"]
@@ -66,30 +87,27 @@ class GroupManager(RouterHelper):
             )
             return
         if callback_data.action == ProsAndCons.pros:
+            add_to, delete_from = "pros", "cons"
+        else:
+            add_to, delete_from = "cons", "pros"
+        prime_ministers = game_data.get(PrimeMinister.roles_key, [])
+
+        def add_voice(voices: GameCache):
             self._add_voice(
                 user_id=self.callback.from_user.id,
-                add_to=game_data["pros"],
-                delete_from=game_data["cons"],
-                prime_ministers=game_data.get(
-                    PrimeMinister.roles_key, []
-                ),
-            )
-        elif callback_data.action == ProsAndCons.cons:
-            self._add_voice(
-                user_id=self.callback.from_user.id,
-                add_to=game_data["cons"],
-                delete_from=game_data["pros"],
-                prime_ministers=game_data.get(
-                    PrimeMinister.roles_key, []
-                ),
+                add_to=voices[add_to],
+                delete_from=voices[delete_from],
+                prime_ministers=prime_ministers,
             )
+
+        voices = await game_state.mutate(add_voice, "pros", "cons")
+        check_phase_after_handler(self.state)
         with suppress(TelegramBadRequest, AttributeError):
             await self.callback.message.edit_reply_markup(
                 reply_markup=get_vote_for_aim_kb(
                     user_id=callback_data.user_id,
-                    pros=game_data["pros"],
-                    cons=game_data["cons"],
+                    pros=voices["pros"],
+                    cons=voices["cons"],
                 )
             )
-        await self.state.set_data(game_data)
         await self.callback.answer()
@@ -1,4 +1,6 @@
-from general.collection_of_roles import get_data_with_roles
+from cache.game_state import GameStateRepository
+from cache.phase_barrier import check_phase_after_handler
+from general.collection_of_roles import ROLES_REGISTRY
 from general.groupings import Groupings
 from keyboards.inline.callback_factory.recognize_user import (
     UserActionIndexCbData,
@@ -12,6 +14,7 @@ from services.game.game_assistants import (
     get_game_state_and_data,
     get_game_state_data_and_user_id,
 )
+from utils.announcements import GroupAnnouncer
 from utils.common import get_criminals_ids
 from utils.informing import send_a_lot_of_messages_safely
 from utils.pretty_text import make_build
@@ -55,11 +58,11 @@ class UserManager(RouterHelper):
         role = game_data["players"][str(self.message.from_user.id)][
             "pretty_role"
         ]
-        current_role = get_data_with_roles(
+        current_role = ROLES_REGISTRY[
             game_data["players"][str(self.message.from_user.id)][
                 "role_id"
             ]
-        )
+        ]
         criminals_ids = get_criminals_ids(game_data)
         if current_role.grouping == Groupings.criminals:
             aliases = criminals_ids
@@ -97,6 +100,7 @@ class UserManager(RouterHelper):
                 callback_data=callback_data,
                 state=self.state,
                 dispatcher=self.dispatcher,
+                fields=("deceived", "players", "game_chat"),
             )
         )
         deceived_user = game_data.get("deceived", [])
@@ -106,22 +110,23 @@ class UserManager(RouterHelper):
             and deceived_user[1] in game_data["live_players_ids"]
         ):
             voted_user_id = deceived_user[1]
-        game_data["vote_for"].append(
-            [self.callback.from_user.id, voted_user_id]
-        )
+        vote = [self.callback.from_user.id, voted_user_id]
         voting_url = game_data["players"][
             str(self.callback.from_user.id)
         ]["url"]
         voted_url = game_data["players"][str(voted_user_id)]["url"]
         await delete_message(self.callback.message)
-        await game_state.set_data(game_data)
+        await GameStateRepository(game_state).mutate(
+            lambda data: data["vote_for"].append(vote), "vote_for"
+        )
+        check_phase_after_handler(game_state)
         await self.callback.message.answer(
             make_build(f"Ты выбрал голосовать за {voted_url}")
         )
-        await self.callback.bot.send_message(
-            chat_id=game_data["game_chat"],
-            text=make_build(
-                f"❗️{voting_url} выступает против {voted_url}!"
-            ),
+        await GroupAnnouncer(
+            bot=self.callback.bot, state=game_state
+        ).announce(
+            f"❗️{voting_url} выступает против {voted_url}!",
             reply_markup=participate_in_social_life(),
+            is_urgent=True,
         )
@@ -1,7 +1,8 @@
 from collections.abc import Awaitable, Callable
 from contextlib import suppress
-from datetime import UTC, datetime, timedelta, timezone
-from typing import Concatenate
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Concatenate, Final
 
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import CommandObject
@@ -9,7 +10,6 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import ChatMemberAdministrator
 from aiogram.utils.payload import decode_payload
 from apscheduler.triggers.date import DateTrigger
-from apscheduler.triggers.interval import IntervalTrigger
 from cache.cache_types import (
     GameCache,
     GameSettingsCache,
@@ -18,13 +18,19 @@ from cache.cache_types import (
     UserCache,
     UserGameCache,
 )
+from cache.chat_admins import ChatAdminsRepository
+from cache.game_state import GameStateRepository
+from cache.group_settings import GroupSettingsRepository
+from cache.registration_jobs import RegistrationJobsRepository
+from database.common.sessions import async_session_maker
 from database.dao.groups import GroupsDao
 from database.dao.users import UsersDao
 from database.schemas.common import TgIdSchema, UserTgIdSchema
 from general import settings
 from general.collection_of_roles import (
-    get_data_with_roles,
+    ROLES_REGISTRY,
 )
+from general.config import clock, redis
 from general.text import MONEY_SYM, REQUIRED_PERMISSIONS
 from keyboards.inline.keypads.join import (
     cancel_bet,
@@ -33,9 +39,10 @@ from keyboards.inline.keypads.join import (
 )
 from mafia.pipeline_game import Game
 from scheduler.game import (
+    REMINDER_INTERVAL,
     clearing_tasks_on_schedule,
-    remind_of_beginning_of_game,
-    start_game,
+    get_registration_message_job_id,
+    update_registration_message,
 )
 from services.base import RouterHelper
 from services.game.game_assistants import get_game_state_and_data
@@ -57,6 +64,8 @@ from utils.tg import (
     delete_message,
 )
 
+REGISTRATION_MESSAGE_EDIT_DELAY: Final = 1.5
+
 
 def verification_for_admin_or_creator[R, **P](
     async_func: Callable[
@@ -91,7 +100,7 @@ class Registration(RouterHelper):
     async def _start_game(
         self, game_data: GameCache, game_state: FSMContext
     ):
-        clearing_tasks_on_schedule(
+        await clearing_tasks_on_schedule(
             scheduler=self.scheduler,
             game_chat=game_data["game_chat"],
             need_to_clean_start=True,
@@ -104,9 +113,14 @@ class Registration(RouterHelper):
             dispatcher=self.dispatcher,
             scheduler=self.scheduler,
             broker=self.broker,
-            session=self.session,
+            session_maker=async_session_maker,
+            clock=clock,
+        )
+        self.scheduler.add_job(
+            func=game.start_game,
+            id=f"game_{game_data['game_chat']}",
+            replace_existing=True,
         )
-        await game.start_game()
 
     async def _get_user_or_create(self):
         user_id = self._get_user_id()
@@ -118,9 +132,10 @@ class Registration(RouterHelper):
     async def checking_for_necessary_permissions_to_start_game(
         self,
     ) -> bool:
-        chat_member = await self.message.bot.get_chat_member(
-            chat_id=self.message.chat.id, user_id=self.message.bot.id
+        admins = await ChatAdminsRepository(redis).get_admins(
+            bot=self.message.bot, chat_id=self.message.chat.id
         )
+        chat_member = admins.get(self.message.bot.id)
         if isinstance(chat_member, ChatMemberAdministrator) is False:
             return False
         return all(
@@ -154,15 +169,8 @@ class Registration(RouterHelper):
             ),
             reply_markup=markup,
         )
-        start_of_registration_dt = datetime.now(UTC)
-        end_of_registration = int(
-            (
-                start_of_registration_dt + timedelta(seconds=60 * 2)
-            ).timestamp()
-        )
-        start_of_registration = int(
-            start_of_registration_dt.timestamp()
-        )
+        start_of_registration = clock.timestamp()
+        end_of_registration = start_of_registration + 60 * 2
         await self._init_game(
             message_id=sent_message.message_id,
             start_of_registration=start_of_registration,
@@ -174,34 +182,17 @@ class Registration(RouterHelper):
             end=end_of_registration,
         )
         await self.message.answer(make_build(time_to_start))
-        self.scheduler.add_job(
-            func=start_game,
-            trigger=DateTrigger(
-                run_date=datetime.fromtimestamp(end_of_registration),
-                timezone=timezone.utc,
-            ),
-            id=f"start_{self.message.chat.id}",
-            kwargs={
-                "bot": self.message.bot,
-                "state": self.state,
-                "dispatcher": self.dispatcher,
-                "scheduler": self.scheduler,
-                "broker": self.broker,
-                "session": self.session,
+        await RegistrationJobsRepository(redis).schedule(
+            self.message.chat.id,
+            {
+                "start": end_of_registration,
+                "remind": start_of_registration + REMINDER_INTERVAL,
             },
-            replace_existing=True,
-        )
-        self.scheduler.add_job(
-            func=remind_of_beginning_of_game,
-            trigger=IntervalTrigger(seconds=31),
-            id=f"remind_{self.message.chat.id}",
-            kwargs={"bot": self.message.bot, "state": self.state},
-            replace_existing=True,
         )
 
     @verification_for_admin_or_creator
     async def extend_registration(self, game_data: GameCache):
-        now = int(datetime.now(UTC).timestamp())
+        now = clock.timestamp()
         start_of_registration = game_data["start_of_registration"]
         if (
             now - start_of_registration
@@ -215,12 +206,8 @@ class Registration(RouterHelper):
         await self.state.update_data(
             {"end_of_registration": end_of_registration}
         )
-        self.scheduler.reschedule_job(
-            job_id=f"start_{self.message.chat.id}",
-            trigger=DateTrigger(
-                run_date=datetime.fromtimestamp(end_of_registration),
-                timezone=timezone.utc,
-            ),
+        await RegistrationJobsRepository(redis).schedule(
+            self.message.chat.id, {"start": end_of_registration}
         )
         time_to_start = get_minutes_and_seconds_text(
             start=now, end=end_of_registration
@@ -240,7 +227,7 @@ class Registration(RouterHelper):
             state=self.state,
             message_id=game_data["start_message_id"],
         )
-        clearing_tasks_on_schedule(
+        await clearing_tasks_on_schedule(
             scheduler=self.scheduler,
             game_chat=game_data["game_chat"],
             need_to_clean_start=True,
@@ -282,25 +269,21 @@ class Registration(RouterHelper):
             reply_markup=to_user_markup,
         )
 
-    async def _change_message_in_group(
-        self, game_data: GameCache, game_chat: int
+    def _change_message_in_group(
+        self, game_state: FSMContext, game_chat: int
     ):
-        bot = self._get_bot()
-        text = get_profiles_during_registration(
-            game_data["live_players_ids"], game_data["players"]
-        )
-        to_group_markup = await get_join_kb(
-            bot=bot,
-            game_chat=game_chat,
-            players_ids=game_data["live_players_ids"],
+        job_id = get_registration_message_job_id(game_chat)
+        if self.scheduler.get_job(job_id) is not None:
+            return
+        self.scheduler.add_job(
+            func=update_registration_message,
+            trigger=DateTrigger(
+                run_date=datetime.now(UTC)
+                + timedelta(seconds=REGISTRATION_MESSAGE_EDIT_DELAY),
+            ),
+            id=job_id,
+            kwargs={"bot": self._get_bot(), "state": game_state},
         )
-        with suppress(TelegramBadRequest):
-            await bot.edit_message_text(
-                chat_id=game_chat,
-                text=text,
-                message_id=game_data["start_message_id"],
-                reply_markup=to_group_markup,
-            )
 
     async def join_to_game(self, command: CommandObject):
         await self.message.delete()
@@ -327,7 +310,10 @@ class Registration(RouterHelper):
             return
         user_id = self._get_user_id()
         full_name = self.message.from_user.full_name
-        game_data: GameCache = await game_state.get_data()
+        game_state_repository = GameStateRepository(game_state)
+        game_data = await game_state_repository.get(
+            "game_chat", "settings"
+        )
         balance = (await self._get_user_or_create()).balance
         user_game_data: UserGameCache = {
             "full_name": full_name,
@@ -338,8 +324,17 @@ class Registration(RouterHelper):
             "money": 0,
             "achievements": [],
         }
-        game_data["live_players_ids"].append(user_id)
-        game_data["players"][str(user_id)] = user_game_data
+
+        def add_player(data: GameCache):
+            if user_id not in data["live_players_ids"]:
+                data["live_players_ids"].append(user_id)
+            data["players"][str(user_id)] = user_game_data
+
+        game_data.update(
+            await game_state_repository.mutate(
+                add_player, "live_players_ids", "players"
+            )
+        )
         sent_message = await self._offer_bet(
             game_data=game_data, balance=balance
         )
@@ -350,12 +345,14 @@ class Registration(RouterHelper):
         }
         await self.state.set_data(user_data)
         await self.state.set_state(GameFsm.WAIT_FOR_STARTING_GAME)
-        game_data["to_delete"].append(
-            [user_id, sent_message.message_id]
+        await game_state_repository.mutate(
+            lambda data: data["to_delete"].append(
+                [user_id, sent_message.message_id]
+            ),
+            "to_delete",
         )
-        await game_state.set_data(game_data)
-        await self._change_message_in_group(
-            game_data=game_data, game_chat=game_chat
+        self._change_message_in_group(
+            game_state=game_state, game_chat=game_chat
         )
         if (
             len(game_data["live_players_ids"])
@@ -391,7 +388,7 @@ class Registration(RouterHelper):
         user_data: UserCache = await self.state.get_data()
         balance = user_data["balance"]
         role_key: RolesLiteral = self.callback.data
-        coveted_role = get_data_with_roles(role_key)
+        coveted_role = ROLES_REGISTRY[role_key]
         user_data: UserCache = {"coveted_role": role_key}
         await self.state.update_data(user_data)
         await self.callback.message.edit_text(
@@ -426,11 +423,16 @@ class Registration(RouterHelper):
             tg_obj=self.callback,
             state=self.state,
             dispatcher=self.dispatcher,
+            fields=("settings",),
+        )
+        await GameStateRepository(game_state).mutate(
+            lambda data: self._delete_bet(
+                user_data=user_data, game_data=data
+            ),
+            "bids",
         )
-        self._delete_bet(user_data=user_data, game_data=game_data)
         del user_data["coveted_role"]
         await self.state.set_data(user_data)
-        await game_state.set_data(game_data)
         balance = user_data["balance"]
         await self._offer_bet(balance=balance, game_data=game_data)
 
@@ -448,13 +450,18 @@ class Registration(RouterHelper):
             chat_id=user_data["game_chat"],
             bot_id=self.message.bot.id,
         )
-        game_data: GameCache = await game_state.get_data()
-        game_data["live_players_ids"].remove(user_id)
-        del game_data["players"][str(user_id)]
-        self._delete_bet(user_data=user_data, game_data=game_data)
-        await game_state.set_data(game_data)
-        await self._change_message_in_group(
-            game_data=game_data, game_chat=user_data["game_chat"]
+
+        def remove_player(data: GameCache):
+            if user_id in data["live_players_ids"]:
+                data["live_players_ids"].remove(user_id)
+            data["players"].pop(str(user_id), None)
+            self._delete_bet(user_data=user_data, game_data=data)
+
+        await GameStateRepository(game_state).mutate(
+            remove_player, "live_players_ids", "players", "bids"
+        )
+        self._change_message_in_group(
+            game_state=game_state, game_chat=user_data["game_chat"]
         )
         await bot.delete_message(
             chat_id=user_id,
@@ -474,19 +481,24 @@ class Registration(RouterHelper):
             return
         bot = self._get_bot()
         user_id = self._get_user_id()
-        game_state, game_data = await get_game_state_and_data(
-            tg_obj=self.message,
-            state=self.state,
+        game_state = await get_state_and_assign(
             dispatcher=self.dispatcher,
+            chat_id=user_data["game_chat"],
+            bot_id=bot.id,
         )
-        self._delete_bet(user_data=user_data, game_data=game_data)
-        bids: RolesAndUsersMoney = game_data["bids"]
-        bids.setdefault(user_data["coveted_role"], []).append(
-            [user_id, rate]
+
+        def place_bet(data: GameCache):
+            self._delete_bet(user_data=user_data, game_data=data)
+            bids: RolesAndUsersMoney = data["bids"]
+            bids.setdefault(user_data["coveted_role"], []).append(
+                [user_id, rate]
+            )
+
+        await GameStateRepository(game_state).mutate(
+            place_bet, "bids"
         )
-        role = get_data_with_roles(user_data["coveted_role"])
+        role = ROLES_REGISTRY[user_data["coveted_role"]]
         await self.state.set_data(user_data)
-        await game_state.set_data(game_data)
         with suppress(TelegramBadRequest):
             await bot.edit_message_text(
                 chat_id=user_id,
@@ -507,11 +519,16 @@ class Registration(RouterHelper):
         end_of_registration: int,
     ):
         owner_id = self._get_user_id()
-        group_settings_schema = await GroupsDao(
-            session=self.session
-        ).get_group_settings(
-            group_tg_id=TgIdSchema(tg_id=self.message.chat.id),
-            user_tg_id=UserTgIdSchema(user_tg_id=owner_id),
+        group_settings_schema = await GroupSettingsRepository(
+            redis
+        ).get_or_resolve(
+            group_tg_id=self.message.chat.id,
+            user_tg_id=owner_id,
+            resolve=partial(
+                GroupsDao(session=self.session).get_group_settings,
+                group_tg_id=TgIdSchema(tg_id=self.message.chat.id),
+                user_tg_id=UserTgIdSchema(user_tg_id=owner_id),
+            ),
         )
         game_settings: GameSettingsCache = {
             "creator_user_id": owner_id,
@@ -538,6 +555,7 @@ class Registration(RouterHelper):
             "start_of_registration": start_of_registration,
             "end_of_registration": end_of_registration,
             "wait_for": [],
+            "missed_actions": [],
             "number_of_night": 0,
             "cant_vote": [],
             "cant_talk": [],
@@ -13,11 +13,14 @@ class AnalystSaver(RouterHelper):
             state=self.state,
             dispatcher=self.dispatcher,
         )
-        game_data[Analyst.processed_users_key].append(0)
         await send_messages_and_remove_from_expected(
             callback=self.callback,
             game_data=game_data,
+            game_state=game_state,
             message_to_user="Ты предположил, что никого не повесят днём",
             current_role=Analyst(),
+            mutation=lambda data: data[
+                Analyst.processed_users_key
+            ].append(0),
+            changed_fields=(Analyst.processed_users_key,),
         )
-        await game_state.set_data(game_data)
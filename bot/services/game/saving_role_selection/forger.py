@@ -1,4 +1,5 @@
-from general.collection_of_roles import get_data_with_roles
+from cache.game_state import GameStateRepository
+from general.collection_of_roles import ROLES_REGISTRY
 from keyboards.inline.callback_factory.recognize_user import (
     UserActionIndexCbData,
 )
@@ -26,9 +27,13 @@ class ForgerSaver(RouterHelper):
             )
         )
         url = game_data["players"][str(user_id)]["url"]
-        game_data["forged_roles"].append(user_id)
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                lambda data: data["forged_roles"].append(user_id),
+                "forged_roles",
+            )
+        )
         markup = choose_fake_role_kb(game_data)
-        await game_state.set_data(game_data)
         await self.callback.message.edit_text(
             text=f"Выбери для {url} новую роль", reply_markup=markup
         )
@@ -39,11 +44,15 @@ class ForgerSaver(RouterHelper):
             state=self.state,
             dispatcher=self.dispatcher,
         )
-        game_data["forged_roles"].clear()
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                lambda data: data["forged_roles"].clear(),
+                "forged_roles",
+            )
+        )
         markup = Forger().generate_markup(
             player_id=self.callback.from_user.id, game_data=game_data
         )
-        await game_state.set_data(game_data)
         await self.callback.message.edit_text(
             text=Forger.mail_message,
             reply_markup=markup,
@@ -55,18 +64,26 @@ class ForgerSaver(RouterHelper):
             state=self.state,
             dispatcher=self.dispatcher,
         )
-        current_role = get_data_with_roles(self.callback.data)
+        current_role = ROLES_REGISTRY[self.callback.data]
         pretty_role = make_pretty(current_role.role)
         forger_roles_key = "forged_roles"
-        game_data[forger_roles_key].append(self.callback.data)
+        forged_role = self.callback.data
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                lambda data: data[forger_roles_key].append(
+                    forged_role
+                ),
+                forger_roles_key,
+            )
+        )
         user_id = game_data[forger_roles_key][0]
         url = game_data["players"][str(user_id)]["url"]
         await trace_all_actions(
             callback=self.callback,
             game_data=game_data,
+            game_state=game_state,
             user_id=user_id,
             current_role=Forger(),
             message_to_user=f"Ты выбрал подменить документы "
             f"{url} на {pretty_role}",
         )
-        await game_state.set_data(game_data)
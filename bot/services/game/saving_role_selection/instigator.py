@@ -1,3 +1,4 @@
+from cache.game_state import GameStateRepository
 from keyboards.inline.buttons.common import BACK_BTN
 from keyboards.inline.callback_factory.recognize_user import (
     UserActionIndexCbData,
@@ -28,7 +29,9 @@ class InstigatorSaver(RouterHelper):
             )
         )
         url = game_data["players"][str(user_id)]["url"]
-        game_data["deceived"].append(user_id)
+        await GameStateRepository(game_state).mutate(
+            lambda data: data["deceived"].append(user_id), "deceived"
+        )
         markup = send_selection_to_players_kb(
             players_ids=game_data["live_players_ids"],
             players=game_data["players"],
@@ -36,7 +39,6 @@ class InstigatorSaver(RouterHelper):
             exclude=user_id,
         )
         await self.state.set_state(UserFsm.INSTIGATOR_CHOOSES_OBJECT)
-        await game_state.set_data(game_data)
         await self.callback.message.edit_text(
             text=f"За кого должен проголосовать {url}?",
             reply_markup=markup,
@@ -52,8 +54,11 @@ class InstigatorSaver(RouterHelper):
             UserFsm.INSTIGATOR_CHOOSES_SUBJECT
         )
         instigator = Instigator()
-        game_data["deceived"].clear()
-        await game_state.set_data(game_data)
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                lambda data: data["deceived"].clear(), "deceived"
+            )
+        )
         await self.callback.message.edit_text(
             text=instigator.mail_message,
             reply_markup=instigator.generate_markup(
@@ -73,20 +78,17 @@ class InstigatorSaver(RouterHelper):
                 dispatcher=self.dispatcher,
             )
         )
-        deceived_user = game_data["deceived"]
-        deceived_user.append(user_id)
-        subject_url = game_data["players"][str(deceived_user[0])][
-            "url"
-        ]
-        object_url = game_data["players"][str(deceived_user[1])][
-            "url"
-        ]
+        subject_id = game_data["deceived"][0]
+        subject_url = game_data["players"][str(subject_id)]["url"]
+        object_url = game_data["players"][str(user_id)]["url"]
         await trace_all_actions(
             callback=self.callback,
             game_data=game_data,
-            user_id=deceived_user[0],
+            game_state=game_state,
+            user_id=subject_id,
             current_role=Instigator(),
             message_to_user=f"Днём {subject_url} проголосует за "
             f"{object_url}, если попытается голосовать",
+            mutation=lambda data: data["deceived"].append(user_id),
+            changed_fields=("deceived",),
         )
-        await game_state.set_data(game_data)
@@ -1,3 +1,5 @@
+from cache.cache_types import GameCache
+from cache.game_state import GameStateRepository
 from keyboards.inline.buttons.common import BACK_BTN
 from keyboards.inline.callback_factory.recognize_user import (
     UserActionIndexCbData,
@@ -23,15 +25,19 @@ class PoisonerSaver(RouterHelper):
             state=self.state,
             dispatcher=self.dispatcher,
         )
-        poisoned = game_data["poisoned"]
-        poisoned[1] = 1
+
+        def kill_poisoned(data: GameCache):
+            data["poisoned"][1] = 1
+
         await send_messages_and_remove_from_expected(
             callback=self.callback,
             game_data=game_data,
+            game_state=game_state,
             message_to_user="Ты решил всех убить!",
             message_to_group=False,
+            mutation=kill_poisoned,
+            changed_fields=("poisoned",),
         )
-        await game_state.set_data(game_data)
 
     async def poisoner_poisons(self):
         game_state, game_data = await get_game_state_and_data(
@@ -77,9 +83,14 @@ class PoisonerSaver(RouterHelper):
                 dispatcher=self.dispatcher,
             )
         )
-        poisoned = game_data["poisoned"]
-        if poisoned:
-            poisoned[0].append(user_id)
-        else:
-            poisoned[:] = [[user_id], 0]
-        await game_state.set_data(game_data)
+
+        def poison(data: GameCache):
+            poisoned = data["poisoned"]
+            if poisoned:
+                poisoned[0].append(user_id)
+            else:
+                poisoned[:] = [[user_id], 0]
+
+        await GameStateRepository(game_state).mutate(
+            poison, "poisoned"
+        )
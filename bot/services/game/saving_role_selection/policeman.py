@@ -92,17 +92,20 @@ class PolicemanSaver(RouterHelper):
             )
         )
         url = game_data["players"][str(checked_user_id)]["url"]
-        game_data["disclosed_roles"].append(checked_user_id)
         await delete_message(self.callback.message)
         await trace_all_actions(
             callback=self.callback,
             game_data=game_data,
+            game_state=game_state,
             user_id=checked_user_id,
             current_role=Policeman(),
             message_to_user=False,
             message_to_group="Армия насильно заставила кого-то показать документы!",
+            mutation=lambda data: data["disclosed_roles"].append(
+                checked_user_id
+            ),
+            changed_fields=("disclosed_roles",),
         )
-        await game_state.set_data(game_data)
         text = NUMBER_OF_NIGHT.format(
             game_data["number_of_night"]
         ) + (
@@ -1,5 +1,6 @@
 from aiogram.fsm.context import FSMContext
 from cache.cache_types import GameCache
+from cache.game_state import GameStateRepository
 from keyboards.inline.keypads.mailing import selection_to_warden_kb
 from mafia.roles import Warden
 from services.base import RouterHelper
@@ -21,7 +22,13 @@ class WardenSaver(RouterHelper):
         await self.callback.message.edit_reply_markup(
             reply_markup=markup
         )
-        await game_state.set_data(game_data)
+        await GameStateRepository(game_state).patch(
+            {
+                "checked_for_the_same_groups": game_data[
+                    "checked_for_the_same_groups"
+                ]
+            }
+        )
 
     async def supervisor_collects_information(self):
         game_state, game_data = await get_game_state_and_data(
@@ -53,6 +60,7 @@ class WardenSaver(RouterHelper):
             await trace_all_actions(
                 callback=self.callback,
                 game_data=game_data,
+                game_state=game_state,
                 user_id=user_id,
                 message_to_group=False,
                 message_to_user=False,
@@ -64,7 +72,11 @@ class WardenSaver(RouterHelper):
         await send_messages_and_remove_from_expected(
             callback=self.callback,
             game_data=game_data,
+            game_state=game_state,
             message_to_user=f"Ты решил проверить на принадлежность одной группировки {user1_url} и {user2_url}",
             current_role=Warden(),
+            mutation=lambda data: data.update(
+                {"checked_for_the_same_groups": checked}
+            ),
+            changed_fields=("checked_for_the_same_groups",),
         )
-        await game_state.set_data(game_data)
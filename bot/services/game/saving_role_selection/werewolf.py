@@ -1,3 +1,5 @@
+from cache.cache_types import GameCache
+from cache.game_state import GameStateRepository
 from keyboards.inline.cb.cb_text import (
     WEREWOLF_TO_DOCTOR_CB,
     WEREWOLF_TO_MAFIA_CB,
@@ -45,18 +47,29 @@ class WerewolfSaver(RouterHelper):
         roles_key = current_roles[0].roles_key
         await delete_message(self.callback.message)
         are_there_many_senders = False
-        if len(game_data[roles_key]) == 0:
-            new_role = current_roles[0]
-        else:
-            new_role = current_roles[1]
-            are_there_many_senders = True
-        change_role(
-            game_data=game_data,
-            previous_role=Werewolf(),
-            new_role=new_role,
-            user_id=user_id,
+        new_role = current_roles[0]
+
+        def turn_into(data: GameCache):
+            nonlocal are_there_many_senders, new_role
+            are_there_many_senders = len(data[roles_key]) > 0
+            new_role = current_roles[are_there_many_senders]
+            change_role(
+                game_data=data,
+                previous_role=Werewolf(),
+                new_role=new_role,
+                user_id=user_id,
+            )
+
+        game_data.update(
+            await GameStateRepository(game_state).mutate(
+                turn_into,
+                Werewolf.roles_key,
+                roles_key,
+                "players",
+                "live_players_ids",
+                "groupings_counters",
+            )
         )
-        await game_state.set_data(game_data)
         await self.state.set_state(
             new_role.state_for_waiting_for_action
         )
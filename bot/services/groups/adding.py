@@ -1,8 +1,10 @@
 from aiogram import Bot
 from aiogram.types import ChatMemberUpdated
+from cache.chat_admins import ChatAdminsRepository
 from database.dao.groups import GroupsDao
 from database.schemas.common import TgIdSchema
 from general.commands import BotCommands
+from general.config import redis
 from general.text import REQUIRED_PERMISSIONS
 from services.base import RouterHelper
 from utils.pretty_text import make_build
@@ -12,6 +14,7 @@ class AddingRouter(RouterHelper):
     async def adding_to_group(
         self, event: ChatMemberUpdated, bot: Bot
     ):
+        await self.reset_chat_admins(event)
         chat_info = await bot.get_chat(event.chat.id)
         group_dao = GroupsDao(session=self.session)
         await group_dao.add(values=TgIdSchema(tg_id=event.chat.id))
@@ -25,6 +28,10 @@ class AddingRouter(RouterHelper):
             )
             await event.answer(text=make_build(text))
 
+    @staticmethod
+    async def reset_chat_admins(event: ChatMemberUpdated):
+        await ChatAdminsRepository(redis).invalidate(event.chat.id)
+
     async def group_to_supergroup_migration(self):
         group_dao = GroupsDao(session=self.session)
         await group_dao.update(
@@ -1,15 +1,19 @@
 from contextlib import suppress
+from functools import partial
 
 from aiogram.exceptions import TelegramBadRequest
 from cache.cache_types import PollBannedRolesCache, RolesLiteral
+from cache.group_settings import GroupSettingsRepository
+from database.common.sessions import run_after_commit
 from database.dao.order import OrderOfRolesDAO
 from database.dao.prohibited_roles import ProhibitedRolesDAO
 from database.schemas.common import UserTgIdSchema
 from database.schemas.roles import ProhibitedRoleSchema
 from general.collection_of_roles import (
     REQUIRED_ROLES,
-    get_data_with_roles,
+    ROLES_REGISTRY,
 )
+from general.config import redis
 from general.text import REQUIRE_TO_SAVE
 from keyboards.inline.keypads.settings import (
     edit_roles_kb,
@@ -28,7 +32,7 @@ class RoleAttendant(RouterHelper):
         if not roles_ids:
             return make_build("✅Все роли могут участвовать в игре!")
         result = "🚫Забаненные роли:\n\n"
-        all_roles = get_data_with_roles()
+        all_roles = ROLES_REGISTRY
         for num, role_id in enumerate(roles_ids, 1):
             result += (
                 f"{num}) {all_roles[role_id].role}"
@@ -48,6 +52,13 @@ class RoleAttendant(RouterHelper):
             for role_id in roles_ids
         ]
         await prohibited_dao.add_many(prohibited_roles)
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_user,
+                user_id,
+            ),
+        )
         order_of_roles_dao = OrderOfRolesDAO(session=self.session)
         used_roles = set(
             await order_of_roles_dao.get_roles_ids_of_order_of_roles(
@@ -66,8 +77,9 @@ class RoleAttendant(RouterHelper):
         return False
 
     async def ban_everything(self):
-        all_roles = get_data_with_roles()
-        roles_ids = list(set(all_roles.keys()) - set(REQUIRED_ROLES))
+        roles_ids = list(
+            set(ROLES_REGISTRY.keys()) - set(REQUIRED_ROLES)
+        )
         has_order_been_reset = await self._save_new_prohibited_roles(
             roles_ids=roles_ids
         )
@@ -117,6 +129,13 @@ class RoleAttendant(RouterHelper):
         await dao.delete(
             UserTgIdSchema(user_tg_id=self.callback.from_user.id)
         )
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_user,
+                self.callback.from_user.id,
+            ),
+        )
         await self.callback.answer(
             "✅Теперь для игры доступны все роли!", show_alert=True
         )
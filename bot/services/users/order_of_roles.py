@@ -1,6 +1,9 @@
 from collections.abc import Iterable
+from functools import partial
 
 from cache.cache_types import OrderOfRolesCache, RolesLiteral
+from cache.group_settings import GroupSettingsRepository
+from database.common.sessions import run_after_commit
 from database.dao.order import OrderOfRolesDAO
 from database.dao.prohibited_roles import ProhibitedRolesDAO
 from database.schemas.common import UserTgIdSchema
@@ -8,8 +11,9 @@ from database.schemas.roles import OrderOfRolesSchema
 from general import settings
 from general.collection_of_roles import (
     BASES_ROLES,
-    get_data_with_roles,
+    ROLES_REGISTRY,
 )
+from general.config import redis
 from general.groupings import Groupings
 from general.text import REQUIRE_TO_SAVE
 from keyboards.inline.keypads.settings import (
@@ -41,13 +45,20 @@ class RoleManager(RouterHelper):
             for number, role_id in enumerate(roles, 1)
         ]
         await dao.add_many(order_of_roles)
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_user,
+                self.callback.from_user.id,
+            ),
+        )
 
     @staticmethod
     def get_current_order_text(
         selected_roles: Iterable[RolesLiteral],
         to_save: bool = True,
     ):
-        all_roles = get_data_with_roles()
+        all_roles = ROLES_REGISTRY
         result = "ℹ️Текущий порядок ролей:\n\n"
         if not selected_roles:
             selected_roles = BASES_ROLES
@@ -90,8 +101,7 @@ class RoleManager(RouterHelper):
             UserTgIdSchema(user_tg_id=self.callback.from_user.id)
         )
 
-        all_roles = get_data_with_roles()
-        for role_id, role in all_roles.items():
+        for role_id, role in ROLES_REGISTRY.items():
             if (
                 role.role not in banned_roles_ids
                 and role_id
@@ -121,7 +131,7 @@ class RoleManager(RouterHelper):
 
     async def add_new_role_to_queue(self):
         order_data: OrderOfRolesCache = await self.state.get_data()
-        role = get_data_with_roles(self.callback.data)
+        role = ROLES_REGISTRY[self.callback.data]
         key = (
             "attacking"
             if role.grouping == Groupings.criminals
@@ -155,7 +165,7 @@ class RoleManager(RouterHelper):
         order_data: OrderOfRolesCache = await self.state.get_data()
         selected = order_data["selected"]
         latest_role_key = selected.pop()
-        role = get_data_with_roles(latest_role_key)
+        role = ROLES_REGISTRY[latest_role_key]
         key = (
             "attacking"
             if role.grouping == Groupings.criminals
@@ -188,6 +198,13 @@ class RoleManager(RouterHelper):
         await dao.delete(
             UserTgIdSchema(user_tg_id=self.callback.from_user.id)
         )
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_user,
+                self.callback.from_user.id,
+            ),
+        )
         await self.callback.answer(
             "✅Порядок ролей сброшен!", show_alert=True
         )
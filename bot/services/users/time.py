@@ -1,6 +1,11 @@
+from functools import partial
+
+from cache.group_settings import GroupSettingsRepository
+from database.common.sessions import run_after_commit
 from database.dao.settings import SettingsDao
 from database.schemas.common import UserTgIdSchema
 from database.schemas.settings import TimeOfDaySchema
+from general.config import redis
 from keyboards.inline.callback_factory.settings import (
     TimeOfDay,
     TimeOfDayCbData,
@@ -53,6 +58,13 @@ class TimeRouter(RouterHelper):
             ),
             values=value,
         )
+        run_after_commit(
+            self.session,
+            partial(
+                GroupSettingsRepository(redis).invalidate_user,
+                self.callback.from_user.id,
+            ),
+        )
         await self.callback.message.edit_reply_markup(
             reply_markup=adjust_time_kb(
                 current_time=callback_data.seconds,
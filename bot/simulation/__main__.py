@@ -0,0 +1,85 @@
+"""
+Прогон игр без Telegram для замеров производительности.
+
+Состояние игр хранится в Redis, поэтому нужна отдельная база,
+которая очищается до и после прогона:
+
+    SIMULATION_REDIS_URL=redis://localhost:6379/15 \\
+        python -m simulation --games 1000 --players 12
+
+Время фаз точнее всего при --concurrency 1, иначе в него
+попадает работа соседних игр.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from random import Random, seed
+
+from general import settings
+from loguru import logger
+from simulation.players import FirstButtonPolicy, RandomPolicy
+from simulation.redis import create_counting_redis
+from simulation.runner import Simulation
+from simulation.stats import make_report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m simulation")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument(
+        "--players",
+        type=int,
+        default=settings.mafia.maximum_number_of_players,
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--policy", choices=("random", "first"), default="random"
+    )
+    parser.add_argument(
+        "--activity",
+        type=float,
+        default=0.9,
+        help="вероятность, что игрок нажмёт кнопку",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="замерять память через tracemalloc, это сильно замедляет",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    seed(args.seed)
+    random = Random(args.seed)
+    if args.policy == "random":
+        policy = RandomPolicy(random=random, activity=args.activity)
+    else:
+        policy = FirstButtonPolicy()
+    redis = create_counting_redis(os.environ["SIMULATION_REDIS_URL"])
+    await redis.flushdb()
+    simulation = Simulation(
+        redis=redis,
+        policy=policy,
+        number_of_players=args.players,
+        trace_memory=args.trace_memory,
+    )
+    start = time.perf_counter()
+    games = await simulation.run(
+        number_of_games=args.games, concurrency=args.concurrency
+    )
+    elapsed = time.perf_counter() - start
+    print(make_report(games=games, elapsed=elapsed))
+    await redis.flushdb()
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+import time
+from collections import defaultdict
+from collections.abc import AsyncGenerator
+from itertools import count
+from typing import Any, Final
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import (
+    DeleteMessage,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    GetMe,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.types import InlineKeyboardMarkup, Message, User
+from simulation.stats import current_stats
+
+SIMULATED_BOT_TOKEN: Final = "42:simulation"
+
+MessageData = dict[str, Any]
+
+
+class RecordingSession(BaseSession):
+    """
+    Сессия Bot API, которая никуда не ходит.
+
+    Считает вызовы методов и хранит отправленные сообщения,
+    чтобы игроки могли нажимать кнопки под ними.
+    Каждая отправка и правка сообщения получает новую версию,
+    по которой игроки отличают обновлённые клавиатуры.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.messages: defaultdict[int, dict[int, MessageData]] = (
+            defaultdict(dict)
+        )
+        self.versions: dict[tuple[int, int], int] = {}
+        self.with_keyboards: defaultdict[int, set[int]] = (
+            defaultdict(set)
+        )
+        self._messages_ids = count(1)
+        self._versions = count(1)
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(
+        self, url: str, **kwargs: Any
+    ) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[Any],
+        timeout: int | None = None,
+    ) -> Any:
+        stats = current_stats.get()
+        if stats is not None:
+            stats.bot_calls[type(method).__name__] += 1
+        match method:
+            case SendMessage() | SendPhoto():
+                return self._send(bot=bot, method=method)
+            case (
+                EditMessageText()
+                | EditMessageCaption()
+                | EditMessageReplyMarkup()
+            ):
+                return self._edit(bot=bot, method=method)
+            case DeleteMessage():
+                chat_id = int(method.chat_id)
+                self.messages[chat_id].pop(method.message_id, None)
+                self.versions.pop((chat_id, method.message_id), None)
+                self.with_keyboards[chat_id].discard(
+                    method.message_id
+                )
+                return True
+            case GetMe():
+                return User(
+                    id=bot.id,
+                    is_bot=True,
+                    first_name="Симуляция",
+                    username="simulation_bot",
+                )
+        if method.__returning__ is bool:
+            return True
+        raise NotImplementedError(
+            f"{type(method).__name__} не поддерживается симуляцией"
+        )
+
+    def forget_chats(self, *chats_ids: int) -> None:
+        for chat_id in chats_ids:
+            for message_id in self.messages.pop(chat_id, {}):
+                self.versions.pop((chat_id, message_id), None)
+            self.with_keyboards.pop(chat_id, None)
+
+    def get_messages_with_keyboards(
+        self, chat_id: int
+    ) -> list[MessageData]:
+        return [
+            self.messages[chat_id][message_id]
+            for message_id in sorted(self.with_keyboards[chat_id])
+        ]
+
+    @staticmethod
+    def _dump_markup(markup: Any) -> dict | None:
+        if isinstance(markup, InlineKeyboardMarkup):
+            return markup.model_dump(mode="json", exclude_none=True)
+        return None
+
+    def _send(
+        self, bot: Bot, method: SendMessage | SendPhoto
+    ) -> Message:
+        chat_id = int(method.chat_id)
+        message: MessageData = {
+            "message_id": next(self._messages_ids),
+            "date": int(time.time()),
+            "chat": {
+                "id": chat_id,
+                "type": "private" if chat_id > 0 else "supergroup",
+            },
+            "from": {
+                "id": bot.id,
+                "is_bot": True,
+                "first_name": "Симуляция",
+            },
+        }
+        if isinstance(method, SendPhoto):
+            message["caption"] = method.caption
+            message["photo"] = [
+                {
+                    "file_id": "photo",
+                    "file_unique_id": "photo",
+                    "width": 1,
+                    "height": 1,
+                }
+            ]
+        else:
+            message["text"] = method.text
+        markup = self._dump_markup(method.reply_markup)
+        if markup is not None:
+            message["reply_markup"] = markup
+            self.with_keyboards[chat_id].add(message["message_id"])
+        self.messages[chat_id][message["message_id"]] = message
+        self.versions[chat_id, message["message_id"]] = next(
+            self._versions
+        )
+        return Message.model_validate(message, context={"bot": bot})
+
+    def _edit(
+        self,
+        bot: Bot,
+        method: (
+            EditMessageText
+            | EditMessageCaption
+            | EditMessageReplyMarkup
+        ),
+    ) -> Message:
+        chat_id = int(method.chat_id)
+        message = self.messages[chat_id].get(method.message_id)
+        if message is None:
+            raise TelegramBadRequest(
+                method=method, message="message to edit not found"
+            )
+        if isinstance(method, EditMessageText):
+            message["text"] = method.text
+        elif isinstance(method, EditMessageCaption):
+            message["caption"] = method.caption
+        markup = self._dump_markup(method.reply_markup)
+        if markup is None:
+            message.pop("reply_markup", None)
+            self.with_keyboards[chat_id].discard(method.message_id)
+        else:
+            message["reply_markup"] = markup
+            self.with_keyboards[chat_id].add(method.message_id)
+        message["edit_date"] = int(time.time())
+        self.versions[chat_id, method.message_id] = next(
+            self._versions
+        )
+        return Message.model_validate(message, context={"bot": bot})
+
+
+def create_simulated_bot() -> Bot:
+    return Bot(
+        token=SIMULATED_BOT_TOKEN,
+        session=RecordingSession(),
+        default=DefaultBotProperties(parse_mode="HTML"),
+    )
@@ -0,0 +1,147 @@
+import datetime
+from itertools import count
+from typing import Any, Final
+
+from aiogram import Dispatcher
+from aiogram.fsm.context import FSMContext
+from cache.cache_types import (
+    GameCache,
+    GamePhaseLiteral,
+    UserCache,
+    UserGameCache,
+)
+from general import settings
+from general.collection_of_roles import BASES_ROLES
+from general.exceptions import GameIsOver
+from mafia.pipeline_game import Game
+from simulation.players import Players
+from simulation.stats import GameStats
+from states.states import GameFsm
+from utils.pretty_text import get_profile_link
+from utils.state import get_state_and_assign
+
+_games_ids: Final = count(1)
+
+
+class SimulatedGame(Game):
+    """
+    Игра без Telegram и базы данных.
+
+    Вместо ожидания конца фазы игроки сразу нажимают кнопки,
+    а время каждой фазы попадает в GameStats.
+    """
+
+    def __init__(
+        self,
+        players: Players,
+        stats: GameStats,
+        players_ids: list[int],
+        **kwargs: Any,
+    ):
+        super().__init__(session_maker=None, **kwargs)
+        self.players = players
+        self.stats = stats
+        self.players_ids = players_ids
+        self.next_phase: GamePhaseLiteral | None = None
+
+    async def create_game_in_db(self):
+        self.beginning_game = self.clock.timestamp()
+        self.game_id = next(_games_ids)
+
+    async def set_phase(
+        self, phase: GamePhaseLiteral, duration: int
+    ):
+        self.next_phase = phase
+        if phase == "night":
+            self.stats.number_of_nights += 1
+        await super().set_phase(phase=phase, duration=duration)
+
+    async def wait_for_deadline(self, deadline: int) -> bool:
+        self.stats.switch_phase("actions")
+        await self.players.act(
+            players_ids=self.players_ids,
+            group_chat_id=self.group_chat_id,
+        )
+        is_own_game = await super().wait_for_deadline(deadline=0)
+        self.stats.switch_phase(self.next_phase)
+        return is_own_game
+
+    async def give_out_rewards(self, e: GameIsOver):
+        self.stats.switch_phase("rewards")
+        await super().give_out_rewards(e=e)
+
+    async def crash_game(self):
+        self.stats.is_crashed = True
+        self.stats.switch_phase("crash")
+        # игры нет в базе, удалять её оттуда не нужно
+        self.game_id = None
+        await super().crash_game()
+
+
+async def register_players(
+    dispatcher: Dispatcher,
+    state: FSMContext,
+    players_ids: list[int],
+) -> None:
+    """
+    Записывает игру в состоянии, в котором её оставляет
+    завершённая регистрация.
+    """
+    now = int(datetime.datetime.now(datetime.UTC).timestamp())
+    group_chat_id = state.key.chat_id
+    players: dict[str, UserGameCache] = {}
+    for user_id in players_ids:
+        full_name = f"Игрок {user_id}"
+        players[str(user_id)] = {
+            "full_name": full_name,
+            "url": get_profile_link(
+                user_id=user_id, full_name=full_name
+            ),
+            "money": 0,
+            "achievements": [],
+        }
+        user_data: UserCache = {
+            "game_chat": group_chat_id,
+            "message_with_offer_id": 0,
+            "balance": 0,
+        }
+        user_state = await get_state_and_assign(
+            dispatcher=dispatcher,
+            chat_id=user_id,
+            bot_id=state.key.bot_id,
+            new_state=GameFsm.WAIT_FOR_STARTING_GAME,
+        )
+        await user_state.set_data(user_data)
+    game_data: GameCache = {
+        "game_chat": group_chat_id,
+        "settings": {
+            "creator_user_id": players_ids[0],
+            "creator_full_name": players[str(players_ids[0])][
+                "full_name"
+            ],
+            "order_of_roles": list(BASES_ROLES),
+            "banned_roles": [],
+            "time_for_night": settings.mafia.time_for_night,
+            "time_for_day": settings.mafia.time_for_day,
+        },
+        "pros": [],
+        "cons": [],
+        "start_message_id": 0,
+        "live_players_ids": players_ids[:],
+        "players": players,
+        "messages_after_night": [],
+        "to_delete": [],
+        "vote_for": [],
+        "tracking": {},
+        "text_about_checks": "",
+        "bids": {},
+        "start_of_registration": now,
+        "end_of_registration": now,
+        "wait_for": [],
+        "missed_actions": [],
+        "number_of_night": 0,
+        "cant_vote": [],
+        "cant_talk": [],
+    }
+    await state.set_data(game_data)
+    await state.set_state(GameFsm.REGISTRATION)
@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from itertools import count
+from random import Random
+from typing import Any, Final
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from loguru import logger
+from simulation.bot import MessageData, RecordingSession
+from simulation.stats import current_stats
+
+MAX_ROUNDS_OF_CLICKS: Final = 4
+
+
+class PlayerPolicy(ABC):
+    """
+    Решает, какую кнопку нажмёт игрок.
+    """
+
+    @abstractmethod
+    def choose(
+        self, user_id: int, buttons: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """
+        Возвращает кнопку или None, если игрок бездействует.
+        """
+
+
+class RandomPolicy(PlayerPolicy):
+    """
+    Нажимает случайную кнопку с вероятностью activity.
+    """
+
+    def __init__(self, random: Random, activity: float = 0.9):
+        self.random = random
+        self.activity = activity
+
+    def choose(
+        self, user_id: int, buttons: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        if self.random.random() > self.activity:
+            return None
+        return self.random.choice(buttons)
+
+
+class FirstButtonPolicy(PlayerPolicy):
+    """
+    Всегда нажимает первую кнопку, игры повторяются
+    при одинаковом seed.
+    """
+
+    def choose(
+        self, user_id: int, buttons: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        return buttons[0]
+
+
+class Players:
+    """
+    Игроки, которые нажимают кнопки под сообщениями бота.
+
+    Нажатия превращаются в настоящие обновления и проходят
+    через Dispatcher, поэтому работают те же обработчики,
+    что и в Telegram.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        dispatcher: Dispatcher,
+        session: RecordingSession,
+        policy: PlayerPolicy,
+    ):
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self.session = session
+        self.policy = policy
+        self._updates_ids = count(1)
+
+    @staticmethod
+    def _get_buttons(message: MessageData) -> list[dict[str, Any]]:
+        return [
+            button
+            for row in message.get("reply_markup", {}).get(
+                "inline_keyboard", []
+            )
+            for button in row
+            if "callback_data" in button
+        ]
+
+    def _get_version(self, message: MessageData) -> int | None:
+        return self.session.versions.get(
+            (message["chat"]["id"], message["message_id"])
+        )
+
+    def _find_clicks(
+        self,
+        players_ids: Iterable[int],
+        group_chat_id: int,
+        clicked: set[tuple[int, int]],
+    ) -> list[tuple[int, MessageData, int, dict[str, Any]]]:
+        clicks = []
+        group_messages = self.session.get_messages_with_keyboards(
+            group_chat_id
+        )
+        for user_id in players_ids:
+            messages = (
+                self.session.get_messages_with_keyboards(user_id)
+                + group_messages
+            )
+            for message in messages:
+                version = self._get_version(message)
+                if (user_id, version) in clicked:
+                    continue
+                buttons = self._get_buttons(message)
+                if not buttons:
+                    continue
+                clicked.add((user_id, version))
+                button = self.policy.choose(user_id, buttons)
+                if button is not None:
+                    clicks.append(
+                        (user_id, message, version, button)
+                    )
+        return clicks
+
+    async def act(
+        self, players_ids: Iterable[int], group_chat_id: int
+    ) -> None:
+        """
+        Даёт игрокам нажать кнопки, пока появляются новые клавиатуры.
+        """
+        players_ids = list(players_ids)
+        clicked: set[tuple[int, int]] = set()
+        for _ in range(MAX_ROUNDS_OF_CLICKS):
+            clicks = self._find_clicks(
+                players_ids=players_ids,
+                group_chat_id=group_chat_id,
+                clicked=clicked,
+            )
+            if not clicks:
+                return
+            for user_id, message, version, button in clicks:
+                if self._get_version(message) != version:
+                    continue
+                await self.click(
+                    user_id=user_id,
+                    message=message,
+                    callback_data=button["callback_data"],
+                )
+
+    async def click(
+        self, user_id: int, message: MessageData, callback_data: str
+    ) -> None:
+        update_id = next(self._updates_ids)
+        update = Update.model_validate(
+            {
+                "update_id": update_id,
+                "callback_query": {
+                    "id": str(update_id),
+                    "from": {
+                        "id": user_id,
+                        "is_bot": False,
+                        "first_name": f"Игрок {user_id}",
+                    },
+                    "chat_instance": str(message["chat"]["id"]),
+                    "message": message,
+                    "data": callback_data,
+                },
+            },
+            context={"bot": self.bot},
+        )
+        try:
+            await self.dispatcher.feed_update(
+                self.bot, update, dispatcher=self.dispatcher
+            )
+        except Exception:
+            stats = current_stats.get()
+            if stats is not None:
+                stats.handler_errors += 1
+            logger.exception(
+                "Ошибка при обработке нажатия игрока {}", user_id
+            )
@@ -0,0 +1,32 @@
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.asyncio.connection import Connection
+from simulation.stats import current_stats
+
+
+class CountingConnection(Connection):
+    """
+    Соединение с Redis, которое считает команды
+    и обращения по сети для текущей игры.
+    """
+
+    def pack_command(self, *args: Any) -> list[bytes]:
+        stats = current_stats.get()
+        if stats is not None:
+            stats.redis_commands += 1
+        return super().pack_command(*args)
+
+    async def send_packed_command(
+        self, command: Any, check_health: bool = True
+    ) -> None:
+        stats = current_stats.get()
+        if stats is not None:
+            stats.redis_round_trips += 1
+        await super().send_packed_command(
+            command=command, check_health=check_health
+        )
+
+
+def create_counting_redis(url: str) -> Redis:
+    return Redis.from_url(url, connection_class=CountingConnection)
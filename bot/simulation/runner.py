@@ -0,0 +1,119 @@
+import asyncio
+from itertools import count
+from typing import Final, cast
+
+import orjson
+from aiogram import Dispatcher
+from aiogram.fsm.strategy import FSMStrategy
+from cache.game_state import GAME_INDEXED_FIELDS
+from cache.storage import HashRedisStorage
+from middlewares.phase_barrier import PhaseBarrierMiddleware
+from redis.asyncio import Redis
+from routers.game.groups import router as game_groups_router
+from routers.game.users import router as game_users_router
+from simulation.bot import RecordingSession, create_simulated_bot
+from simulation.game import SimulatedGame, register_players
+from simulation.players import PlayerPolicy, Players
+from simulation.stats import GameStats, MemoryTracker, current_stats
+from utils.clock import Clock
+from utils.state import get_state_and_assign
+
+MAX_PLAYERS_IN_CHAT: Final = 1000
+
+
+class Simulation:
+    """
+    Играет партии целиком на настоящих ролях и обработчиках.
+
+    Telegram заменён на RecordingSession, база данных
+    не используется, состояние игр хранится в Redis,
+    как и в боте.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        policy: PlayerPolicy,
+        number_of_players: int,
+        trace_memory: bool = False,
+    ):
+        self.bot = create_simulated_bot()
+        self.session = cast(RecordingSession, self.bot.session)
+        self.dispatcher = Dispatcher(
+            fsm_strategy=FSMStrategy.CHAT,
+            storage=HashRedisStorage(
+                redis=redis,
+                json_loads=orjson.loads,
+                indexed_fields=GAME_INDEXED_FIELDS,
+            ),
+        )
+        self.dispatcher.callback_query.middleware(
+            PhaseBarrierMiddleware()
+        )
+        self.dispatcher.message.middleware(PhaseBarrierMiddleware())
+        self.dispatcher.include_routers(
+            game_groups_router, game_users_router
+        )
+        self.players = Players(
+            bot=self.bot,
+            dispatcher=self.dispatcher,
+            session=self.session,
+            policy=policy,
+        )
+        self.clock = Clock()
+        self.number_of_players = number_of_players
+        self.memory_tracker = MemoryTracker(is_enabled=trace_memory)
+        self._chats_numbers = count(1)
+
+    async def play_game(self) -> GameStats:
+        chat_number = next(self._chats_numbers)
+        group_chat_id = -chat_number
+        players_ids = [
+            chat_number * MAX_PLAYERS_IN_CHAT + number
+            for number in range(1, self.number_of_players + 1)
+        ]
+        state = await get_state_and_assign(
+            dispatcher=self.dispatcher,
+            chat_id=group_chat_id,
+            bot_id=self.bot.id,
+        )
+        await register_players(
+            dispatcher=self.dispatcher,
+            state=state,
+            players_ids=players_ids,
+        )
+        stats = GameStats()
+        token = current_stats.set(stats)
+        self.memory_tracker.start()
+        game = SimulatedGame(
+            players=self.players,
+            stats=stats,
+            players_ids=players_ids,
+            bot=self.bot,
+            group_chat_id=group_chat_id,
+            state=state,
+            dispatcher=self.dispatcher,
+            scheduler=None,
+            broker=None,
+            clock=self.clock,
+        )
+        stats.switch_phase("preparation")
+        await game.start_game()
+        stats.switch_phase(None)
+        self.memory_tracker.stop(stats)
+        current_stats.reset(token)
+        self.session.forget_chats(group_chat_id, *players_ids)
+        return stats
+
+    async def run(
+        self, number_of_games: int, concurrency: int
+    ) -> list[GameStats]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def play_game_when_free() -> GameStats:
+            async with semaphore:
+                return await self.play_game()
+
+        return await asyncio.gather(
+            *(play_game_when_free() for _ in range(number_of_games))
+        )
@@ -0,0 +1,143 @@
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from aiogram.methods import (
+    SendAnimation,
+    SendMessage,
+    SendPhoto,
+    SendPoll,
+)
+
+OUTBOUND_METHODS = frozenset(
+    method.__name__
+    for method in (SendMessage, SendPhoto, SendAnimation, SendPoll)
+)
+
+
+@dataclass
+class GameStats:
+    """
+    Счётчики одной симулированной игры.
+
+    phases_cpu: процессорное время по фазам в секундах
+    bot_calls: вызовы Bot API по методам
+    redis_commands: команды Redis, включая MULTI и EXEC
+    redis_round_trips: обращения к Redis по сети
+    """
+
+    phases_cpu: Counter[str] = field(default_factory=Counter)
+    bot_calls: Counter[str] = field(default_factory=Counter)
+    redis_commands: int = 0
+    redis_round_trips: int = 0
+    handler_errors: int = 0
+    number_of_nights: int = 0
+    is_crashed: bool = False
+    peak_memory: int = 0
+    retained_memory: int = 0
+    _phase: str | None = None
+    _phase_started_at: float = 0.0
+
+    def switch_phase(self, phase: str | None) -> None:
+        """
+        Завершает замер текущей фазы и начинает замер новой.
+        """
+        now = time.process_time()
+        if self._phase is not None:
+            self.phases_cpu[self._phase] += (
+                now - self._phase_started_at
+            )
+        self._phase = phase
+        self._phase_started_at = now
+
+    @property
+    def outbound_messages(self) -> int:
+        return sum(
+            count
+            for method, count in self.bot_calls.items()
+            if method in OUTBOUND_METHODS
+        )
+
+
+current_stats: ContextVar[GameStats | None] = ContextVar(
+    "current_stats", default=None
+)
+
+
+class MemoryTracker:
+    """
+    Замеряет память, выделенную за игру, через tracemalloc.
+    """
+
+    def __init__(self, is_enabled: bool):
+        self.is_enabled = is_enabled
+        self._started_with = 0
+
+    def start(self) -> None:
+        if not self.is_enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._started_with, _ = tracemalloc.get_traced_memory()
+
+    def stop(self, stats: GameStats) -> None:
+        if not self.is_enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        stats.peak_memory = peak - self._started_with
+        stats.retained_memory = current - self._started_with
+
+
+def make_report(games: Iterable[GameStats], elapsed: float) -> str:
+    games = list(games)
+    number_of_games = len(games)
+    if number_of_games == 0:
+        return "Не сыграно ни одной игры"
+
+    def per_game(value: float) -> float:
+        return value / number_of_games
+
+    phases_cpu: Counter[str] = Counter()
+    bot_calls: Counter[str] = Counter()
+    for stats in games:
+        phases_cpu.update(stats.phases_cpu)
+        bot_calls.update(stats.bot_calls)
+    lines = [
+        f"Игр: {number_of_games} за {elapsed:.1f} с "
+        f"({number_of_games / elapsed * 60:.0f} в минуту)",
+        f"Аварийных завершений: "
+        f"{sum(stats.is_crashed for stats in games)}",
+        f"Ошибок в обработчиках: "
+        f"{sum(stats.handler_errors for stats in games)}",
+        f"Ночей за игру: "
+        f"{per_game(sum(s.number_of_nights for s in games)):.1f}",
+        "",
+        "Процессорное время за игру, мс:",
+    ]
+    for phase, seconds in phases_cpu.most_common():
+        lines.append(f"  {phase}: {per_game(seconds) * 1000:.2f}")
+    lines += [
+        "",
+        f"Команд Redis за игру: "
+        f"{per_game(sum(s.redis_commands for s in games)):.1f}",
+        f"Обращений к Redis за игру: "
+        f"{per_game(sum(s.redis_round_trips for s in games)):.1f}",
+        f"Исходящих сообщений за игру: "
+        f"{per_game(sum(s.outbound_messages for s in games)):.1f}",
+        "Вызовов Bot API за игру:",
+    ]
+    for method, count in bot_calls.most_common():
+        lines.append(f"  {method}: {per_game(count):.1f}")
+    if any(stats.peak_memory for stats in games):
+        lines += [
+            "",
+            f"Пик памяти за игру, КиБ: "
+            f"{per_game(sum(s.peak_memory for s in games)) / 1024:.1f}",
+            f"Не освобождено за игру, КиБ: "
+            f"{per_game(sum(s.retained_memory for s in games)) / 1024:.1f}",
+        ]
+    return "\n".join(lines)
@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Final
+
+from loguru import logger
+
+BATCH_MAX_SIZE: Final = 500
+BATCH_MAX_DELAY: Final = 1.0
+
+
+class MicroBatcher[T]:
+    """
+    Собирает данные из нескольких сообщений очереди
+    и записывает их одной транзакцией.
+
+    submit возвращается только после записи пачки,
+    поэтому сообщение подтверждается после коммита.
+    Если пачка не записалась, данные сообщений записываются
+    по отдельности, и ошибку получают только те сообщения,
+    которые не удалось записать.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[None]],
+        max_size: int = BATCH_MAX_SIZE,
+        max_delay: float = BATCH_MAX_DELAY,
+    ):
+        self._flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._submitted: list[tuple[list[T], asyncio.Future]] = []
+        self._size = 0
+        self._timer: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def submit(self, items: list[T]) -> None:
+        if not items:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._submitted.append((items, waiter))
+        self._size += len(items)
+        if self._size >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        await waiter
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_delay)
+        self._start_flush()
+
+    def _start_flush(self):
+        if (
+            self._timer is not None
+            and self._timer is not asyncio.current_task()
+        ):
+            self._timer.cancel()
+        self._timer = None
+        submitted = self._submitted
+        self._submitted, self._size = [], 0
+        task = asyncio.create_task(self._write(submitted))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(
+        self, submitted: list[tuple[list[T], asyncio.Future]]
+    ):
+        async with self._lock:
+            try:
+                await self._flush(
+                    [
+                        item
+                        for items, _ in submitted
+                        for item in items
+                    ]
+                )
+            except Exception as e:
+                if len(submitted) == 1:
+                    self._resolve(submitted[0][1], e)
+                    return
+                logger.exception(
+                    "Пачка из {} сообщений не записана, "
+                    "записываю по одному",
+                    len(submitted),
+                )
+                for items, waiter in submitted:
+                    try:
+                        await self._flush(items)
+                    except Exception as error:
+                        self._resolve(waiter, error)
+                    else:
+                        self._resolve(waiter)
+                return
+        for _, waiter in submitted:
+            self._resolve(waiter)
+
+    @staticmethod
+    def _resolve(
+        waiter: asyncio.Future, error: Exception | None = None
+    ):
+        if waiter.done():
+            return
+        if error is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(error)
@@ -1,32 +1,61 @@
 import asyncio
 
+from database.common.sessions import async_session_maker
 from database.dao.games import GamesDao
 from database.dao.rates import RatesDao
+from database.dao.refunds import RefundsDao
 from database.dao.results import ResultsDao
+from database.dao.statistics import (
+    BetStatisticsDao,
+    GroupingStatisticsDao,
+    GroupStatisticsDao,
+    PlayerStatisticsDao,
+    RoleStatisticsDao,
+)
 from database.dao.users import UsersDao
 from database.schemas.bids import (
     BidForRoleSchema,
+    RefundSchema,
     ResultBidForRoleSchema,
 )
-from database.schemas.common import IdSchema
 from database.schemas.games import EndOfGameSchema
 from database.schemas.results import PersonalResultSchema
 from faststream import FastStream
-from general.collection_of_roles import get_data_with_roles
+from general.collection_of_roles import ROLES_REGISTRY
 from general.config import bot, broker
 from general.text import MONEY_SYM
+from sqlalchemy.ext.asyncio import AsyncSession
+from tasks.batching import MicroBatcher
 from tasks.dependencies import SessionWithCommitDep
 from utils.pretty_text import make_build, make_pretty
 
 
-@broker.subscriber("betting_results")
-async def analyze_betting_results(
-    bids: list[ResultBidForRoleSchema], session: SessionWithCommitDep
-):
+async def save_betting_results(bids: list[ResultBidForRoleSchema]):
+    async with async_session_maker.begin() as session:
+        new_bids = await RatesDao(
+            session=session
+        ).add_many_ignoring_conflicts(
+            bids, conflict_fields=("game_id", "user_tg_id")
+        )
+        await UsersDao(session=session).update_balances(
+            users_money=(bet for bet in new_bids if bet.is_winner),
+            add_money=False,
+        )
+        await BetStatisticsDao(session=session).increment_counters(
+            (
+                {
+                    "user_tg_id": bet.user_tg_id,
+                    "number_of_bets": 1,
+                    "number_of_wins": int(bet.is_winner),
+                    "money": bet.money if bet.is_winner else 0,
+                }
+                for bet in new_bids
+            ),
+            key_fields=("user_tg_id",),
+        )
+    roles_data = ROLES_REGISTRY
     messages = []
-    roles_data = get_data_with_roles()
-    schemas = []
-    for bet in bids:
+    for bet in new_bids:
         role = roles_data[bet.role_id].role
         if bet.is_winner is True:
             message = (
@@ -39,9 +68,6 @@ async def analyze_betting_results(
                 f"{make_pretty(role)} не зашла!"
             )
         messages.append((bet.user_tg_id, make_build(message)))
-        schemas.append(bet)
-    rates_dao = RatesDao(session=session)
-    users_dao = UsersDao(session=session)
     await asyncio.gather(
         *[
             bot.send_message(chat_id=user_id, text=message)
@@ -49,17 +75,21 @@ async def analyze_betting_results(
         ],
         return_exceptions=True,
     )
-    await rates_dao.add_many(schemas)
-    for bet in bids:
-        if bet.is_winner:
-            await users_dao.update_balance(
-                user_money=bet, add_money=False
-            )
+
+
+betting_results_batcher = MicroBatcher(save_betting_results)
+
+
+@broker.subscriber("betting_results")
+async def analyze_betting_results(
+    bids: list[ResultBidForRoleSchema],
+):
+    await betting_results_batcher.submit(bids)
 
 
 @broker.subscriber("role_outside_game")
 async def report_role_outside_game(bids: list[BidForRoleSchema]):
-    roles_data = get_data_with_roles()
+    roles_data = ROLES_REGISTRY
     messages = [
         (
             bet.user_tg_id,
@@ -84,55 +114,142 @@ async def report_role_outside_game(bids: list[BidForRoleSchema]):
 async def save_game_results(
     game_result: EndOfGameSchema, session: SessionWithCommitDep
 ):
-    dao = GamesDao(session=session)
-    await dao.update(
-        filters=IdSchema(id=game_result.id), values=game_result
+    game = await GamesDao(session=session).finish_game(game_result)
+    if game is None:
+        return
+    await GroupStatisticsDao(session=session).increment_counters(
+        [
+            {
+                "group_id": game.group_id,
+                "number_of_games": 1,
+                "number_of_nights": game_result.number_of_nights,
+                "duration": int(
+                    (game_result.end - game.start).total_seconds()
+                ),
+            }
+        ],
+        key_fields=("group_id",),
+    )
+    await GroupingStatisticsDao(session=session).increment_counters(
+        [
+            {
+                "group_id": game.group_id,
+                "grouping": game_result.winning_group,
+                "number_of_wins": 1,
+            }
+        ],
+        key_fields=("group_id", "grouping"),
     )
 
 
-@broker.subscriber("personal_results")
-async def save_personal_results(
+async def save_personal_results_batch(
     personal_results: list[PersonalResultSchema],
-    session: SessionWithCommitDep,
 ):
-    result_dao = ResultsDao(session=session)
-    users_dao = UsersDao(session=session)
-    await result_dao.add_many(personal_results, exclude={"text"})
-    for result in personal_results:
-        if result.money == 0:
-            continue
-        await users_dao.update_balance(
-            user_money=result, add_money=True
+    async with async_session_maker.begin() as session:
+        new_results = await ResultsDao(
+            session=session
+        ).add_many_ignoring_conflicts(
+            personal_results,
+            conflict_fields=("game_id", "user_tg_id"),
+            exclude={"text"},
+        )
+        await UsersDao(session=session).update_balances(
+            users_money=new_results, add_money=True
+        )
+        await update_players_statistics(
+            session=session, personal_results=new_results
         )
 
 
-@broker.subscriber("refund_money_for_bets")
-async def refund_money_for_bets(
-    bids: list[BidForRoleSchema],
-    session: SessionWithCommitDep,
+async def update_players_statistics(
+    session: AsyncSession,
+    personal_results: list[PersonalResultSchema],
 ):
-    roles_data = get_data_with_roles()
-    messages_to_users_tasks = []
-    updates_tasks = []
-    users_dao = UsersDao(session=session)
-    for bet in bids:
-        current_role = roles_data[bet.role_id]
-        messages_to_users_tasks.append(
+    groups_ids = await GamesDao(session=session).get_groups_ids(
+        result.game_id for result in personal_results
+    )
+    await GroupStatisticsDao(session=session).increment_counters(
+        (
+            {
+                "group_id": groups_ids[result.game_id],
+                "number_of_players": 1,
+            }
+            for result in personal_results
+        ),
+        key_fields=("group_id",),
+    )
+    await PlayerStatisticsDao(session=session).increment_counters(
+        (
+            {
+                "group_id": groups_ids[result.game_id],
+                "user_tg_id": result.user_tg_id,
+                "number_of_games": 1,
+                "number_of_wins": int(result.is_winner),
+            }
+            for result in personal_results
+        ),
+        key_fields=("group_id", "user_tg_id"),
+    )
+    await RoleStatisticsDao(session=session).increment_counters(
+        (
+            {
+                "user_tg_id": result.user_tg_id,
+                "role_id": result.role_id,
+                "number_of_games": 1,
+                "number_of_wins": int(result.is_winner),
+                "number_of_nights": result.nights_lived,
+                "money": result.money,
+            }
+            for result in personal_results
+        ),
+        key_fields=("user_tg_id", "role_id"),
+    )
+
+
+personal_results_batcher = MicroBatcher(save_personal_results_batch)
+
+
+@broker.subscriber("personal_results")
+async def save_personal_results(
+    personal_results: list[PersonalResultSchema],
+):
+    await personal_results_batcher.submit(personal_results)
+
+
+async def save_refunds(bids: list[RefundSchema]):
+    async with async_session_maker.begin() as session:
+        new_refunds = await RefundsDao(
+            session=session
+        ).add_many_ignoring_conflicts(
+            bids,
+            conflict_fields=("game_id", "user_tg_id"),
+            exclude={"role_id"},
+        )
+        await UsersDao(session=session).update_balances(
+            users_money=new_refunds, add_money=True
+        )
+    roles_data = ROLES_REGISTRY
+    await asyncio.gather(
+        *[
             bot.send_message(
                 chat_id=bet.user_tg_id,
                 text=make_build(
                     f"Возвращены {bet.money}{MONEY_SYM} "
-                    f"за ставку на {make_pretty(current_role.role)}"
+                    f"за ставку на {make_pretty(roles_data[bet.role_id].role)}"
                 ),
             )
-        )
-        updates_tasks.append(
-            users_dao.update_balance(user_money=bet, add_money=True)
-        )
-    await asyncio.gather(*updates_tasks)
-    await asyncio.gather(
-        *messages_to_users_tasks, return_exceptions=True
+            for bet in new_refunds
+        ],
+        return_exceptions=True,
     )
 
 
+refunds_batcher = MicroBatcher(save_refunds)
+
+
+@broker.subscriber("refund_money_for_bets")
+async def refund_money_for_bets(bids: list[RefundSchema]):
+    await refunds_batcher.submit(bids)
+
+
 app = FastStream(broker)
@@ -0,0 +1,130 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Final, cast
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.types import InlineKeyboardMarkup
+from cache.storage import HashRedisStorage
+from loguru import logger
+from utils.pretty_text import make_build
+
+ANNOUNCEMENTS_WINDOW: Final = 5
+ANNOUNCEMENTS_TTL: Final = 60 * 60
+MAX_MESSAGE_LENGTH: Final = 3900
+
+_flush_tasks: set[asyncio.Task] = set()
+
+
+def join_into_chunks(
+    texts: Iterable[str], separator: str = "\n\n"
+) -> list[str]:
+    """
+    Склеивает тексты в сообщения, не превышающие лимит Telegram.
+    """
+    chunks = []
+    current = ""
+    for text in texts:
+        text = text[:MAX_MESSAGE_LENGTH]
+        if (
+            current
+            and len(current) + len(separator) + len(text)
+            > MAX_MESSAGE_LENGTH
+        ):
+            chunks.append(current)
+            current = ""
+        current = f"{current}{separator}{text}" if current else text
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class GroupAnnouncer:
+    """
+    Копит сообщения для группы во время фазы
+    и отправляет их одним сообщением.
+
+    Первое сообщение в буфере запускает отправку через
+    ANNOUNCEMENTS_WINDOW секунд, остальное сбрасывается
+    в конце фазы. Срочные сообщения, например о голосах,
+    отправляются сразу вместе с накопленными.
+    Порядок сообщений сохраняется.
+    """
+
+    def __init__(self, bot: Bot, state: FSMContext):
+        self.bot = bot
+        self.chat_id = state.key.chat_id
+        self.storage = cast(HashRedisStorage, state.storage)
+        self.key = self.storage.key_builder.build(
+            state.key, "announcements"
+        )
+
+    async def announce(
+        self,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+        is_urgent: bool = False,
+    ):
+        announcement = {
+            "text": text,
+            "reply_markup": (
+                reply_markup.model_dump(mode="json")
+                if reply_markup
+                else None
+            ),
+        }
+        redis = self.storage.redis
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(
+                self.key, self.storage.json_dumps(announcement)
+            )
+            pipe.expire(self.key, ANNOUNCEMENTS_TTL)
+            length, _ = await pipe.execute()
+        if is_urgent:
+            await self.flush()
+            return
+        if length == 1:
+            task = asyncio.create_task(self._flush_later())
+            _flush_tasks.add(task)
+            task.add_done_callback(_flush_tasks.discard)
+
+    async def _flush_later(self):
+        await asyncio.sleep(ANNOUNCEMENTS_WINDOW)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception(
+                "Не удалось отправить сообщения в группу"
+            )
+
+    async def flush(self):
+        async with self.storage.redis.pipeline(
+            transaction=True
+        ) as pipe:
+            pipe.lrange(self.key, 0, -1)
+            pipe.delete(self.key)
+            raw_announcements, _ = await pipe.execute()
+        if not raw_announcements:
+            return
+        announcements = [
+            self.storage.json_loads(announcement)
+            for announcement in raw_announcements
+        ]
+        reply_markup = None
+        for announcement in announcements:
+            if announcement["reply_markup"]:
+                reply_markup = InlineKeyboardMarkup.model_validate(
+                    announcement["reply_markup"]
+                )
+        chunks = join_into_chunks(
+            make_build(announcement["text"])
+            for announcement in announcements
+        )
+        for number, chunk in enumerate(chunks, 1):
+            await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=chunk,
+                reply_markup=(
+                    reply_markup if number == len(chunks) else None
+                ),
+            )
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from contextlib import suppress
+
+
+class Clock:
+    """
+    Время, по которому идут фазы игры и регистрация.
+    """
+
+    def now(self) -> float:
+        return time.time()
+
+    def timestamp(self) -> int:
+        return int(self.now())
+
+    def to_real_seconds(self, seconds: float) -> float:
+        """
+        Переводит длительность по этим часам в настоящие секунды.
+        """
+        return seconds
+
+    def from_real_seconds(self, seconds: float) -> float:
+        """
+        Переводит настоящие секунды в длительность по этим часам.
+        """
+        return seconds
+
+    async def sleep(
+        self, seconds: float, wake_up: asyncio.Event | None = None
+    ) -> bool:
+        """
+        Ждёт seconds по этим часам.
+
+        Возвращает True, если ожидание прервано событием wake_up.
+        """
+        delay = max(self.to_real_seconds(seconds), 0)
+        if wake_up is None:
+            await asyncio.sleep(delay)
+            return False
+        with suppress(TimeoutError):
+            await asyncio.wait_for(wake_up.wait(), timeout=delay)
+        return wake_up.is_set()
+
+    async def sleep_until(
+        self, timestamp: float, wake_up: asyncio.Event | None = None
+    ) -> bool:
+        return await self.sleep(
+            seconds=timestamp - self.now(), wake_up=wake_up
+        )
+
+
+class VirtualClock(Clock):
+    """
+    Ускоренное время для нагрузочных тестов.
+
+    Идёт в speed раз быстрее настоящего, начиная с момента
+    создания, поэтому сроки фаз, сохранённые в Redis,
+    не переживают перезапуск процесса.
+    """
+
+    def __init__(self, speed: float):
+        if speed < 1:
+            raise ValueError("Часы можно только ускорить")
+        self.speed = speed
+        self._origin = time.time()
+
+    def now(self) -> float:
+        return (
+            self._origin + (time.time() - self._origin) * self.speed
+        )
+
+    def to_real_seconds(self, seconds: float) -> float:
+        return seconds / self.speed
+
+    def from_real_seconds(self, seconds: float) -> float:
+        return seconds * self.speed
+
+
+def create_clock(speed: float) -> Clock:
+    if speed == 1:
+        return Clock()
+    return VirtualClock(speed=speed)
@@ -18,6 +18,7 @@ from keyboards.inline.callback_factory.recognize_user import (
 from keyboards.inline.keypads.mailing import (
     send_selection_to_players_kb,
 )
+from utils.announcements import join_into_chunks
 from utils.pretty_text import (
     cut_off_old_text,
     make_build,
@@ -222,6 +223,12 @@ async def send_messages_after_night(
     chats_and_messages = defaultdict(list)
     for chat_id, message in messages:
         chats_and_messages[chat_id].append(message)
+
+    async def send_chunks(chat_id: int, texts: Iterable[str]):
+        # части отправляются по очереди, чтобы не перемешаться
+        for text in texts:
+            await bot.send_message(chat_id=chat_id, text=text)
+
     tasks = []
     for chat_id, messages in chats_and_messages.items():
         if chat_id != group_chat_id:
@@ -238,12 +245,14 @@ async def send_messages_after_night(
                 )
             )
         else:
-            for message in messages:
-                tasks.append(
-                    bot.send_message(
-                        chat_id=chat_id, text=make_build(message)
-                    )
+            tasks.append(
+                send_chunks(
+                    chat_id=chat_id,
+                    texts=join_into_chunks(
+                        make_build(message) for message in messages
+                    ),
                 )
+            )
     await asyncio.gather(*tasks, return_exceptions=True)
 
 
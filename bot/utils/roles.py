@@ -2,7 +2,8 @@ from collections.abc import Awaitable, Callable
 from functools import wraps
 from typing import TYPE_CHECKING, Concatenate
 
-from cache.cache_types import GameCache, UserIdInt
+from cache.cache_types import GameCache, GroupingsCounters, UserIdInt
+from general.groupings import Groupings
 from utils.pretty_text import make_pretty
 
 if TYPE_CHECKING:
@@ -18,6 +19,15 @@ def change_role(
 ):
     game_data[previous_role.roles_key].remove(user_id)
     game_data[new_role.roles_key].append(user_id)
+    if previous_role.grouping != new_role.grouping:
+        update_groupings_counters(
+            game_data=game_data,
+            grouping=previous_role.grouping,
+            change=-1,
+        )
+        update_groupings_counters(
+            game_data=game_data, grouping=new_role.grouping, change=1
+        )
     game_data["players"][str(user_id)]["pretty_role"] = make_pretty(
         new_role.role
     )
@@ -27,6 +37,40 @@ def change_role(
     ] = new_role.roles_key
 
 
+def count_live_players_in_groupings(
+    game_data: GameCache,
+) -> GroupingsCounters:
+    from general.collection_of_roles import ROLES_REGISTRY
+
+    counters = {grouping.name: 0 for grouping in Groupings}
+    for user_id in game_data["live_players_ids"]:
+        role_id = game_data["players"][str(user_id)]["role_id"]
+        counters[ROLES_REGISTRY[role_id].grouping.name] += 1
+    return counters
+
+
+def get_groupings_counters(
+    game_data: GameCache,
+) -> GroupingsCounters:
+    """
+    Возвращает счётчики живых игроков по группировкам.
+
+    У игр, начатых до появления счётчиков, считает их по живым
+    игрокам и сохраняет в game_data.
+    """
+    if "groupings_counters" not in game_data:
+        game_data["groupings_counters"] = (
+            count_live_players_in_groupings(game_data)
+        )
+    return game_data["groupings_counters"]
+
+
+def update_groupings_counters(
+    game_data: GameCache, grouping: Groupings, change: int
+):
+    get_groupings_counters(game_data)[grouping.name] += change
+
+
 def get_user_role_and_url(
     game_data: GameCache,
     processed_user_id: UserIdInt,
@@ -0,0 +1,19 @@
+from aiogram.types import Update
+from general import settings
+from utils.updates import get_chat_id_of_update
+
+
+def get_shard_id(chat_id: int) -> int:
+    return chat_id % settings.sharding.shards_count
+
+
+def is_own_chat(chat_id: int) -> bool:
+    return get_shard_id(chat_id) == settings.sharding.shard_id
+
+
+def get_updates_queue(shard_id: int) -> str:
+    return f"updates_{shard_id}"
+
+
+def get_shard_id_of_update(update: Update) -> int:
+    return get_shard_id(get_chat_id_of_update(update))
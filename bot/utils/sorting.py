@@ -9,9 +9,9 @@ from cache.cache_types import (
 
 
 def sorting_roles_by_name(role_key: RolesLiteral):
-    from general.collection_of_roles import get_data_with_roles
+    from general.collection_of_roles import ROLES_REGISTRY
 
-    return get_data_with_roles(role_key).role
+    return ROLES_REGISTRY[role_key].role
 
 
 def sorting_by_rate(
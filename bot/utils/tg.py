@@ -5,12 +5,10 @@ from datetime import timedelta
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
-from aiogram.types import (
-    ChatMemberAdministrator,
-    ChatMemberOwner,
-    ChatPermissions,
-    Message,
-)
+from aiogram.types import ChatPermissions, Message
+from cache.chat_admins import ChatAdminsRepository
+from cache.game_state import GameStateRepository
+from general.config import redis
 
 
 async def delete_message(message: Message):
@@ -30,11 +28,8 @@ async def delete_message_by_chat(
 async def check_user_for_admin_rights(
     bot: Bot, chat_id: int, user_id: int
 ) -> bool:
-    member = await bot.get_chat_member(
-        chat_id=chat_id, user_id=user_id
-    )
-    return isinstance(
-        member, (ChatMemberOwner, ChatMemberAdministrator)
+    return await ChatAdminsRepository(redis).is_admin(
+        bot=bot, chat_id=chat_id, user_id=user_id
     )
 
 
@@ -42,7 +37,8 @@ async def delete_messages_from_to_delete(
     bot: Bot,
     state: FSMContext | None,
 ):
-    to_delete = (await state.get_data())["to_delete"]
+    game_state = GameStateRepository(state)
+    to_delete = (await game_state.get("to_delete"))["to_delete"]
     await asyncio.gather(
         *(
             delete_message_by_chat(
@@ -53,7 +49,7 @@ async def delete_messages_from_to_delete(
             for chat_id, message_id in to_delete
         )
     )
-    await state.update_data({"to_delete": []})
+    await game_state.patch({"to_delete": []})
 
 
 async def ban_user(
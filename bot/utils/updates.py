@@ -0,0 +1,103 @@
+import asyncio
+from collections import deque
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import (
+    UserContextMiddleware,
+)
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+from loguru import logger
+
+
+def get_chat_id_of_update(update: Update) -> int:
+    """
+    Возвращает чат обновления.
+    Для обновлений без чата возвращает пользователя.
+    """
+    context = UserContextMiddleware.resolve_event_context(update)
+    if context.chat:
+        return context.chat.id
+    if context.user:
+        return context.user.id
+    return 0
+
+
+class UpdatePipeline:
+    """
+    Обрабатывает обновления разных чатов параллельно,
+    а обновления одного чата строго по очереди.
+
+    Если необработанных обновлений слишком много,
+    put ждёт освобождения места.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        max_concurrent_updates: int,
+        max_pending_updates: int,
+        **data: Any,
+    ):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.data = data
+        self._pending = asyncio.Semaphore(max_pending_updates)
+        self._concurrency = asyncio.Semaphore(max_concurrent_updates)
+        self._chats_queues: dict[int, deque[Update]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def put(self, update: Update) -> None:
+        await self._pending.acquire()
+        chat_id = get_chat_id_of_update(update)
+        queue = self._chats_queues.get(chat_id)
+        if queue is not None:
+            queue.append(update)
+            return
+        self._chats_queues[chat_id] = deque([update])
+        task = asyncio.create_task(self._process_chat(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process_chat(self, chat_id: int) -> None:
+        queue = self._chats_queues[chat_id]
+        while queue:
+            update = queue.popleft()
+            try:
+                async with self._concurrency:
+                    await self.dispatcher.feed_update(
+                        self.bot, update, **self.data
+                    )
+            except Exception:
+                logger.exception("Ошибка при обработке обновления")
+            finally:
+                self._pending.release()
+        del self._chats_queues[chat_id]
+
+
+class PipelineRequestHandler(SimpleRequestHandler):
+    """
+    Принимает вебхуки и передаёт обновления в UpdatePipeline.
+    """
+
+    def __init__(self, pipeline: UpdatePipeline, **kwargs: Any):
+        super().__init__(
+            dispatcher=pipeline.dispatcher,
+            bot=pipeline.bot,
+            handle_in_background=True,
+            **kwargs,
+        )
+        self.pipeline = pipeline
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        update = Update.model_validate(
+            await request.json(loads=bot.session.json_loads),
+            context={"bot": bot},
+        )
+        await self.pipeline.put(update)
+        return web.json_response({}, dumps=bot.session.json_dumps)